@@ -0,0 +1,78 @@
+"""Several Binance sub-accounts, each behind its own backend, in one dashboard.
+
+Accounts are configured as ``name=url`` pairs, for example
+DASHBOARD_ACCOUNTS="main=http://10.0.0.5:5058,hedge=http://10.0.0.6:5058".
+gather() runs one call per account concurrently under a single deadline, so
+a page waits for its slowest account rather than the sum of all of them,
+and an account that fails or times out is reported without hiding the
+others.
+
+Like data_client, nothing here imports pandas: merging table payloads into
+one frame with an Account column happens in the page helpers.
+"""
+import contextvars
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeoutError
+from urllib.parse import urlparse
+
+import requests
+
+import data_client
+
+ACCOUNT_COLUMN = "Account"
+MAX_WORKERS = 16
+
+_executor = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="account")
+
+
+def parse(spec):
+    """Account name -> backend URL from a ``name=url,name=url`` spec.
+
+    A bare URL is named after its host and port. Order is kept.
+    """
+    accounts = {}
+    for item in spec.split(","):
+        item = item.strip()
+        if not item:
+            continue
+        name, _, url = item.partition("=") if "=" in item.split("://", 1)[0] else ("", "", item)
+        url = url.strip().rstrip("/")
+        accounts[name.strip() or urlparse(url).netloc] = url
+    return accounts
+
+
+def gather(calls, timeout=data_client.DEFAULT_TIMEOUT):
+    """Run {key: call} concurrently; returns [(key, result, error)] in key order.
+
+    Exactly one of result/error is set. Waits ``timeout`` seconds in all,
+    not per call; anything still running then is reported as a timeout.
+    Only requests exceptions are caught.
+    """
+    # Workers run in a copy of the caller's context so their perf spans
+    # land in the caller's section
+    futures = {key: _executor.submit(contextvars.copy_context().run, call) for key, call in calls.items()}
+    deadline = time.monotonic() + timeout
+    results = []
+    for key, future in futures.items():
+        try:
+            results.append((key, future.result(timeout=max(deadline - time.monotonic(), 0)), None))
+        except FuturesTimeoutError:
+            results.append((key, None, requests.exceptions.Timeout(f"no response within {timeout}s")))
+        except requests.exceptions.RequestException as e:
+            results.append((key, None, e))
+    return results
+
+
+def sum_fields(payloads):
+    """Field-wise total of dict payloads such as account summaries.
+
+    Numeric fields are added up; a field that is not numeric in every
+    payload is left out.
+    """
+    payloads = [payload for payload in payloads if payload]
+    totals = {}
+    for field in dict.fromkeys(field for payload in payloads for field in payload):
+        values = [payload.get(field) for payload in payloads]
+        if all(isinstance(value, (int, float)) and not isinstance(value, bool) for value in values):
+            totals[field] = sum(values)
+    return totals
@@ -0,0 +1,327 @@
+"""Incrementally maintained trade statistics for the analytics pages.
+
+Win rate, total PNL and per-symbol or per-day breakdowns used to be
+recomputed from every trade on every render. A TradeAggregates instead keeps
+running count, sum, wins, min and max overall, per symbol and per local day,
+plus the running cumulative PNL per day, and folds in only the trades newer
+than the last one it has seen. Like delta_sync, it tracks a cursor timestamp
+and the keys of the trades sharing it, so feeding it the same history again,
+or a history that grew by a few rows, never counts a trade twice. A history
+that was replaced (a store's generation changed) or no longer has as many
+trades as were counted is folded again from scratch.
+
+State is persisted as a small JSON file per source, so a fresh process
+resumes from the running totals instead of refolding the whole history.
+"""
+import json
+import os
+import threading
+from urllib.parse import urlparse
+
+import numpy as np
+import pandas as pd
+
+import formatting
+import perf
+
+AGGREGATE_CACHE_DIR = os.environ.get("DASHBOARD_AGGREGATE_CACHE", os.path.join(".cache", "aggregates"))
+PERSIST_AGGREGATES = True
+STATE_VERSION = 1
+
+# Timestamp column that orders each trade source
+TIME_FIELDS = {
+    "trade_history": "Time",
+    "trade_analytics": "Timestamp",
+}
+PNL_FIELD = "PNL"
+SYMBOL_FIELD = "Symbol"
+STAT_COLUMNS = ["count", "sum", "wins", "min", "max"]
+
+
+def source_columns(endpoint):
+    """Columns fold() reads from a trade endpoint's frame."""
+    return [TIME_FIELDS[endpoint], SYMBOL_FIELD, PNL_FIELD]
+
+
+def _row_key(row):
+    return json.dumps(row, sort_keys=True, default=str)
+
+
+def _epoch_ms(values):
+    """Epoch milliseconds as float64, NaN where missing."""
+    if pd.api.types.is_datetime64_any_dtype(values):
+        stamps = values if values.dt.tz is not None else values.dt.tz_localize("UTC")
+        return ((stamps - pd.Timestamp(0, tz="UTC")) / pd.Timedelta(milliseconds=1)).to_numpy(dtype="float64", na_value=np.nan)
+    return pd.to_numeric(values, errors="coerce").to_numpy(dtype="float64", na_value=np.nan)
+
+
+def _empty_stats():
+    return pd.DataFrame({name: pd.Series(dtype="float64") for name in STAT_COLUMNS})
+
+
+def _group_stats(keys, pnl):
+    """count, sum, wins, min and max of pnl per key."""
+    grouped = pd.DataFrame({"key": keys, "pnl": pnl, "win": pnl > 0}).groupby("key", observed=True, sort=True)
+    stats = grouped["pnl"].agg(["size", "sum", "min", "max"]).rename(columns={"size": "count"})
+    stats["wins"] = grouped["win"].sum()
+    return stats[STAT_COLUMNS].astype("float64")
+
+
+def _merge(current, new):
+    """Running stats of current combined with those of a batch of new trades."""
+    index = current.index.union(new.index)
+    old = current.reindex(index)
+    added = new.reindex(index)
+    merged = pd.DataFrame({
+        name: old[name].fillna(0) + added[name].fillna(0) for name in ("count", "sum", "wins")
+    }, index=index)
+    merged["min"] = np.fmin(old["min"], added["min"])
+    merged["max"] = np.fmax(old["max"], added["max"])
+    for name in current.columns.difference(merged.columns):
+        merged[name] = old[name]
+    return merged
+
+
+def _with_win_rate(totals):
+    totals["win_rate"] = totals["wins"] / totals["count"] * 100 if totals["count"] else np.nan
+    return totals
+
+
+def _symbols_with_win_rate(symbols):
+    symbols.index.name = SYMBOL_FIELD
+    symbols["win_rate"] = symbols["wins"] / symbols["count"] * 100
+    return symbols
+
+
+def _frame_state(frame):
+    return {"index": frame.index.tolist(), **{name: frame[name].tolist() for name in frame.columns}}
+
+
+def _frame_from_state(state):
+    index = state.pop("index")
+    return pd.DataFrame(state, index=pd.Index(index, dtype="object"), dtype="float64")
+
+
+class TradeAggregates:
+    """Running PNL statistics of one trade source."""
+
+    def __init__(self, name, time_field, tz=formatting.INDIAN_TZ):
+        self.name = name
+        self.time_field = time_field
+        self.tz = tz
+        self._clear()
+        self.generation = None  # source generation the stats were folded from
+        self._loaded_from_disk = not PERSIST_AGGREGATES
+        self._lock = threading.Lock()
+
+    def _clear(self):
+        self.cursor = None
+        self.totals = dict.fromkeys(STAT_COLUMNS, 0.0)
+        self.totals["min"] = self.totals["max"] = np.nan
+        self.days = _empty_stats().assign(cumulative=pd.Series(dtype="float64"))
+        self.symbols = _empty_stats()
+        self._boundary_keys = set()
+
+    @property
+    def path(self):
+        return os.path.join(AGGREGATE_CACHE_DIR, f"{self.name}.json")
+
+    def fold(self, frame, generation=None):
+        """Fold the trades of frame not seen before into the running stats.
+
+        frame must be the whole history, every time; only rows after the
+        cursor, or at it but not yet counted, are folded. ``generation``
+        (e.g. DeltaStore.generation) changes when the source replaced its
+        history, which restarts the stats. They also restart when the count
+        no longer matches frame's trades, e.g. after rows were removed.
+        Returns the number of trades folded.
+        """
+        with self._lock:
+            if not self._loaded_from_disk:
+                self._load()
+            if frame is None or frame.empty or self.time_field not in frame.columns:
+                return 0
+            with perf.span(perf.TRANSFORM, f"aggregates.fold {self.name}") as span:
+                changed = False
+                if generation is not None:
+                    if self.generation is not None and generation != self.generation:
+                        self._clear()
+                        changed = True
+                    self.generation = generation
+                new = self._new_rows(frame)
+                if not new.empty:
+                    self._fold_rows(new)
+                trades = int((~np.isnan(_epoch_ms(frame[self.time_field]))).sum())
+                if self.totals["count"] != trades:
+                    # Rows were amended or removed behind the cursor
+                    self._clear()
+                    changed = True
+                    new = self._new_rows(frame)
+                    if not new.empty:
+                        self._fold_rows(new)
+                span.rows = len(new)
+            if changed or not new.empty:
+                self._save()
+            return len(new)
+
+    def _new_rows(self, frame):
+        times = _epoch_ms(frame[self.time_field])
+        if self.cursor is None:
+            return frame[~np.isnan(times)]
+        is_new = times > self.cursor
+        at_cursor = np.flatnonzero(times == self.cursor)
+        if len(at_cursor):
+            records = frame.iloc[at_cursor].to_dict("records")
+            is_new[at_cursor] = [_row_key(row) not in self._boundary_keys for row in records]
+        return frame[is_new]
+
+    def _fold_rows(self, rows):
+        times = _epoch_ms(rows[self.time_field])
+        pnl = pd.to_numeric(rows[PNL_FIELD], errors="coerce").to_numpy(dtype="float64", na_value=np.nan) \
+            if PNL_FIELD in rows.columns else np.full(len(rows), np.nan)
+
+        self.totals["count"] += len(rows)
+        self.totals["sum"] += float(np.nansum(pnl))
+        self.totals["wins"] += float((pnl > 0).sum())
+        if not np.isnan(pnl).all():
+            self.totals["min"] = float(np.fmin(self.totals["min"], np.nanmin(pnl)))
+            self.totals["max"] = float(np.fmax(self.totals["max"], np.nanmax(pnl)))
+
+        if SYMBOL_FIELD in rows.columns:
+            symbols = rows[SYMBOL_FIELD].astype("string").to_numpy(dtype="object", na_value=None)
+            self.symbols = _merge(self.symbols, _group_stats(symbols, pnl))
+
+        days = formatting.to_local_datetime(pd.Series(times), unit="ms", tz=self.tz).dt.tz_localize(None).dt.normalize()
+        touched = _group_stats(days.to_numpy(), pnl)
+        # Day keys are strings so they survive the JSON round trip; format each day once
+        touched.index = touched.index.strftime("%Y-%m-%d")
+        merged = _merge(self.days, touched)
+        # Only days from the earliest touched one onwards change their running total
+        start = merged.index.get_loc(touched.index[0])
+        base = merged["cumulative"].iloc[start - 1] if start else 0.0
+        merged.iloc[start:, merged.columns.get_loc("cumulative")] = base + merged["sum"].iloc[start:].cumsum()
+        self.days = merged
+
+        latest = np.nanmax(times)
+        at_latest = rows[times == latest].to_dict("records")
+        if self.cursor is None or latest > self.cursor:
+            self.cursor = float(latest)
+            self._boundary_keys = {_row_key(row) for row in at_latest}
+        elif latest == self.cursor:
+            self._boundary_keys.update(_row_key(row) for row in at_latest)
+
+    def overall(self):
+        """Totals over every trade folded so far, with the win rate in percent."""
+        with self._lock:
+            totals = dict(self.totals)
+        return _with_win_rate(totals)
+
+    def by_day(self):
+        """Per local day stats and cumulative PNL, oldest day first."""
+        with self._lock:
+            days = self.days.copy()
+        days.index = pd.to_datetime(days.index)
+        days.index.name = "Date"
+        return days
+
+    def by_symbol(self):
+        """Per symbol stats, with the win rate in percent."""
+        with self._lock:
+            symbols = self.symbols.copy()
+        return _symbols_with_win_rate(symbols)
+
+    def reset(self):
+        """Drop the running stats and their disk copy; the next fold starts over."""
+        with self._lock:
+            self._clear()
+            self.generation = None
+            self._loaded_from_disk = True
+            try:
+                os.remove(self.path)
+            except OSError:
+                pass
+
+    def _load(self):
+        self._loaded_from_disk = True
+        try:
+            with perf.span(perf.STORAGE, f"aggregates.load {self.name}"), open(self.path) as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return
+        if state.get("version") != STATE_VERSION or state.get("time_field") != self.time_field:
+            return
+        self.cursor = state["cursor"]
+        self.totals = state["totals"]
+        self.days = _frame_from_state(state["days"])
+        self.symbols = _frame_from_state(state["symbols"])
+        self._boundary_keys = set(state["boundary_keys"])
+
+    def _save(self):
+        if not PERSIST_AGGREGATES:
+            return
+        state = {
+            "version": STATE_VERSION,
+            "time_field": self.time_field,
+            "cursor": self.cursor,
+            "totals": self.totals,
+            "days": _frame_state(self.days),
+            "symbols": _frame_state(self.symbols),
+            "boundary_keys": sorted(self._boundary_keys),
+        }
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        try:
+            with perf.span(perf.STORAGE, f"aggregates.save {self.name}"):
+                os.makedirs(AGGREGATE_CACHE_DIR, exist_ok=True)
+                with open(tmp_path, "w") as f:
+                    json.dump(state, f)
+                os.replace(tmp_path, self.path)
+        except OSError:
+            # The disk copy only saves a refold on restart; never fail a render on it
+            pass
+
+
+_aggregates = {}
+_aggregates_lock = threading.Lock()
+
+
+def get_aggregates(base_url, endpoint, namespace=None):
+    """Return the process-wide aggregates of a trade endpoint, creating them on first use.
+
+    ``namespace`` replaces the one derived from base_url, for sources that
+    are not a backend, such as binance_ingest.
+    """
+    with _aggregates_lock:
+        key = (base_url, endpoint, namespace)
+        if key not in _aggregates:
+            # Namespaced per backend, like the delta_sync history cache
+            namespace = namespace or urlparse(base_url).netloc.replace(':', '_')
+            name = f"{namespace}__{endpoint}"
+            _aggregates[key] = TradeAggregates(name, TIME_FIELDS[endpoint])
+        return _aggregates[key]
+
+
+def combine(sources):
+    """(overall totals, per-symbol stats) across several sources, e.g. one per account.
+
+    Same shapes as TradeAggregates.overall() and by_symbol().
+    """
+    totals = dict.fromkeys(STAT_COLUMNS, 0.0)
+    totals["min"] = totals["max"] = np.nan
+    symbols = _empty_stats()
+    for source in sources:
+        with source._lock:
+            part, part_symbols = dict(source.totals), source.symbols
+        for name in ("count", "sum", "wins"):
+            totals[name] += part[name]
+        totals["min"] = float(np.fmin(totals["min"], part["min"]))
+        totals["max"] = float(np.fmax(totals["max"], part["max"]))
+        symbols = _merge(symbols, part_symbols)
+    return _with_win_rate(totals), _symbols_with_win_rate(symbols)
+
+
+def reset_all():
+    """Start every source's running stats over on its next fold."""
+    with _aggregates_lock:
+        sources = list(_aggregates.values())
+    for source in sources:
+        source.reset()
@@ -0,0 +1,103 @@
+"""Benchmark: running trade aggregates vs recomputing them from every trade.
+
+For a growing trade history it reports, per history size:
+
+  recompute     win rate, total PNL, per-symbol and per-day sums with the
+                cumulative PNL, from the whole frame (what the analytics
+                pages did on every render)
+  cold fold     folding the whole history into empty aggregates
+  new trades    folding a history that grew by --new trades
+  unchanged     folding the same history again
+
+Usage: python benchmarks/bench_aggregates.py [--rows 10000 100000 1000000] [--new 100]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT)
+os.environ.setdefault("DASHBOARD_AGGREGATE_CACHE", tempfile.mkdtemp(prefix="bench-aggregates-"))
+
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+
+import aggregates  # noqa: E402
+import formatting  # noqa: E402
+import mock_backend  # noqa: E402
+
+DEFAULT_ROWS = [10_000, 100_000, 1_000_000]
+REPEAT = 5
+
+
+def trade_history(rows, new, seed=0):
+    """(history, history plus ``new`` later trades) as typed frames."""
+    rng = np.random.default_rng(seed)
+    now_ms = int(time.time() * 1000)
+    table = mock_backend._trades(rng, rows + new, now_ms)
+    frame = pd.DataFrame(table)
+    frame["Symbol"] = frame["Symbol"].astype("category")
+    return frame.iloc[:rows], frame
+
+
+def recompute(df):
+    days = formatting.to_local_datetime(df["Time"], unit="ms").dt.tz_localize(None).dt.normalize()
+    daily = df.groupby(days)["PNL"].sum()
+    return {
+        "win_rate": (df["PNL"] > 0).mean() * 100,
+        "total": df["PNL"].sum(),
+        "symbols": df.groupby("Symbol", observed=True)["PNL"].agg(["size", "sum", "min", "max"]),
+        "cumulative": daily.cumsum(),
+    }
+
+
+def best_of(func, repeat=REPEAT):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return min(timings)
+
+
+def bench(rows, new):
+    history, grown = trade_history(rows, new)
+    full = best_of(lambda: recompute(grown))
+
+    def cold():
+        stats = aggregates.TradeAggregates("bench", "Time")
+        stats.fold(history)
+        return stats
+    cold_ms = best_of(cold, repeat=1)
+
+    def incremental():
+        stats = cold()
+        start = time.perf_counter()
+        stats.fold(grown)
+        return (time.perf_counter() - start) * 1000, stats
+    new_ms, stats = min((incremental() for _ in range(3)), key=lambda result: result[0])
+    unchanged_ms = best_of(lambda: stats.fold(grown))
+
+    reference = recompute(grown)
+    overall = stats.overall()
+    assert np.isclose(overall["sum"], reference["total"]) and np.isclose(overall["win_rate"], reference["win_rate"])
+    assert np.allclose(stats.by_day()["cumulative"].to_numpy(), reference["cumulative"].to_numpy())
+
+    print(f"{rows:>10,} trades  recompute {full:8.1f} ms  cold fold {cold_ms:8.1f} ms  "
+          f"+{new} trades {new_ms:7.1f} ms  unchanged {unchanged_ms:6.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=DEFAULT_ROWS)
+    parser.add_argument("--new", type=int, default=100, help="trades added between renders")
+    args = parser.parse_args()
+    aggregates.PERSIST_AGGREGATES = False
+    for rows in args.rows:
+        bench(rows, args.new)
+
+
+if __name__ == "__main__":
+    main()
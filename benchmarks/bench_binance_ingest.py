@@ -0,0 +1,96 @@
+"""Benchmark: direct Binance ingestion against mock_binance, paced vs unpaced.
+
+Runs a full trade and order history download, then an incremental re-sync,
+through binance_ingest against the local stub with a shortened weight
+window (--limit weight per --window seconds), twice:
+
+  paced      the TokenBucket sized to the limit, aligned to the stub's
+             X-MBX-USED-WEIGHT-1M header
+  unpaced    a bucket that never blocks; the stub answers 429 with
+             Retry-After once the window's weight is spent
+
+and reports wall time, requests, 429 answers, the peak weight the stub saw
+in one window and the rows ingested. The frames must have the backend's
+trade_history / order_history columns and every stub record.
+
+Usage: python benchmarks/bench_binance_ingest.py [--trades 50000] [--limit 400] [--window 5]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT)
+
+import binance_ingest  # noqa: E402
+import mock_backend  # noqa: E402
+import mock_binance  # noqa: E402
+import schemas  # noqa: E402
+
+
+def run(base_url, bucket, meter):
+    client = binance_ingest.BinanceFutures(mock_binance.API_KEY, mock_binance.API_SECRET, base_url, bucket=bucket)
+    ingestor = binance_ingest.BinanceIngestor(client, mock_binance.SYMBOLS)
+    start = time.perf_counter()
+    frames = {endpoint: store.sync(ingestor.symbols()) for endpoint, store in ingestor.stores.items()}
+    full_s = time.perf_counter() - start
+    requests_before = client.requests
+    start = time.perf_counter()
+    for store in ingestor.stores.values():
+        store.sync(ingestor.symbols())
+    resync_s = time.perf_counter() - start
+    return {
+        "full_s": full_s,
+        "resync_s": resync_s,
+        "resync_requests": client.requests - requests_before,
+        "resync_rows": sum(store.rows_fetched for store in ingestor.stores.values()),
+        "requests": client.requests,
+        "rate_limited": client.rate_limited,
+        "peak": meter.peak,
+        "frames": frames,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--trades", type=int, default=50_000)
+    parser.add_argument("--limit", type=int, default=400, help="request weight per window")
+    parser.add_argument("--window", type=float, default=5, help="seconds per weight window")
+    parser.add_argument("--latency", type=float, default=0.01, help="seconds per stub request")
+    args = parser.parse_args()
+
+    binance_ingest.WEIGHT_LIMIT = args.limit
+    binance_ingest.WEIGHT_WINDOW = args.window
+    binance_ingest.PERSIST_HISTORY = False
+    os.environ.setdefault("DASHBOARD_HISTORY_CACHE", tempfile.mkdtemp())
+    modes = {
+        "paced": binance_ingest.weight_bucket,
+        "unpaced": lambda: binance_ingest.TokenBucket(10**9, 10**9),
+    }
+    print(f"{args.trades:,} trades, {args.trades // 2:,} orders over {len(mock_binance.SYMBOLS)} symbols; "
+          f"limit {args.limit} weight per {args.window:g} s")
+    for label, bucket in modes.items():
+        app = mock_binance.create_app(args.trades, limit=args.limit, window=args.window, latency=args.latency)
+        meter = app.config["WEIGHT_METER"]
+        server = mock_backend.serve(app)
+        try:
+            # Start on a fresh window so both modes get the same budget
+            time.sleep(args.window - time.time() % args.window)
+            result = run(f"http://127.0.0.1:{server.server_port}", bucket(), meter)
+        finally:
+            server.shutdown()
+        for endpoint, frame in result["frames"].items():
+            assert set(frame.columns) == set(schemas.SCHEMAS[endpoint]), frame.columns
+        trades = len(result["frames"]["trade_history"])
+        orders = len(result["frames"]["order_history"])
+        assert trades == args.trades, trades
+        print(f"  {label:<8} full sync {result['full_s']:6.2f} s  requests {result['requests']:4d}  "
+              f"429s {result['rate_limited']:3d}  peak weight {result['peak']:5d}/{args.limit}  "
+              f"rows {trades + orders:,}  re-sync {result['resync_s'] * 1000:5.0f} ms "
+              f"({result['resync_requests']} requests, {result['resync_rows']} rows)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""Benchmark: one bundle round trip vs concurrent individual calls.
+
+Serves mock_backend with a fixed per-request latency standing in for a
+backend in another region, once threaded and once answering one request at
+a time (a single sync worker), and times data_client.fetch_many with the
+response cache emptied before every call:
+
+  bundle        backend with the /bundle route: one request
+  individual    USE_BUNDLE off: one concurrent request per endpoint
+  fallback      backend without the route, after the one-off detection
+  detection     the first call to a backend without the route, which pays
+                for the 404 before falling back
+
+Usage: python benchmarks/bench_bundle.py [--latency 0.08] [--repeat 20]
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT)
+
+import data_client  # noqa: E402
+import mock_backend  # noqa: E402
+
+ENDPOINT_SETS = {
+    "analytics": ["pnl_analytics", "positions"],
+    "live views": ["account_summary", "positions", "open_orders", "open_positions"],
+}
+
+
+def fetch_ms(base_url, endpoints):
+    # Only the response cache: which backends lack the route stays known
+    data_client._cache.clear()
+    start = time.perf_counter()
+    results = list(data_client.fetch_many(base_url, endpoints))
+    elapsed = (time.perf_counter() - start) * 1000
+    assert all(error is None for _, _, error in results), results
+    assert sorted(endpoint for endpoint, _, _ in results) == sorted(endpoints)
+    return elapsed
+
+
+def median_ms(base_url, endpoints, repeat):
+    return statistics.median(fetch_ms(base_url, endpoints) for _ in range(repeat))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--latency", type=float, default=0.08, help="seconds per request")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{args.latency * 1000:.0f} ms per request, median of {args.repeat}")
+    for backend, threaded in (("threaded", True), ("1 worker", False)):
+        with_route = mock_backend.serve(mock_backend.create_app(1_000, latency=args.latency), threaded=threaded)
+        without_route = mock_backend.serve(
+            mock_backend.create_app(1_000, bundle=False, latency=args.latency), threaded=threaded
+        )
+        bundled = f"http://127.0.0.1:{with_route.server_port}"
+        plain = f"http://127.0.0.1:{without_route.server_port}"
+        try:
+            for label, endpoints in ENDPOINT_SETS.items():
+                data_client.clear_cache()
+                detection = fetch_ms(plain, endpoints)
+                fallback = median_ms(plain, endpoints, args.repeat)
+                bundle = median_ms(bundled, endpoints, args.repeat)
+                data_client.USE_BUNDLE = False
+                individual = median_ms(bundled, endpoints, args.repeat)
+                data_client.USE_BUNDLE = True
+                print(
+                    f"{backend:<8} {label:<11} ({len(endpoints)} endpoints)  bundle {bundle:6.1f} ms  "
+                    f"individual {individual:6.1f} ms  fallback {fallback:6.1f} ms  detection {detection:6.1f} ms"
+                )
+        finally:
+            with_route.shutdown()
+            without_route.shutdown()
+
+
+if __name__ == "__main__":
+    main()
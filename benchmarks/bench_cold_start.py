@@ -0,0 +1,120 @@
+"""Benchmark: cold-start cost of each dashboard against a startup budget.
+
+Each measurement runs in a fresh interpreter that has already imported
+streamlit, as a running streamlit server has, so only the dashboard's own
+cost is counted:
+
+  import        importing the modules the app script imports at top level
+  first paint   the first script run of the default page (Account Summary /
+                Account Overview) through streamlit's AppTest, against
+                mock_backend, including those imports, less the first run of
+                a one-metric script (AppTest's own start-up cost, shown as
+                the floor)
+  heavy         which of pandas, plotly.express and pyarrow that first run
+                loaded; metric-only pages should load none of them
+
+Each figure is the median of --repeat fresh interpreters. Exits with status
+1 when a median exceeds its budget.
+
+Usage: python benchmarks/bench_cold_start.py [--repeat 5] [--apps app.py app1.py]
+"""
+import argparse
+import ast
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT)
+
+import mock_backend  # noqa: E402
+
+APPS = ["app.py", "app1.py"]
+HEAVY_MODULES = ["pandas", "plotly.express", "pyarrow"]
+# Budgets in milliseconds, per app
+IMPORT_BUDGET_MS = 150
+FIRST_PAINT_BUDGET_MS = 450
+FLOOR_SCRIPT = "import streamlit as st\nst.metric('Balance', 1)\n"
+TIMEOUT = 120
+
+PROBE = """
+import importlib, json, os, sys, time
+import streamlit
+from streamlit.testing.v1 import AppTest
+sys.path.insert(0, {root!r})
+os.chdir({root!r})
+mode, app, modules = {mode!r}, {app!r}, {modules!r}
+start = time.perf_counter()
+if mode == "import":
+    for name in modules:
+        importlib.import_module(name)
+elif mode == "floor":
+    AppTest.from_string({floor!r}, default_timeout={timeout}).run()
+else:
+    at = AppTest.from_file(app, default_timeout={timeout}).run()
+    assert not at.exception, [e.value for e in at.exception]
+elapsed = (time.perf_counter() - start) * 1000
+print(json.dumps({{"ms": elapsed, "heavy": [name for name in {heavy!r} if name in sys.modules]}}))
+"""
+
+
+def top_level_imports(app):
+    """Modules an app script imports at module level, in order."""
+    with open(os.path.join(ROOT, app)) as f:
+        tree = ast.parse(f.read())
+    modules = []
+    for node in tree.body:
+        if isinstance(node, ast.Import):
+            modules.extend(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+            modules.append(node.module)
+    return modules
+
+
+def probe(mode, app, env):
+    code = PROBE.format(
+        root=ROOT, mode=mode, app=app, modules=top_level_imports(app), timeout=TIMEOUT, heavy=HEAVY_MODULES,
+        floor=FLOOR_SCRIPT,
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], env=env, capture_output=True, text=True, timeout=TIMEOUT, check=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--apps", nargs="+", default=APPS)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--rows", type=int, default=1_000, help="history rows served by mock_backend")
+    args = parser.parse_args()
+
+    server = mock_backend.serve(mock_backend.create_app(args.rows))
+    env = dict(os.environ, DASHBOARD_API_SERVER=f"http://127.0.0.1:{server.server_port}")
+    over_budget = False
+    try:
+        floor_ms = statistics.median(probe("floor", APPS[0], env)["ms"] for _ in range(args.repeat))
+        print(f"AppTest floor {floor_ms:.1f} ms")
+        for app in args.apps:
+            imports = [probe("import", app, env) for _ in range(args.repeat)]
+            paints = [probe("paint", app, env) for _ in range(args.repeat)]
+            import_ms = statistics.median(run["ms"] for run in imports)
+            paint_ms = statistics.median(run["ms"] for run in paints) - floor_ms
+            heavy = paints[0]["heavy"]
+            print(
+                f"{app:<8} import {import_ms:7.1f} ms (budget {IMPORT_BUDGET_MS})   "
+                f"first paint {paint_ms:7.1f} ms (budget {FIRST_PAINT_BUDGET_MS})   "
+                f"heavy: {', '.join(heavy) or 'none'}"
+            )
+            over_budget |= import_ms > IMPORT_BUDGET_MS or paint_ms > FIRST_PAINT_BUDGET_MS
+    finally:
+        server.shutdown()
+    if over_budget:
+        print("Cold start over budget")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+"""Benchmark: widget rerun cost with and without fragment-scoped reruns.
+
+Serves synthetic data from a local HTTP server and drives app.py through
+streamlit's AppTest. For Trade History (search box) and Analytics (zoom
+slider) it reports:
+
+  first load       full script run, cold
+  full rerun       full script run after the widget changes, which is what
+                   every widget interaction cost before the sections were
+                   fragments (inputs are memoized either way)
+  fragment rerun   the fragment alone with the arguments it was last called
+                   with, which is all a widget interaction re-runs now
+
+AppTest always re-runs the whole script, so the fragment is timed on its own.
+
+Usage: python benchmarks/bench_fragments.py [trades] [days]
+"""
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, ROOT)
+os.environ.setdefault("DASHBOARD_HISTORY_CACHE", tempfile.mkdtemp(prefix="bench-history-"))
+
+from streamlit.testing.v1 import AppTest  # noqa: E402
+
+TIMEOUT = 600
+
+
+def synthetic_payloads(trades, days):
+    rng = np.random.default_rng(0)
+    symbols = np.array(["BTCUSDT", "ETHUSDT", "SOLUSDT", "BNBUSDT", "XRPUSDT"])
+    times = np.sort(rng.integers(1_600_000_000_000, 1_750_000_000_000, trades))
+    trade_history = [
+        {
+            "Symbol": str(symbol), "Side": side, "Trade ID": i, "Order ID": i * 7,
+            "Price": round(float(price), 2), "Quantity": round(float(qty), 3),
+            "PNL": round(float(pnl), 2), "Commission": 0.01, "Time": int(stamp),
+        }
+        for i, (symbol, side, price, qty, pnl, stamp) in enumerate(zip(
+            symbols[rng.integers(0, len(symbols), trades)],
+            np.where(rng.random(trades) > 0.5, "BUY", "SELL"),
+            rng.random(trades) * 60000, rng.random(trades) * 5,
+            rng.normal(0, 20, trades), times,
+        ))
+    ]
+    dates = np.datetime64("2015-01-01") + np.arange(days)
+    pnl_analytics = [{"Date": str(date), "PNL": round(float(pnl), 2)} for date, pnl in zip(dates, rng.normal(5, 50, days))]
+    positions = [
+        {"Symbol": str(symbol), "Size": float(size), "PNL": float(pnl)}
+        for symbol, size, pnl in zip(symbols, rng.random(len(symbols)), rng.normal(0, 50, len(symbols)))
+    ]
+    return {"trade_history": trade_history, "pnl_analytics": pnl_analytics, "positions": positions}
+
+
+def serve(payloads):
+    encoded = {name: json.dumps(rows).encode() for name, rows in payloads.items()}
+
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            endpoint = url.path.strip("/")
+            since = parse_qs(url.query).get("since")
+            if since and endpoint == "trade_history":
+                # Incremental sync: only trades at or after the cursor
+                cursor = int(since[0])
+                body = json.dumps([row for row in payloads[endpoint] if row["Time"] >= cursor]).encode()
+            else:
+                body = encoded.get(endpoint, b"[]")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def app_under_test(port):
+    os.environ["DASHBOARD_API_SERVER"] = f"http://127.0.0.1:{port}"
+    return AppTest.from_file(os.path.join(ROOT, "app.py"), default_timeout=TIMEOUT)
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return result, (time.perf_counter() - start) * 1000
+
+
+def report(page, first, full, fragment):
+    print(f"{page:<15} first load {first:9.1f} ms   full rerun {full:9.1f} ms   "
+          f"fragment rerun {fragment:9.1f} ms   ({full / fragment:.0f}x less work)")
+
+
+def trade_history_fragment(df, column_config):
+    from dashboard_pages import frames
+    frames.display_dataframe_with_search(df, "Trade History", column_config)
+
+
+def cumulative_pnl_fragment(pnl_df):
+    from dashboard_pages import analytics
+    analytics.cumulative_pnl_chart(pnl_df)
+
+
+def fragment_test(func, **kwargs):
+    at = AppTest.from_function(func, kwargs=kwargs, default_timeout=TIMEOUT)
+    # Not counted: imports the page module and registers the fragment
+    at.run()
+    return at
+
+
+def bench_trade_history(port):
+    at = app_under_test(port)
+    at.run()
+    at.sidebar.radio[0].set_value("Trade History")
+    _, first = timed(at.run)
+    at.text_input[0].set_value("btcusdt")
+    _, full = timed(at.run)
+
+    import formatting
+    import page_common
+    df = page_common._memo["trade_history"][1]
+    frag = fragment_test(trade_history_fragment, df=df, column_config=formatting.datetime_column_config(["Time"]))
+    frag.text_input[0].set_value("btcusdt")
+    _, fragment = timed(frag.run)
+    report("Trade History", first, full, fragment)
+
+
+def bench_analytics(port):
+    at = app_under_test(port)
+    at.run()
+    at.sidebar.radio[0].set_value("Analytics")
+    _, first = timed(at.run)
+    slider = at.slider(key="Cumulative PNL_zoom")
+    lo, hi = slider.value
+    slider.set_value((lo + (hi - lo) / 2, hi))
+    _, full = timed(at.run)
+
+    import page_common
+    pnl_df = page_common._memo["pnl_analytics"][1]
+    frag = fragment_test(cumulative_pnl_fragment, pnl_df=pnl_df)
+    slider = frag.slider(key="Cumulative PNL_zoom")
+    slider.set_value((lo + (hi - lo) / 2, hi))
+    _, fragment = timed(frag.run)
+    report("Analytics", first, full, fragment)
+
+
+def main():
+    trades = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    days = int(sys.argv[2]) if len(sys.argv) > 2 else 5_000
+    server = serve(synthetic_payloads(trades, days))
+    port = server.server_address[1]
+    print(f"{trades:,} trades, {days:,} days of PNL")
+    bench_trade_history(port)
+    bench_analytics(port)
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""Benchmark: json + pd.DataFrame + ad hoc coercion vs schemas.build_frame.
+
+Usage: python benchmarks/bench_ingest.py [rows]
+"""
+import json
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import jsonio  # noqa: E402
+import schemas  # noqa: E402
+
+
+def timed(label, func):
+    start = time.perf_counter()
+    result = func()
+    print(f"{label:<45} {time.perf_counter() - start:8.3f} s")
+    return result
+
+
+def make_payload(rows):
+    rng = np.random.default_rng(0)
+    symbols = ["BTCUSDT", "ETHUSDT", "SOLUSDT", "BNBUSDT", "XRPUSDT"]
+    records = [
+        {
+            "Trade ID": int(i),
+            "Symbol": symbols[i % len(symbols)],
+            "Side": "BUY" if i % 2 else "SELL",
+            "Price": f"{price:.2f}",
+            "Quantity": f"{qty:.3f}",
+            "PNL": float(pnl),
+            "Commission": float(abs(pnl) / 100),
+            "Time": 1_700_000_000_000 + int(i) * 1000,
+        }
+        for i, price, qty, pnl in zip(range(rows), rng.random(rows) * 60000, rng.random(rows), rng.normal(size=rows))
+    ]
+    return json.dumps(records).encode()
+
+
+def baseline(content):
+    df = pd.DataFrame(json.loads(content))
+    df["Price"] = df["Price"].astype(float)
+    df["Quantity"] = pd.to_numeric(df["Quantity"], errors="coerce")
+    df["PNL"] = df["PNL"].astype(float)
+    df["Time"] = pd.to_datetime(df["Time"], unit="ms", errors="coerce")
+    return df
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    content = make_payload(rows)
+    print(f"{rows:,} trade_history rows, {len(content) / 1e6:.1f} MB of JSON")
+
+    old = timed("json.loads + DataFrame + ad hoc coercion", lambda: baseline(content))
+    new, issues = timed(
+        f"{'orjson' if jsonio.orjson else 'json'} + schemas.build_frame",
+        lambda: schemas.build_frame("trade_history", jsonio.loads(content)),
+    )
+    print(f"memory: {old.memory_usage(deep=True).sum() / 1e6:.1f} MB -> {new.memory_usage(deep=True).sum() / 1e6:.1f} MB")
+    print(f"issues: {issues}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""Benchmark: push-to-screen latency of the live feed against mock_feed.
+
+Starts the stand-in SSE server, connects a LiveFeed and polls it the way a
+live section's fragment does, every refresh interval. Reports how long
+updates took from the server to the consumer and to the (simulated) render.
+
+Usage: python benchmarks/bench_live_feed.py [seconds] [refresh_seconds]
+"""
+import os
+import socket
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import live_feed  # noqa: E402
+import mock_feed  # noqa: E402
+
+TOPICS = ["account_summary", "positions", "open_orders"]
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def report(label, samples):
+    if not samples:
+        print(f"{label:<30} no samples")
+        return
+    p50, p95, p99 = np.percentile(samples, [50, 95, 99]) * 1000
+    print(f"{label:<30} n={len(samples):<5} p50 {p50:8.2f} ms  p95 {p95:8.2f} ms  p99 {p99:8.2f} ms")
+
+
+def main():
+    duration = float(sys.argv[1]) if len(sys.argv) > 1 else 10.0
+    refresh = float(sys.argv[2]) if len(sys.argv) > 2 else 0.5
+    port = free_port()
+    server = mock_feed.serve(port, interval=0.05)
+    feed = live_feed.LiveFeed(f"http://127.0.0.1:{port}/{live_feed.STREAM_PATH}", TOPICS).start()
+
+    received, rendered = [], []
+    seen = {topic: 0 for topic in TOPICS}
+    deadline = time.time() + duration
+    while time.time() < deadline:
+        time.sleep(refresh)
+        for topic in TOPICS:
+            snapshot = feed.snapshot(topic)
+            if snapshot is None or snapshot.version == seen[topic]:
+                continue
+            seen[topic] = snapshot.version
+            if snapshot.sent_at:
+                received.append(snapshot.received_at - snapshot.sent_at)
+            rendered.append(feed.record_render(topic, snapshot))
+
+    feed.stop()
+    server.shutdown()
+    print(f"{duration:.0f} s of updates, fragment refresh every {refresh * 1000:.0f} ms")
+    report("server -> consumer", received)
+    report("server -> screen (polled)", rendered)
+    print(f"versions seen: {seen}")
+
+
+if __name__ == "__main__":
+    main()
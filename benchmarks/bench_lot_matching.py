@@ -0,0 +1,120 @@
+"""Benchmark: vectorized lot matching vs a per-fill Python loop.
+
+Rebuilds closed positions from mock_backend's synthetic trade fills (random
+buys and sells per symbol, so positions grow, shrink and flip) with
+lot_matching.match, FIFO and average cost, and with a straightforward loop
+over the fills keeping a deque of open lots (or a running average). Reports
+the time of each per history size; the loop is skipped above --loop-max
+fills. Where both run, per-symbol size, PNL and fee totals and the row
+counts must agree.
+
+Usage: python benchmarks/bench_lot_matching.py [--rows 10000 100000 1000000] [--loop-max 100000]
+"""
+import argparse
+import os
+import sys
+import time
+from collections import deque
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT)
+
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+
+import lot_matching  # noqa: E402
+import mock_backend  # noqa: E402
+
+DEFAULT_ROWS = [10_000, 100_000, 1_000_000]
+EPSILON = 1e-9  # quantities below this count as closed
+
+
+def trade_history(rows, seed=0):
+    rng = np.random.default_rng(seed)
+    frame = pd.DataFrame(mock_backend._trades(rng, rows, int(time.time() * 1000)))
+    frame["Symbol"] = frame["Symbol"].astype("category")
+    return frame
+
+
+def loop_fifo(trades):
+    """Reference FIFO: one deque of [quantity, price, fee per unit, time] lots per symbol."""
+    rows = []
+    for symbol, fills in trades.groupby("Symbol", observed=True, sort=False):
+        lots, sign = deque(), 0
+        for side, price, quantity, commission, at in fills[["Side", "Price", "Quantity", "Commission", "Time"]].itertuples(index=False):
+            direction = 1 if side == "BUY" else -1
+            unit_fee = commission / quantity
+            remaining = quantity
+            while remaining > EPSILON and lots and sign == -direction:
+                lot = lots[0]
+                size = min(lot[0], remaining)
+                rows.append((symbol, sign * size, sign * (price - lot[1]) * size, size * (lot[2] + unit_fee)))
+                lot[0] -= size
+                remaining -= size
+                if lot[0] <= EPSILON:
+                    lots.popleft()
+            if not lots:
+                sign = 0
+            if remaining > EPSILON:
+                lots.append([remaining, price, unit_fee, at])
+                sign = direction
+    return pd.DataFrame(rows, columns=["Symbol", "Size", "PNL", "Fee"])
+
+
+def loop_average(trades):
+    """Reference average cost: one running position and average price per symbol."""
+    rows = []
+    for symbol, fills in trades.groupby("Symbol", observed=True, sort=False):
+        position = cost = fees = 0.0
+        for side, price, quantity, commission in fills[["Side", "Price", "Quantity", "Commission"]].itertuples(index=False):
+            signed = quantity if side == "BUY" else -quantity
+            unit_fee = commission / quantity
+            if position and np.sign(signed) != np.sign(position):
+                size = min(abs(signed), abs(position))
+                sign = np.sign(position)
+                rows.append((symbol, sign * size, sign * (price - cost) * size, size * (fees + unit_fee)))
+                position += sign * -size
+                signed += sign * size
+                if abs(position) <= EPSILON:
+                    position = 0.0
+            if abs(signed) > EPSILON:
+                total = abs(position) + abs(signed)
+                cost = (cost * abs(position) + price * abs(signed)) / total
+                fees = (fees * abs(position) + unit_fee * abs(signed)) / total
+                position += signed
+    return pd.DataFrame(rows, columns=["Symbol", "Size", "PNL", "Fee"])
+
+
+def totals(frame):
+    symbols = frame["Symbol"].astype(str).rename("Symbol")
+    return frame[["Size", "PNL", "Fee"]].groupby(symbols).sum().sort_index()
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return (time.perf_counter() - start) * 1000, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=DEFAULT_ROWS)
+    parser.add_argument("--loop-max", type=int, default=100_000, help="largest history the Python loop runs on")
+    args = parser.parse_args()
+    references = {lot_matching.FIFO: loop_fifo, lot_matching.AVERAGE: loop_average}
+    for rows in args.rows:
+        trades = trade_history(rows)
+        print(f"{rows:,} fills")
+        for method, reference in references.items():
+            vector_ms, matched = timed(lot_matching.match, trades, method)
+            line = f"  {method:<8} vectorized {vector_ms:8.1f} ms ({len(matched):,} rows)"
+            if rows <= args.loop_max:
+                loop_ms, expected = timed(reference, trades)
+                assert len(matched) == len(expected), (len(matched), len(expected))
+                pd.testing.assert_frame_equal(totals(matched), totals(expected), rtol=1e-6)
+                line += f"  loop {loop_ms:9.1f} ms  ({loop_ms / vector_ms:5.1f}x)"
+            print(line)
+
+
+if __name__ == "__main__":
+    main()
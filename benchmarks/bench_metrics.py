@@ -0,0 +1,76 @@
+"""Benchmark: performance metrics, prepared once per data version vs per window.
+
+Times metrics.prepare() (daily PNL, drawdowns, trade and per-symbol
+statistics) on synthetic trade_analytics histories, then a window switch:
+metrics.rolling() on the prepared daily series, against recomputing
+everything plus a per-day Python loop over the window, which is what a
+page without the cache would do. Rolling ratios must agree.
+
+Usage: python benchmarks/bench_metrics.py [--rows 10000 100000 1000000] [--window 30]
+"""
+import argparse
+import os
+import sys
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT)
+
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+
+import metrics  # noqa: E402
+import mock_backend  # noqa: E402
+
+DEFAULT_ROWS = [10_000, 100_000, 1_000_000]
+
+
+def trade_analytics(rows, seed=0):
+    rng = np.random.default_rng(seed)
+    now_ms = int(time.time() * 1000)
+    return pd.DataFrame({
+        "Symbol": pd.Categorical(rng.choice(mock_backend.SYMBOLS, rows)),
+        "PNL": rng.normal(0, 25, rows).round(2),
+        "Timestamp": rng.integers(now_ms - mock_backend.HISTORY_SPAN_MS, now_ms, rows),
+    })
+
+
+def loop_rolling(daily, window):
+    """Reference: Sharpe and Sortino of each window, one day at a time."""
+    values = daily.to_numpy()
+    sharpe, sortino = [np.nan] * len(values), [np.nan] * len(values)
+    for end in range(window, len(values) + 1):
+        chunk = values[end - window:end]
+        std = chunk.std(ddof=1)
+        downside = np.sqrt(np.mean(np.minimum(chunk, 0.0) ** 2))
+        scale = np.sqrt(metrics.PERIODS_PER_YEAR)
+        sharpe[end - 1] = chunk.mean() / std * scale if std > 0 else np.nan
+        sortino[end - 1] = chunk.mean() / downside * scale if downside > 0 else np.nan
+    return pd.DataFrame({"Sharpe": sharpe, "Sortino": sortino}, index=daily.index)
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return (time.perf_counter() - start) * 1000, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=DEFAULT_ROWS)
+    parser.add_argument("--window", type=int, default=metrics.DEFAULT_WINDOW)
+    args = parser.parse_args()
+    for rows in args.rows:
+        frame = trade_analytics(rows)
+        prepare_ms, performance = timed(metrics.prepare, "trade_analytics", frame)
+        cached_ms, rolling = timed(metrics.rolling, performance.daily, args.window)
+        start = time.perf_counter()
+        expected = loop_rolling(metrics.prepare("trade_analytics", frame).daily, args.window)
+        uncached_ms = (time.perf_counter() - start) * 1000
+        pd.testing.assert_frame_equal(rolling, expected, rtol=1e-9, check_freq=False)
+        print(f"{rows:,} trades over {len(performance.daily)} days: prepare {prepare_ms:7.1f} ms  "
+              f"window switch {cached_ms:5.1f} ms cached, {uncached_ms:7.1f} ms recomputed with a loop")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""Benchmark: row-wise apply search vs the cached search_index.
+
+Usage: python benchmarks/bench_search.py [rows]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import search_index  # noqa: E402
+
+
+def timed(label, func, repeat=1):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = func()
+    print(f"{label:<45} {(time.perf_counter() - start) / repeat * 1000:10.2f} ms")
+    return result
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    rng = np.random.default_rng(0)
+    symbols = np.array(["BTCUSDT", "ETHUSDT", "SOLUSDT", "BNBUSDT", "XRPUSDT"])
+    df = pd.DataFrame({
+        "Order ID": rng.integers(10**9, 10**10, rows),
+        "Symbol": symbols[rng.integers(0, len(symbols), rows)],
+        "Side": np.where(rng.random(rows) > 0.5, "BUY", "SELL"),
+        "Status": np.array(["FILLED", "CANCELED", "NEW"])[rng.integers(0, 3, rows)],
+        "Price": rng.random(rows) * 1000,
+        "Order Time": pd.to_datetime(rng.integers(1_600_000_000_000, 1_750_000_000_000, rows), unit="ms", utc=True),
+    })
+    print(f"{rows:,} rows")
+
+    term = "btcusdt"
+    timed("apply(row.astype(str).str.contains)",
+          lambda: df[df.apply(lambda row: row.astype(str).str.contains(term, case=False).any(), axis=1)])
+    timed("index build (once per dataset version)", lambda: search_index.get_index(df, "bench"))
+    timed("same-frame lookup of cached index", lambda: search_index.get_index(df, "bench"), repeat=20)
+    timed("content-hash lookup of a copy", lambda: search_index.get_index(df.copy(), "bench"), repeat=5)
+    index = search_index.get_index(df, "bench")
+    timed("free text: btcusdt", lambda: index.search("btcusdt"), repeat=20)
+    timed("scoped: symbol:BTCUSDT status:FILLED", lambda: index.search("symbol:BTCUSDT status:FILLED"), repeat=20)
+    index.search("b")
+    timed("narrowing keystroke: b -> bt", lambda: index.search("bt"))
+
+
+if __name__ == "__main__":
+    main()
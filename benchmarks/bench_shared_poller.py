@@ -0,0 +1,104 @@
+"""Benchmark: backend requests for N sessions, per-session fetches vs the shared poller.
+
+Simulates --sessions viewers, each re-rendering the live views every
+--render seconds for --duration seconds against mock_backend (with
+--latency per request), and counts the requests the backend received:
+
+  per session   every render calls data_client.get_json; the process-wide
+                TTL cache is shared, but each expiry sends every session
+                that renders before the first response lands to the backend
+  shared        every render reads poller snapshots; one background thread
+                refreshes each endpoint once per TTL
+
+Also reports the median render time, which includes fetches made on the
+render path.
+
+Usage: python benchmarks/bench_shared_poller.py [--sessions 20] [--duration 12]
+"""
+import argparse
+import collections
+import os
+import statistics
+import sys
+import threading
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT)
+
+from flask import request  # noqa: E402
+
+import data_client  # noqa: E402
+import mock_backend  # noqa: E402
+import poller  # noqa: E402
+
+ENDPOINTS = ["account_summary", "positions", "open_orders"]
+# Short TTLs so a run sees several expiries
+INTERVALS = {"account_summary": 2, "positions": 1, "open_orders": 1}
+
+
+def simulate(sessions, duration, render_every, read):
+    """Run the sessions; returns the render times in milliseconds."""
+    stop = threading.Event()
+    timings = []
+
+    def session():
+        while not stop.is_set():
+            start = time.perf_counter()
+            for endpoint in ENDPOINTS:
+                read(endpoint)
+            timings.append((time.perf_counter() - start) * 1000)
+            stop.wait(render_every)
+
+    threads = [threading.Thread(target=session) for _ in range(sessions)]
+    for thread in threads:
+        thread.start()
+    time.sleep(duration)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=20)
+    parser.add_argument("--duration", type=float, default=12, help="seconds per mode")
+    parser.add_argument("--render", type=float, default=0.5, help="seconds between a session's renders")
+    parser.add_argument("--latency", type=float, default=0.05, help="seconds per backend request")
+    args = parser.parse_args()
+
+    app = mock_backend.create_app(1_000, latency=args.latency)
+    hits = collections.Counter()
+
+    @app.before_request
+    def count():
+        hits[request.path] += 1
+
+    server = mock_backend.serve(app)
+    base_url = f"http://127.0.0.1:{server.server_port}"
+    data_client.ENDPOINT_TTL.update(INTERVALS)
+    try:
+        data_client.clear_cache()
+        direct = simulate(args.sessions, args.duration, args.render,
+                          lambda endpoint: data_client.get_json(base_url, endpoint))
+        direct_hits = sum(hits.values())
+
+        hits.clear()
+        data_client.clear_cache()
+        shared = poller.SharedPoller(base_url).start()
+        polled = simulate(args.sessions, args.duration, args.render, shared.read)
+        shared.stop()
+        shared_hits = sum(hits.values())
+    finally:
+        server.shutdown()
+
+    print(f"{args.sessions} sessions, {len(ENDPOINTS)} endpoints, {args.duration:.0f} s, "
+          f"{args.latency * 1000:.0f} ms per request")
+    for label, requests_made, timings in (("per session", direct_hits, direct), ("shared", shared_hits, polled)):
+        print(f"  {label:<12} backend requests {requests_made:5d} ({requests_made / args.duration:5.1f}/s)  "
+              f"render p50 {statistics.median(timings):6.1f} ms  max {max(timings):6.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
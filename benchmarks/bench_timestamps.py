@@ -0,0 +1,50 @@
+"""Benchmark: per-row format_timestamp apply vs formatting.to_local_datetime.
+
+Usage: python benchmarks/bench_timestamps.py [rows]
+"""
+import os
+import sys
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pytz
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import formatting  # noqa: E402
+
+
+def format_timestamp(timestamp):
+    """The per-row formatter the pages used before (app.py version)."""
+    try:
+        dt = datetime.fromtimestamp(timestamp / 1000, tz=pytz.UTC)
+        indian_tz = pytz.timezone('Asia/Kolkata')
+        indian_time = dt.astimezone(indian_tz)
+        return indian_time.strftime('%d %b %Y %I:%M:%S %p')
+    except Exception as e:
+        return f"Invalid Time ({e})"
+
+
+def timed(label, func):
+    start = time.perf_counter()
+    result = func()
+    print(f"{label:<40} {time.perf_counter() - start:8.3f} s")
+    return result
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    rng = np.random.default_rng(0)
+    stamps = pd.Series(rng.integers(1_600_000_000_000, 1_750_000_000_000, rows))
+    print(f"{rows:,} epoch-ms timestamps")
+
+    timed("apply(format_timestamp) + string sort",
+          lambda: stamps.apply(format_timestamp).sort_values(ascending=False))
+    timed("to_local_datetime + datetime sort",
+          lambda: formatting.to_local_datetime(stamps).sort_values(ascending=False))
+
+
+if __name__ == "__main__":
+    main()
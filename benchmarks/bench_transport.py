@@ -0,0 +1,87 @@
+"""Benchmark: JSON vs msgpack vs Arrow IPC payloads for the table endpoints.
+
+Encodes mock_backend's synthetic tables the way its server does and, per
+format, reports:
+
+  wire          body size in bytes
+  decode        transport.decode of the body into records or a pyarrow Table
+  frame         decode plus schemas.build_frame into the typed DataFrame the
+                pages use
+
+msgpack rows are skipped when msgpack is not installed. The frames built
+from every format are checked to be equal.
+
+Usage: python benchmarks/bench_transport.py [--rows 100000] [--endpoints trade_history order_history]
+"""
+import argparse
+import os
+import sys
+import time
+
+import pandas as pd
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT)
+
+import mock_backend  # noqa: E402
+import schemas  # noqa: E402
+import transport  # noqa: E402
+
+DEFAULT_ENDPOINTS = ["trade_history", "order_history", "position_history"]
+REPEAT = 5
+
+
+def best_of(func, repeat=REPEAT):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return min(timings), result
+
+
+def encodings(columns):
+    """(label, content type, body) per format this environment can produce."""
+    bodies = [
+        ("JSON", transport.JSON, mock_backend._encode(columns)),
+        ("Arrow IPC", transport.ARROW_STREAM, mock_backend.encode_arrow(columns)),
+    ]
+    if mock_backend.msgpack is not None and transport.msgpack is not None:
+        bodies.insert(1, ("msgpack", transport.MSGPACK, mock_backend.encode_msgpack(columns)))
+    return bodies
+
+
+def bench(endpoint, columns):
+    reference = None
+    json_bytes = json_frame_ms = None
+    for label, content_type, body in encodings(columns):
+        decode_ms, _ = best_of(lambda: transport.decode(body, content_type))
+        frame_ms, (frame, issues) = best_of(
+            lambda: schemas.build_frame(endpoint, transport.decode(body, content_type))
+        )
+        assert not issues, issues
+        if reference is None:
+            reference, json_bytes, json_frame_ms = frame, len(body), frame_ms
+        else:
+            pd.testing.assert_frame_equal(frame, reference, check_categorical=False)
+        print(
+            f"  {label:<10} wire {len(body) / 1e6:7.2f} MB ({len(body) / json_bytes:4.0%})  "
+            f"decode {decode_ms:7.1f} ms  frame {frame_ms:7.1f} ms ({json_frame_ms / frame_ms:5.1f}x)"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--endpoints", nargs="+", default=DEFAULT_ENDPOINTS)
+    args = parser.parse_args()
+    if transport.msgpack is None:
+        print("msgpack is not installed; skipping it")
+    payloads = mock_backend.generate(args.rows)
+    for endpoint in args.endpoints:
+        print(f"{endpoint}, {args.rows:,} rows (best of {REPEAT})")
+        bench(endpoint, payloads[endpoint])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,276 @@
+"""Benchmark every dashboard page against the mock backend.
+
+For each data size, starts mock_backend in-process and drives every page of
+app.py and app1.py through streamlit's AppTest: once cold (API cache and
+history stores cleared), then --repeat times warm in the same session,
+reporting the median warm run. Each run is split into phases by timing the
+shared modules' entry points:
+
+  fetch      HTTP round trips (requests.Session.request)
+  parse      JSON decoding (jsonio.loads)
+  transform  frame building, time normalization, search, downsampling and
+             the history disk cache
+  render     everything else in the script run: widgets, figures, styling
+
+Phase times are summed over threads, so with concurrent fetches they can
+add up to more than the wall-clock total.
+
+The JSON report records the commit it ran on; pass an earlier report with
+--compare to print per-page changes.
+
+Usage: python benchmarks/run_dashboard_bench.py [--rows 1000 100000] [--compare old.json]
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from functools import wraps
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT)
+os.environ.setdefault("DASHBOARD_HISTORY_CACHE", tempfile.mkdtemp(prefix="bench-history-"))
+os.environ.setdefault("DASHBOARD_AGGREGATE_CACHE", tempfile.mkdtemp(prefix="bench-aggregates-"))
+
+import pandas as pd  # noqa: E402
+import requests  # noqa: E402
+import streamlit  # noqa: E402
+from streamlit.testing.v1 import AppTest  # noqa: E402
+
+import aggregates  # noqa: E402
+import data_client  # noqa: E402
+import delta_sync  # noqa: E402
+import downsample  # noqa: E402
+import formatting  # noqa: E402
+import history_cache  # noqa: E402
+import jsonio  # noqa: E402
+import mock_backend  # noqa: E402
+import schemas  # noqa: E402
+import search_index  # noqa: E402
+import transport  # noqa: E402
+
+APPS = ["app.py", "app1.py"]
+# Page packages; they read DASHBOARD_API_SERVER when first imported
+PAGE_PACKAGES = ("dashboard_pages", "pro_pages")
+DEFAULT_ROWS = [1_000, 10_000, 100_000]
+TIMEOUT = 600
+RESULTS_DIR = os.path.join(ROOT, "benchmarks", "results")
+
+# (owner, attribute) pairs timed as each phase
+PHASES = {
+    "fetch": [(requests.Session, "request")],
+    "parse": [(transport, "decode"), (jsonio, "loads")],
+    "transform": [
+        (schemas, "build_frame"),
+        (schemas, "coerce_frame"),
+        (formatting, "normalize_time_columns"),
+        (search_index, "filter_frame"),
+        (downsample, "downsample"),
+        (history_cache, "append"),
+        (history_cache, "replace"),
+        (history_cache, "read_history"),
+    ],
+}
+
+
+class PhaseTimer:
+    """Accumulates time spent in the PHASES entry points.
+
+    Only the outermost instrumented call on a thread is counted, so e.g.
+    build_frame falling back to coerce_frame is not counted twice.
+    """
+
+    def __init__(self):
+        self.totals = {}
+        self.calls = {}
+        self.functions = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def reset(self):
+        with self._lock:
+            self.totals = {phase: 0.0 for phase in PHASES}
+            self.calls = {phase: 0 for phase in PHASES}
+            self.functions = {}
+
+    def wrap(self, phase, func):
+        name = f"{func.__module__}.{func.__qualname__}"
+
+        @wraps(func)
+        def timed(*args, **kwargs):
+            if getattr(self._local, "active", False):
+                return func(*args, **kwargs)
+            self._local.active = True
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - start
+                self._local.active = False
+                with self._lock:
+                    self.totals[phase] += elapsed
+                    self.calls[phase] += 1
+                    self.functions[name] = self.functions.get(name, 0.0) + elapsed
+        return timed
+
+    @contextmanager
+    def installed(self):
+        originals = []
+        for phase, targets in PHASES.items():
+            for owner, name in targets:
+                original = getattr(owner, name)
+                originals.append((owner, name, original))
+                setattr(owner, name, self.wrap(phase, original))
+        self.reset()
+        try:
+            yield self
+        finally:
+            for owner, name, original in originals:
+                setattr(owner, name, original)
+
+
+def pages(app):
+    """Navigation options of an app, read from a first run."""
+    at = AppTest.from_file(os.path.join(ROOT, app), default_timeout=TIMEOUT).run()
+    return list(at.sidebar.radio[0].options)
+
+
+def _measure(at, timer):
+    timer.reset()
+    start = time.perf_counter()
+    at.run()
+    total = time.perf_counter() - start
+    return {
+        "total_ms": round(total * 1000, 2),
+        **{f"{phase}_ms": round(seconds * 1000, 2) for phase, seconds in timer.totals.items()},
+        "render_ms": round(max(total - sum(timer.totals.values()), 0.0) * 1000, 2),
+        "calls": dict(timer.calls),
+        "functions_ms": {name: round(seconds * 1000, 2) for name, seconds in timer.functions.items()},
+        "exceptions": [exception.value for exception in at.exception],
+    }
+
+
+def run_page(app, page, timer, repeat):
+    """Cold and warm runs of one page; yields a result dict per kind of run.
+
+    The warm result is the run with the median total of ``repeat`` runs.
+    """
+    at = AppTest.from_file(os.path.join(ROOT, app), default_timeout=TIMEOUT).run()
+    at.sidebar.radio[0].set_value(page)
+    data_client.clear_cache()
+    delta_sync.reset_all()
+    aggregates.reset_all()
+    cold = _measure(at, timer)
+    warm_runs = sorted((_measure(at, timer) for _ in range(repeat)), key=lambda run: run["total_ms"])
+    warm = dict(warm_runs[len(warm_runs) // 2], samples_ms=[run["total_ms"] for run in warm_runs])
+    for label, result in (("cold", cold), ("warm", warm)):
+        yield {"app": app, "page": page, "run": label, **result}
+
+
+def unload_pages():
+    """Forget imported page modules, so the next run picks up a new backend URL."""
+    for name in list(sys.modules):
+        if name.split(".")[0] in PAGE_PACKAGES:
+            del sys.modules[name]
+
+
+def git_commit():
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+        dirty = subprocess.run(
+            ["git", "status", "--porcelain", "--untracked-files=no"], cwd=ROOT, capture_output=True, text=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+    return f"{commit}-dirty" if dirty else commit
+
+
+def print_result(result, rows):
+    status = "EXC" if result["exceptions"] else "ok"
+    print(
+        f"{rows:>9,} {result['app']:<8} {result['page'][:28]:<28} {result['run']:<5}"
+        f" total {result['total_ms']:9.1f}  fetch {result['fetch_ms']:8.1f}  parse {result['parse_ms']:8.1f}"
+        f"  transform {result['transform_ms']:8.1f}  render {result['render_ms']:8.1f}  {status}"
+    )
+
+
+def compare(report, baseline_path):
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+    before = {
+        (result["rows"], result["app"], result["page"], result["run"]): result
+        for result in baseline["results"]
+    }
+    print(f"\nChange vs {baseline['meta']['commit']} (total ms)")
+    for result in report["results"]:
+        old = before.get((result["rows"], result["app"], result["page"], result["run"]))
+        if old is None or not old["total_ms"]:
+            continue
+        change = (result["total_ms"] - old["total_ms"]) / old["total_ms"] * 100
+        print(
+            f"{result['rows']:>9,} {result['app']:<8} {result['page'][:28]:<28} {result['run']:<5}"
+            f" {old['total_ms']:9.1f} -> {result['total_ms']:9.1f}  ({change:+6.1f}%)"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=DEFAULT_ROWS, help="history rows per endpoint")
+    parser.add_argument("--apps", nargs="+", default=APPS)
+    parser.add_argument("--pages", nargs="+", help="only pages whose name contains one of these")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3, help="warm runs per page (the median is reported)")
+    parser.add_argument("--output", help="report path (default: benchmarks/results/<commit>.json)")
+    parser.add_argument("--compare", help="earlier report to compare against")
+    args = parser.parse_args()
+
+    report = {
+        "meta": {
+            "commit": git_commit(),
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "rows": args.rows,
+            "seed": args.seed,
+            "repeat": args.repeat,
+            "python": platform.python_version(),
+            "pandas": pd.__version__,
+            "streamlit": streamlit.__version__,
+            "machine": platform.machine(),
+        },
+        "results": [],
+    }
+    timer = PhaseTimer()
+    with timer.installed():
+        for rows in args.rows:
+            server = mock_backend.serve(mock_backend.create_app(rows, args.seed))
+            os.environ["DASHBOARD_API_SERVER"] = f"http://127.0.0.1:{server.server_port}"
+            unload_pages()
+            try:
+                for app in args.apps:
+                    for page in pages(app):
+                        if args.pages and not any(name in page for name in args.pages):
+                            continue
+                        for result in run_page(app, page, timer, args.repeat):
+                            result["rows"] = rows
+                            report["results"].append(result)
+                            print_result(result, rows)
+            finally:
+                server.shutdown()
+
+    output = args.output or os.path.join(RESULTS_DIR, f"{report['meta']['commit']}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nReport written to {output}")
+    if args.compare:
+        compare(report, args.compare)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,533 @@
+"""Direct ingestion from the Binance USDⓈ-M futures REST API.
+
+Optional alternative to the Flask backend for the endpoints that are plain
+views of the exchange: account summary, positions, open orders, and the
+trade and order histories. Every number otherwise makes an extra hop
+through the server; here the dashboard process signs its own requests and
+maps the responses onto the same columns the backend serves, so pages build
+the same DataFrames either way.
+
+All calls on one API key share a TokenBucket sized to Binance's request
+weight limit. Each response reports the weight the key has used in the
+current minute (X-MBX-USED-WEIGHT-1M); the bucket is aligned to it, so
+other clients on the same key count too, and a 429's Retry-After pauses
+every caller rather than just the one that hit it.
+
+Histories are paged per symbol with ``fromId`` (trades) or ``orderId``
+(orders), PAGE_LIMIT records per request, starting after the newest record
+already stored, and persisted through history_cache. Orders still open at
+the last sync are requested again, since their status changes in place.
+
+Configured from the environment: BINANCE_API_KEY, BINANCE_API_SECRET,
+BINANCE_SYMBOLS (comma-separated; default: symbols with an open position
+plus those already stored) and BINANCE_FAPI_URL (e.g. mock_binance).
+"""
+import hashlib
+import hmac
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from urllib.parse import urlencode, urlparse
+
+import pandas as pd
+import requests
+
+import data_client
+import history_cache
+import jsonio
+import perf
+import schemas
+
+FAPI_URL = "https://fapi.binance.com"
+WEIGHT_LIMIT = 2400  # request weight per WEIGHT_WINDOW for one IP / key
+WEIGHT_WINDOW = 60  # seconds
+WEIGHT_HEADROOM = 0.9  # share of the limit this process spends
+WEIGHT_HEADER = "X-MBX-USED-WEIGHT-1M"
+RATE_LIMIT_STATUSES = {429, 418}  # 418: banned for ignoring 429s
+MAX_RETRIES = 3  # per request, after a 429
+PAGE_LIMIT = 1000  # records per userTrades / allOrders page
+RECV_WINDOW = 5000  # ms a signed request stays valid
+SYMBOL_WORKERS = 4
+PERSIST_HISTORY = True
+
+# Dashboard endpoint -> (path, request weight)
+ROUTES = {
+    "account_summary": ("/fapi/v2/account", 5),
+    "positions": ("/fapi/v2/positionRisk", 5),
+    "open_orders": ("/fapi/v1/openOrders", 40),  # all symbols at once
+    "trade_history": ("/fapi/v1/userTrades", 5),
+    "order_history": ("/fapi/v1/allOrders", 5),
+}
+# History endpoint -> (paging parameter, id field, cursor time column)
+HISTORY_PAGING = {
+    "trade_history": ("fromId", "Trade ID", "Time"),
+    "order_history": ("orderId", "Order ID", "Order Time"),
+}
+OPEN_STATUSES = {"NEW", "PARTIALLY_FILLED"}
+
+
+class TokenBucket:
+    """Request-weight budget shared by every call on one API key.
+
+    Tokens refill continuously at ``per_second`` up to ``capacity``, so
+    requests are spread out rather than burst. Binance counts weight in
+    fixed, clock-aligned windows of ``window`` seconds, so the bucket also
+    keeps the current window's total, its own spending raised to what the
+    server reports through observe(), and never lets it pass ``capacity``.
+    hold() stops every call for a while, as a Retry-After asks.
+    """
+
+    def __init__(self, capacity, per_second, window=WEIGHT_WINDOW):
+        self.capacity = capacity
+        self.per_second = per_second
+        self.window = window
+        self.tokens = capacity
+        self.waited = 0.0  # seconds callers spent blocked, for monitoring
+        self._updated = time.monotonic()
+        self._held_until = 0.0
+        self._window_index = None
+        self._window_used = 0
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.per_second)
+        self._updated = now
+
+    def _roll(self, wall_time):
+        index = int(wall_time // self.window)
+        if index != self._window_index:
+            self._window_index, self._window_used = index, 0
+
+    def acquire(self, weight):
+        """Take ``weight`` tokens, sleeping until they are there; returns seconds waited."""
+        weight = min(weight, self.capacity)
+        waited = 0.0
+        while True:
+            with self._lock:
+                now, wall_time = time.monotonic(), time.time()
+                self._refill(now)
+                self._roll(wall_time)
+                delay = self._held_until - now
+                if delay <= 0:
+                    if self._window_used + weight > self.capacity:
+                        delay = (self._window_index + 1) * self.window - wall_time
+                    elif self.tokens < weight:
+                        delay = (weight - self.tokens) / self.per_second
+                    else:
+                        self.tokens -= weight
+                        self._window_used += weight
+                        self.waited += waited
+                        return waited
+            time.sleep(delay)
+            waited += delay
+
+    def observe(self, used):
+        """Account for the ``used`` weight the server reports for this window."""
+        with self._lock:
+            self._roll(time.time())
+            # Includes other clients on the key, and requests still in flight
+            self._window_used = max(self._window_used, used)
+
+    def hold(self, seconds):
+        """Block every acquire for ``seconds``, as a Retry-After asks."""
+        with self._lock:
+            self._held_until = max(self._held_until, time.monotonic() + seconds)
+
+
+def weight_bucket():
+    """TokenBucket for one key at WEIGHT_HEADROOM of the weight limit."""
+    capacity = WEIGHT_LIMIT * WEIGHT_HEADROOM
+    return TokenBucket(capacity, capacity / WEIGHT_WINDOW, WEIGHT_WINDOW)
+
+
+class BinanceFutures:
+    """Signed GETs against the futures API, paced by a TokenBucket.
+
+    Failures raise requests.exceptions.RequestException like data_client's
+    calls, through the same per-host circuit breaker.
+    """
+
+    def __init__(self, api_key, api_secret, base_url=FAPI_URL, bucket=None, timeout=data_client.DEFAULT_TIMEOUT):
+        self.api_key = api_key
+        self.api_secret = api_secret.encode()
+        self.base_url = base_url.rstrip("/")
+        self.bucket = bucket or weight_bucket()
+        self.timeout = timeout
+        self.requests = 0
+        self.rate_limited = 0  # 429/418 answers received
+        self.used_weight = None  # server's count after the last response
+
+    def _query(self, params):
+        # Same parameter order as Binance's signing examples
+        query = urlencode({**params, "recvWindow": RECV_WINDOW, "timestamp": int(time.time() * 1000)})
+        signature = hmac.new(self.api_secret, query.encode(), hashlib.sha256).hexdigest()
+        return f"{query}&signature={signature}"
+
+    def get(self, path, weight, params=None):
+        """Decoded JSON of a signed GET, waiting out rate limits."""
+        circuit = data_client.breaker(self.base_url)
+        for attempt in range(MAX_RETRIES + 1):
+            self.bucket.acquire(weight)
+            circuit.before_call()
+            try:
+                with perf.span(perf.NETWORK, f"binance {path}") as span:
+                    response = data_client.get_session().get(
+                        f"{self.base_url}{path}?{self._query(params or {})}",
+                        headers={"X-MBX-APIKEY": self.api_key},
+                        timeout=self.timeout,
+                    )
+                    span.bytes = len(response.content)
+                self.requests += 1
+                self._observe(response)
+                if response.status_code in RATE_LIMIT_STATUSES:
+                    self.rate_limited += 1
+                    self.bucket.hold(float(response.headers.get("Retry-After", WEIGHT_WINDOW)))
+                    if response.status_code == 429 and attempt < MAX_RETRIES:
+                        circuit.record()
+                        continue
+                response.raise_for_status()
+            except requests.exceptions.RequestException as e:
+                circuit.record(e)
+                raise
+            else:
+                circuit.record()
+            finally:
+                circuit.release()
+            try:
+                return jsonio.loads(response.content)
+            except ValueError as e:
+                raise requests.exceptions.InvalidJSONError(f"Invalid JSON from {path}: {e}", response=response) from e
+
+    def _observe(self, response):
+        used = response.headers.get(WEIGHT_HEADER)
+        if used is not None and used.isdigit():
+            self.used_weight = int(used)
+            self.bucket.observe(self.used_weight)
+
+    def fetch(self, endpoint, params=None):
+        path, weight = ROUTES[endpoint]
+        return self.get(path, weight, params)
+
+
+def _float(value):
+    return float(value) if value not in (None, "") else None
+
+
+def trade_record(trade):
+    return {
+        "Symbol": trade["symbol"],
+        "Side": trade["side"],
+        "Trade ID": trade["id"],
+        "Order ID": trade["orderId"],
+        "Price": _float(trade["price"]),
+        "Quantity": _float(trade["qty"]),
+        "PNL": _float(trade["realizedPnl"]),
+        "Commission": _float(trade["commission"]),
+        "Time": trade["time"],
+    }
+
+
+def order_record(order):
+    return {
+        "Order ID": order["orderId"],
+        "Symbol": order["symbol"],
+        "Side": order["side"],
+        "Type": order["type"],
+        "Status": order["status"],
+        "Price": _float(order["price"]),
+        "Quantity": _float(order["origQty"]),
+        "Executed Qty": _float(order["executedQty"]),
+        "Order Time": order["time"],
+    }
+
+
+def position_record(position):
+    size = _float(position["positionAmt"])
+    mark_price = _float(position["markPrice"])
+    pnl = _float(position["unRealizedProfit"])
+    return {
+        "Symbol": position["symbol"],
+        "Side": "LONG" if size > 0 else "SHORT",
+        "Size": size,
+        "Amount": round(abs(size) * mark_price, 2),
+        "Entry Price": _float(position["entryPrice"]),
+        "Mark Price": mark_price,
+        "PNL": pnl,
+        "Current PNL": pnl,
+        "Leverage": _float(position["leverage"]),
+        # Binance has no entry time; this is the position's last change
+        "Entry Time": position["updateTime"],
+    }
+
+
+def account_summary(account):
+    return {
+        "Balance": _float(account["totalWalletBalance"]),
+        "Unrealized PNL": _float(account["totalUnrealizedProfit"]),
+        "Margin Balance": _float(account["totalMarginBalance"]),
+        "Available Balance": _float(account["availableBalance"]),
+    }
+
+
+RECORDS = {"trade_history": trade_record, "order_history": order_record, "open_orders": order_record}
+
+
+class HistoryStore:
+    """Local copy of one history endpoint, extended page by page per symbol.
+
+    ``columns`` are the columns kept in ``frame``, None for every column, as
+    for delta_sync stores; those paging needs are always kept.
+    """
+
+    def __init__(self, client, endpoint, cache_name, columns=None):
+        self.client = client
+        self.endpoint = endpoint
+        self.cache_name = cache_name
+        self.param, self.id_field, self.time_field = HISTORY_PAGING[endpoint]
+        self.columns = None if columns is None else list(columns)
+        self.frame = pd.DataFrame()
+        self.issues = []
+        self.rows_fetched = 0
+        self.synced_at = None
+        self.generation = 0  # bumped whenever stored rows are replaced rather than appended
+        self._loaded_from_disk = not PERSIST_HISTORY
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=SYMBOL_WORKERS, thread_name_prefix=f"binance-{endpoint}")
+
+    def reset(self):
+        """Drop local state so the next sync downloads every symbol's full history."""
+        with self._lock:
+            self.frame = pd.DataFrame()
+            self.generation += 1
+            # Skip the disk copy too; the next download replaces it
+            self._loaded_from_disk = True
+
+    def require(self, columns):
+        """Keep ``columns`` too (None: every column); True if that widened the store.
+
+        Widening drops the rows in memory, which the next sync reloads from
+        disk, or downloads again.
+        """
+        with self._lock:
+            columns = history_cache.wider_columns(self.columns, columns)
+            if columns == self.columns:
+                return False
+            self.columns = columns
+            self.frame = pd.DataFrame()
+            self.generation += 1
+            self._loaded_from_disk = not PERSIST_HISTORY
+            return True
+
+    def _kept_columns(self):
+        if self.columns is None:
+            return None
+        return list(dict.fromkeys([self.id_field, self.time_field, "Symbol", "Status", *self.columns]))
+
+    def _project(self, frame):
+        columns = self._kept_columns()
+        if columns is None:
+            return frame
+        return frame[[name for name in columns if name in frame.columns]]
+
+    def symbols(self):
+        """Symbols already stored."""
+        if self.frame.empty:
+            return []
+        return [str(symbol) for symbol in self.frame["Symbol"].unique()]
+
+    def sync(self, symbols):
+        """Fetch what is new for each symbol and return the full frame.
+
+        Raises requests.exceptions.RequestException if any page fails; the
+        store is then left as it was.
+        """
+        with self._lock:
+            if not self._loaded_from_disk:
+                self._load_from_disk()
+            starts = self._starts()
+            futures = [
+                self._executor.submit(self._pages, symbol, starts.get(symbol, 0))
+                for symbol in dict.fromkeys(symbols)
+            ]
+            records = [record for future in futures for record in future.result()]
+            self.rows_fetched = len(records)
+            if records:
+                full_frame, self.issues = schemas.build_frame(self.endpoint, records)
+                self._merge(self._project(full_frame), full_frame)
+            self.synced_at = time.time()
+            return self.frame
+
+    def _pages(self, symbol, start):
+        """Records of one symbol from id ``start`` on, PAGE_LIMIT per request."""
+        records = []
+        while True:
+            page = self.client.fetch(self.endpoint, {"symbol": symbol, self.param: start, "limit": PAGE_LIMIT})
+            records.extend(RECORDS[self.endpoint](item) for item in page)
+            if len(page) < PAGE_LIMIT:
+                return records
+            start = records[-1][self.id_field] + 1
+
+    def _starts(self):
+        """Symbol -> first id to request: past the newest stored, or the
+        oldest order that was still open."""
+        if self.frame.empty:
+            return {}
+        ids = self.frame[self.id_field]
+        starts = (ids.groupby(self.frame["Symbol"], observed=True).max() + 1).to_dict()
+        if "Status" in self.frame.columns:
+            open_orders = self.frame["Status"].isin(OPEN_STATUSES)
+            oldest_open = ids[open_orders].groupby(self.frame["Symbol"][open_orders], observed=True).min()
+            starts.update(oldest_open.to_dict())
+        return {str(symbol): int(start) for symbol, start in starts.items()}
+
+    def _merge(self, frame, full_frame):
+        """Merge fetched rows, kept columns in frame and all of them in full_frame."""
+        if self.frame.empty:
+            self.frame = frame.sort_values(self.time_field, ignore_index=True)
+            self._persist(history_cache.replace, full_frame)
+            return
+        # Judged on the kept columns; Status, which open orders change, is one
+        changed = self._changed(frame)
+        frame = frame[changed]
+        full_frame = full_frame[changed]
+        if frame.empty:
+            # Only open orders came back, as they were: keep the frame object,
+            # so memoized pages and search indexes stay valid
+            return
+        replaced = self.frame[self.id_field].isin(frame[self.id_field]).to_numpy()
+        kept = self.frame[~replaced]
+        # Concatenated categoricals with different categories come back as
+        # objects; re-apply the schema
+        self.frame, _ = schemas.coerce_frame(
+            self.endpoint, pd.concat([kept, frame], ignore_index=True).sort_values(self.time_field, ignore_index=True)
+        )
+        if replaced.any():
+            self.generation += 1
+            self._persist(partial(history_cache.upsert, key_field=self.id_field), full_frame)
+        else:
+            self._persist(history_cache.append, full_frame)
+
+    def _changed(self, frame):
+        """Mask of frame's rows that are new, or differ from the stored row with their id."""
+        columns = [name for name in frame.columns if name in self.frame.columns]
+        stored = self.frame[self.frame[self.id_field].isin(frame[self.id_field]).to_numpy()]
+        # Row hashes go by value, so categories that differ between the
+        # frames do not matter
+        stored_hashes = pd.util.hash_pandas_object(stored[columns], index=False).to_numpy()
+        hashes = pd.util.hash_pandas_object(frame[columns], index=False).to_numpy()
+        position = pd.Index(stored[self.id_field]).get_indexer(frame[self.id_field])
+        changed = position < 0
+        changed[~changed] = stored_hashes[position[~changed]] != hashes[~changed]
+        return changed
+
+    def _load_from_disk(self):
+        self._loaded_from_disk = True
+        if history_cache.truncated(self.cache_name):
+            # Ids past the stored ones would skip the evicted months
+            return
+        # Writes still queued, e.g. before require() widened the columns
+        history_cache.flush()
+        try:
+            frame = history_cache.read_history(self.cache_name, self._kept_columns())
+        except OSError:
+            return
+        if frame is not None and not frame.empty and self.id_field in frame.columns:
+            self.frame, _ = schemas.coerce_frame(self.endpoint, frame)
+
+    def _persist(self, write, frame):
+        # In the background, like delta_sync stores: the sync lock is held
+        if PERSIST_HISTORY:
+            history_cache.submit(write, self.cache_name, frame, self.time_field)
+
+
+class BinanceIngestor:
+    """Dashboard payloads and history frames for one account, from Binance directly.
+
+    payload() answers like data_client.get_json does for the same endpoint;
+    history() returns the shared, read-only history frame, like a
+    delta_sync store. Both are refreshed at most once per the endpoint's
+    data_client TTL, however many sessions ask.
+    """
+
+    def __init__(self, client, symbols=None):
+        self.client = client
+        self.configured_symbols = list(symbols or [])
+        self._cache = data_client.TTLCache()
+        self._locks = {endpoint: threading.Lock() for endpoint in ROUTES}
+        host = urlparse(client.base_url).netloc.replace(":", "_")
+        key_id = hashlib.sha256(client.api_key.encode()).hexdigest()[:8]
+        # Disk cache namespace: one per host and key, never the key itself
+        self.namespace = f"binance_{host}_{key_id}"
+        # Stores start with the columns paging needs; history() widens them
+        # to what callers read
+        self.stores = {
+            endpoint: HistoryStore(client, endpoint, f"{self.namespace}__{endpoint}", columns=())
+            for endpoint in HISTORY_PAGING
+        }
+
+    def serves(self, endpoint):
+        return endpoint in ROUTES
+
+    def payload(self, endpoint):
+        """Records, or a dict for account_summary, in the backend's columns."""
+        if endpoint in self.stores:
+            return self.history(endpoint).to_dict("records")
+        return self._fresh(endpoint, self._download)
+
+    def history(self, endpoint, columns=None):
+        """Full history frame of trade_history or order_history.
+
+        ``columns`` are those the caller reads, None for every column; the
+        store keeps what all of its callers asked for.
+        """
+        if self.stores[endpoint].require(columns):
+            # The frame cached for the narrower selection lacks them
+            self._cache.discard(endpoint)
+        return self._fresh(endpoint, lambda endpoint: self.stores[endpoint].sync(self.symbols()))
+
+    def reset(self):
+        """Forget every history and cached payload."""
+        for store in self.stores.values():
+            store.reset()
+        self._cache.clear()
+
+    def symbols(self):
+        """Symbols whose histories are synced."""
+        if self.configured_symbols:
+            return self.configured_symbols
+        held = [record["Symbol"] for record in self.payload("positions")]
+        stored = [symbol for store in self.stores.values() for symbol in store.symbols()]
+        return list(dict.fromkeys(held + stored))
+
+    def _fresh(self, endpoint, load):
+        hit, data = self._cache.get(endpoint)
+        if hit:
+            return data
+        with self._locks[endpoint]:
+            # Another session may have loaded it while this one waited
+            hit, data = self._cache.get(endpoint)
+            if not hit:
+                data = load(endpoint)
+                self._cache.set(endpoint, data, data_client.endpoint_ttl(endpoint))
+        return data
+
+    def _download(self, endpoint):
+        data = self.client.fetch(endpoint)
+        if endpoint == "account_summary":
+            return account_summary(data)
+        if endpoint == "positions":
+            return [position_record(item) for item in data if _float(item["positionAmt"])]
+        return [RECORDS[endpoint](item) for item in data]
+
+
+def from_env(environ=os.environ):
+    """BinanceIngestor configured from the environment, None without a key."""
+    api_key = environ.get("BINANCE_API_KEY")
+    api_secret = environ.get("BINANCE_API_SECRET")
+    if not api_key or not api_secret:
+        return None
+    symbols = [symbol.strip().upper() for symbol in environ.get("BINANCE_SYMBOLS", "").split(",") if symbol.strip()]
+    client = BinanceFutures(api_key, api_secret, environ.get("BINANCE_FAPI_URL", FAPI_URL))
+    return BinanceIngestor(client, symbols)
@@ -0,0 +1,122 @@
+"""Plotly figure builders that stay responsive on long histories."""
+import numpy as np
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objs as go
+import streamlit as st
+
+import downsample
+import formatting
+import perf
+
+# Markers only help while individual points are distinguishable
+MARKERS_MAX_POINTS = 300
+# SVG scatter plots crawl beyond a few thousand points; WebGL does not
+WEBGL_MIN_POINTS = 2000
+HISTOGRAM_BINS = 60
+
+
+def _zoom_window(data, x, key):
+    """Slice data to the x range picked on a range slider.
+
+    The window is cut from the full-resolution data, so zooming in brings
+    back every point of the selected range before downsampling again.
+    """
+    values = data[x]
+    is_datetime = pd.api.types.is_datetime64_any_dtype(values)
+    if is_datetime:
+        tz = values.dt.tz
+        # st.slider only handles naive datetimes; slide in the column's local time
+        values = values.dt.tz_localize(None) if tz is not None else values
+        lo, hi = values.iloc[0].to_pydatetime(), values.iloc[-1].to_pydatetime()
+    elif pd.api.types.is_numeric_dtype(values):
+        lo, hi = float(values.iloc[0]), float(values.iloc[-1])
+    else:
+        return data
+    if lo == hi:
+        return data
+
+    zoom_key = f"{key}_zoom"
+    current = st.session_state.get(zoom_key)
+    if current is not None and not (lo <= current[0] <= current[1] <= hi):
+        # The data moved since the range was picked
+        del st.session_state[zoom_key]
+    start, end = st.slider("Zoom range", min_value=lo, max_value=hi, value=(lo, hi), key=zoom_key)
+    if is_datetime:
+        start, end = pd.Timestamp(start), pd.Timestamp(end)
+    return data[(values >= start) & (values <= end)]
+
+
+def downsampled_line(df, x, y, title, key, width_px=downsample.DEFAULT_CHART_WIDTH_PX, method="lttb", **line_kwargs):
+    """px.line over at most the points a chart of width_px can show.
+
+    Long series are LTTB-downsampled (or min/max decimated) and get a zoom
+    slider that re-slices the full-resolution data. Returns the figure.
+    """
+    with perf.span(perf.CHART, title) as span:
+        data = df[[x, y]].dropna().sort_values(by=x, kind="stable")
+        span.rows = len(data)
+        target = downsample.target_points(width_px)
+        if len(data) > target:
+            data = _zoom_window(data, x, key)
+            x_values = data[x]
+            if isinstance(x_values.dtype, pd.DatetimeTZDtype):
+                x_values = x_values.dt.tz_convert(None)
+            with perf.span(perf.TRANSFORM, f"{title} {method}"):
+                data = data.iloc[downsample.downsample(x_values.to_numpy(), data[y].to_numpy(), target, method)]
+        line_kwargs["markers"] = line_kwargs.get("markers", False) and len(data) <= MARKERS_MAX_POINTS
+        return px.line(data, x=x, y=y, title=title, **line_kwargs)
+
+
+def scatter(df, x, y, size=None, webgl_min_points=WEBGL_MIN_POINTS, **scatter_kwargs):
+    """px.scatter that renders through WebGL (go.Scattergl) on large frames.
+
+    Plotly rejects negative marker sizes, so ``size`` is drawn from the
+    magnitude of the column while its signed value stays in the hover.
+    """
+    with perf.span(perf.CHART, scatter_kwargs.get("title", "scatter")) as span:
+        span.rows = len(df)
+        return _scatter(df, x, y, size, webgl_min_points, **scatter_kwargs)
+
+
+def _scatter(df, x, y, size, webgl_min_points, **scatter_kwargs):
+    data = df
+    if size is not None:
+        size_column = f"|{size}|"
+        data = df.assign(**{size_column: pd.to_numeric(df[size], errors="coerce").abs().fillna(0)})
+        hover_data = list(scatter_kwargs.pop("hover_data", None) or [])
+        scatter_kwargs["hover_data"] = hover_data + [size] if size not in hover_data else hover_data
+        size = size_column
+    if len(df) < webgl_min_points:
+        return px.scatter(data, x=x, y=y, size=size, render_mode="svg", **scatter_kwargs)
+    # float32 halves the figure payload and is plenty for screen positions.
+    # Datetime hover values are pre-formatted: as Timestamp objects Plotly
+    # deep-copies every one of them while building the traces.
+    data = data.assign(**{
+        name: pd.to_numeric(data[name], errors="coerce").astype(np.float32)
+        for name in (x, y, size) if name is not None
+    })
+    data = data.assign(**{
+        name: formatting.datetime_text(data[name]).to_numpy(zero_copy_only=False)
+        for name in scatter_kwargs.get("hover_data") or []
+        if pd.api.types.is_datetime64_any_dtype(data[name])
+    })
+    return px.scatter(data, x=x, y=y, size=size, render_mode="webgl", **scatter_kwargs)
+
+
+def binned_histogram(values, title, x_label, bins=HISTOGRAM_BINS, color=None):
+    """Histogram binned with np.histogram; only bar heights reach the browser."""
+    with perf.span(perf.CHART, title) as span:
+        values = pd.to_numeric(values, errors="coerce").dropna().to_numpy(dtype=np.float64)
+        span.rows = len(values)
+        counts, edges = np.histogram(values, bins=bins)
+        fig = go.Figure(go.Bar(
+            x=(edges[:-1] + edges[1:]) / 2,
+            y=counts,
+            width=np.diff(edges),
+            marker_color=color,
+            customdata=np.column_stack([edges[:-1], edges[1:]]),
+            hovertemplate="%{customdata[0]:.2f} to %{customdata[1]:.2f}<br>count=%{y}<extra></extra>",
+        ))
+        fig.update_layout(title=title, xaxis_title=x_label, yaxis_title="count", bargap=0)
+        return fig
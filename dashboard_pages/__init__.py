@@ -0,0 +1,19 @@
+"""Pages of the main dashboard (app.py), rendered through page_registry.
+
+Each page module imports only what it draws with: Account Summary needs
+neither pandas nor plotly, and chart pages load them the first time one is
+opened. Shared helpers live in common (light) and frames (DataFrames and
+tables); those shared with the pro dashboard live in page_common.
+"""
+from page_registry import Page
+
+PAGES = [
+    Page("Account Summary", "dashboard_pages.account", "account_summary"),
+    Page("Positions", "dashboard_pages.positions", "positions"),
+    Page("Open Orders", "dashboard_pages.positions", "open_orders"),
+    Page("Trade History", "dashboard_pages.history", "trade_history"),
+    Page("Position History", "dashboard_pages.history", "position_history"),
+    Page("Analytics", "dashboard_pages.analytics", "analytics"),
+    # Page("Traders with Open Positions", "dashboard_pages.positions", "traders_with_open_positions"),
+    Page("Closed Positions Analysis", "dashboard_pages.closed_positions", "closed_positions_cost_analysis"),    # New Page
+]
@@ -0,0 +1,54 @@
+"""Account Summary: four metrics, so this page loads neither pandas nor plotly.
+
+In multi-account mode the metrics are firm-wide totals, followed by a table
+with one row per account.
+"""
+import streamlit as st
+
+import accounts
+import formatting
+import perf
+from dashboard_pages.common import MULTI_ACCOUNT, fetch_accounts, live_section
+
+
+@perf.timed_section
+def account_summary():
+    """Comprehensive Account Summary"""
+    st.subheader("Account Summary")
+    if MULTI_ACCOUNT:
+        # Polled from every account; the push feed follows API_SERVER only
+        render_accounts_summary(fetch_accounts(["account_summary"])["account_summary"])
+        return
+    live_section("account_summary", render_account_summary)
+
+
+def render_account_summary(account_summary):
+    """Account Summary metrics"""
+    if account_summary:
+        col1, col2, col3, col4 = st.columns(4)
+        
+        with col1:
+            st.metric(label="Total Balance", value=account_summary['Balance'], format=formatting.CURRENCY_FORMAT)
+        
+        with col2:
+            st.metric(label="Unrealized PNL", value=account_summary['Unrealized PNL'], format=formatting.PNL_FORMAT)
+        
+        with col3:
+            st.metric(label="Margin Balance", value=account_summary['Margin Balance'], format=formatting.CURRENCY_FORMAT)
+        
+        with col4:
+            st.metric(label="Available Balance", value=account_summary['Available Balance'], format=formatting.CURRENCY_FORMAT)
+
+
+def render_accounts_summary(summaries):
+    """Totals over the selected accounts, then one row per account"""
+    if not summaries:
+        st.warning("No account summary available.")
+        return
+    render_account_summary(accounts.sum_fields(summaries.values()))
+    if len(summaries) > 1:
+        st.dataframe(
+            [{accounts.ACCOUNT_COLUMN: account, **summary} for account, summary in summaries.items()],
+            hide_index=True,
+            use_container_width=True,
+        )
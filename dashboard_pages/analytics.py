@@ -0,0 +1,262 @@
+"""Analytics: daily and cumulative PNL, holdings and running trade statistics."""
+import streamlit as st
+import pandas as pd
+import plotly.express as px
+
+import aggregates
+import charts
+import formatting
+import perf
+from accounts import ACCOUNT_COLUMN
+from dashboard_pages.common import (
+    API_SERVER, MULTI_ACCOUNT, direct_ingestor, fetch_accounts, fetch_data_many, selected_accounts,
+)
+from dashboard_pages.frames import account_frame, account_histories, history_generation, history_source
+from page_common import memoized, to_frame
+
+STAT_COLUMN_CONFIG = {
+    "count": st.column_config.NumberColumn("Trades", format=formatting.COUNT_FORMAT),
+    "sum": st.column_config.NumberColumn("Total PNL", format=formatting.PNL_FORMAT),
+    "wins": st.column_config.NumberColumn("Wins", format=formatting.COUNT_FORMAT),
+    "min": st.column_config.NumberColumn("Worst", format=formatting.PNL_FORMAT),
+    "max": st.column_config.NumberColumn("Best", format=formatting.PNL_FORMAT),
+    "win_rate": st.column_config.NumberColumn("Win Rate", format=formatting.PERCENT_FORMAT),
+}
+
+
+@perf.timed_section
+def analytics():
+    """Trading Analytics"""
+    st.subheader("Trading Analytics")
+    if MULTI_ACCOUNT:
+        account_analytics()
+        return
+
+    # Both sections fetch concurrently and each renders as soon as its data lands
+    sections = {
+        "pnl_analytics": (st.container(), render_pnl_analytics),
+        "positions": (st.container(), render_holdings),
+    }
+    received = {}
+    for endpoint, data in fetch_data_many(sections):
+        container, render = sections[endpoint]
+        received[endpoint] = data
+        with container:
+            render(data)
+
+    if not any(received.values()):
+        st.error("Failed to fetch analytics data. Please check the backend.")
+
+    render_trade_statistics()
+
+
+def render_trade_statistics():
+    """Win rate and PNL statistics, kept as running totals of the trade history"""
+    columns = aggregates.source_columns("trade_history")
+    source = history_source("trade_history", columns)
+    if source is None:
+        return
+    ingestor = direct_ingestor("trade_history")
+    stats = aggregates.get_aggregates(API_SERVER, "trade_history", ingestor.namespace if ingestor else None)
+    # Only trades newer than the last fold are added, and only when the history changed
+    generation = history_generation("trade_history", columns=columns)
+    memoized("trade_aggregates", source, lambda frame: stats.fold(frame, generation))
+    render_statistics(stats.overall(), stats.by_symbol())
+
+
+def render_statistics(overall, by_symbol):
+    """Trade statistics metrics and the per-symbol table"""
+    if not overall["count"]:
+        return
+    st.markdown("### Trade Statistics")
+    col1, col2, col3, col4, col5 = st.columns(5)
+    col1.metric("Trades", overall['count'], format=formatting.COUNT_FORMAT)
+    col2.metric("Win Rate", overall['win_rate'], format=formatting.PERCENT_FORMAT)
+    col3.metric("Total PNL", overall['sum'], format=formatting.PNL_FORMAT)
+    col4.metric("Best Trade", overall['max'], format=formatting.PNL_FORMAT)
+    col5.metric("Worst Trade", overall['min'], format=formatting.PNL_FORMAT)
+    st.dataframe(by_symbol.sort_values("sum", ascending=False), column_config=STAT_COLUMN_CONFIG)
+
+
+def account_analytics():
+    """Analytics over the selected accounts: firm-wide charts with per-account breakdowns"""
+    payloads = fetch_accounts(["pnl_analytics", "positions"])
+    if not any(payloads.values()):
+        st.error("Failed to fetch analytics data. Please check the backend.")
+
+    pnl = payloads["pnl_analytics"]
+    if pnl:
+        # Memo names carry the selection; sources are the payloads themselves
+        names = "|".join(pnl)
+        firm_df, account_df = memoized(f"account_pnl_{names}", tuple(pnl.values()), lambda _: prepare_account_pnl(pnl))
+        if not firm_df.empty:
+            st.plotly_chart(memoized(f"account_daily_pnl_fig_{names}", firm_df, daily_pnl_figure), use_container_width=True)
+            cumulative_pnl_chart(firm_df)
+            if account_df[ACCOUNT_COLUMN].nunique() > 1:
+                st.plotly_chart(
+                    memoized(f"account_cumulative_fig_{names}", account_df, account_cumulative_figure),
+                    use_container_width=True,
+                )
+
+    held = payloads["positions"]
+    if held:
+        pie_fig, profit_line_fig = memoized(
+            f"account_holdings_figs_{'|'.join(held)}", tuple(held.values()),
+            lambda _: holdings_frame_figures(account_frame("positions", held)),
+        )
+        if pie_fig is not None:
+            st.plotly_chart(pie_fig, use_container_width=True)
+            if profit_line_fig is not None:
+                st.plotly_chart(profit_line_fig, use_container_width=True)
+
+    render_account_trade_statistics()
+
+
+def prepare_account_pnl(payloads):
+    """(firm-wide daily PNL with its cumulative PNL, per-account rows with theirs)"""
+    account_df = account_frame("pnl_analytics", payloads)
+    if account_df.empty:
+        return account_df, account_df
+    account_df['Date'] = pd.to_datetime(account_df['Date'])
+    account_df.sort_values(by='Date', inplace=True)
+    account_df['Cumulative PNL'] = account_df.groupby(ACCOUNT_COLUMN, observed=True)['PNL'].cumsum()
+    firm_df = account_df.groupby('Date', as_index=False)['PNL'].sum()
+    firm_df['Cumulative PNL'] = firm_df['PNL'].cumsum()
+    return firm_df, account_df
+
+
+def account_cumulative_figure(account_df):
+    """Cumulative PNL line per account"""
+    with perf.span(perf.CHART, 'Cumulative PNL by Account'):
+        fig = px.line(
+            account_df,
+            x='Date',
+            y='Cumulative PNL',
+            color=ACCOUNT_COLUMN,
+            title='Cumulative Profit/Loss by Account',
+            labels={'Cumulative PNL': 'Cumulative Profit/Loss (USDT)'},
+        )
+    return fig
+
+
+def render_account_trade_statistics():
+    """Trade statistics combined over the selected accounts, then per account"""
+    columns = aggregates.source_columns("trade_history")
+    sources = account_histories("trade_history", columns)
+    if not sources:
+        return
+    selected = selected_accounts()
+    stats = {}
+    for account, source in sources.items():
+        stats[account] = aggregates.get_aggregates(selected[account], "trade_history")
+        generation = history_generation("trade_history", selected[account], columns)
+        memoized(f"trade_aggregates_{account}", source, lambda frame, stats=stats[account]: stats.fold(frame, generation))
+    render_statistics(*aggregates.combine(stats.values()))
+    if len(stats) > 1:
+        st.dataframe(
+            [{ACCOUNT_COLUMN: account, **source.overall()} for account, source in stats.items()],
+            column_config=STAT_COLUMN_CONFIG,
+            hide_index=True,
+        )
+
+
+def render_pnl_analytics(pnl_data):
+    """Daily and cumulative PNL charts"""
+    if pnl_data:
+        pnl_df = memoized("pnl_analytics", pnl_data, prepare_pnl_analytics)
+        if not pnl_df.empty:
+            daily_fig = memoized("daily_pnl_fig", pnl_df, daily_pnl_figure)
+            st.plotly_chart(daily_fig, use_container_width=True)
+            cumulative_pnl_chart(pnl_df)
+
+
+def prepare_pnl_analytics(pnl_data):
+    """PNL frame sorted by date, with its cumulative PNL"""
+    pnl_df = to_frame("pnl_analytics", pnl_data)
+    if not pnl_df.empty:
+        # Sort by Date, oldest first, so the running total accumulates forward in time
+        pnl_df['Date'] = pd.to_datetime(pnl_df['Date'])  # Ensure correct datetime format
+        pnl_df.sort_values(by='Date', inplace=True)
+        pnl_df['Cumulative PNL'] = pnl_df['PNL'].cumsum()
+    return pnl_df
+
+
+def daily_pnl_figure(pnl_df):
+    """Daily PNL bar chart"""
+    with perf.span(perf.CHART, 'Daily Profit/Loss (PNL)'):
+        daily_fig = px.bar(
+            pnl_df,
+            x='Date',
+            y='PNL',
+            title='Daily Profit/Loss (PNL)',
+            labels={'Date': 'Date', 'PNL': 'Profit/Loss (USDT)'},
+            color='PNL',
+            color_continuous_scale=px.colors.sequential.Viridis
+        )
+        daily_fig.update_layout(xaxis_title='Date', yaxis_title='Profit/Loss (USDT)', xaxis=dict(tickformat='%b %d'))
+    return daily_fig
+
+
+@st.fragment
+def cumulative_pnl_chart(pnl_df):
+    """Cumulative PNL line; its zoom slider re-runs only this chart"""
+    cumulative_fig = charts.downsampled_line(
+        pnl_df,
+        'Date',
+        'Cumulative PNL',
+        'Cumulative Profit/Loss Over Time',
+        key='Cumulative PNL',
+        labels={'Date': 'Date', 'Cumulative PNL': 'Cumulative Profit/Loss (USDT)'},
+        line_shape='linear',
+        markers=True
+    )
+    cumulative_fig.update_layout(xaxis_title='Date', yaxis_title='Cumulative Profit/Loss (USDT)', xaxis=dict(tickformat='%b %d'))
+    st.plotly_chart(cumulative_fig, use_container_width=True)
+
+
+def render_holdings(positions_data):
+    """Current holdings and symbol-wise profit charts"""
+    if positions_data:
+        pie_fig, profit_line_fig = memoized("holdings_figs", positions_data, holdings_figures)
+        if pie_fig is not None:
+            st.plotly_chart(pie_fig, use_container_width=True)
+            if profit_line_fig is not None:
+                st.plotly_chart(profit_line_fig, use_container_width=True)
+
+
+def holdings_figures(positions_data):
+    """(holdings pie, profit-by-symbol line), None where there is nothing to plot"""
+    return holdings_frame_figures(to_frame("positions", positions_data))
+
+
+def holdings_frame_figures(positions_df):
+    """holdings_figures of a positions frame; profit lines are split by account when it has one"""
+    if positions_df.empty:
+        return None, None
+    # Pie Chart: Current Holdings
+    with perf.span(perf.CHART, 'Current Holdings Distribution'):
+        pie_fig = px.pie(
+            positions_df,
+            names='Symbol',
+            values='Size',
+            title='Current Holdings Distribution',
+            color_discrete_sequence=px.colors.qualitative.Set3
+        )
+
+    # Line Chart: Symbol-Wise Profit
+    profit_line_fig = None
+    if 'PNL' in positions_df.columns and 'Symbol' in positions_df.columns:
+        positions_df['PNL'] = positions_df['PNL'].astype(float)
+        with perf.span(perf.CHART, 'Profit by Symbol'):
+            profit_line_fig = px.line(
+                positions_df,
+                x='Symbol',
+                y='PNL',
+                title='Profit by Symbol',
+                labels={'Symbol': 'Crypto Symbol', 'PNL': 'Profit/Loss (USDT)'},
+                markers=True,
+                line_shape='linear',
+                color=ACCOUNT_COLUMN if ACCOUNT_COLUMN in positions_df.columns else None
+            )
+            profit_line_fig.update_layout(xaxis_title='Crypto Symbol', yaxis_title='Profit/Loss (USDT)')
+    return pie_fig, profit_line_fig
@@ -0,0 +1,155 @@
+"""Closed positions, with their PNL distribution and entry vs exit prices."""
+import streamlit as st
+import pandas as pd
+import plotly.express as px
+
+import charts
+import formatting
+import lot_matching
+import perf
+import table_view
+from dashboard_pages.common import fetch_data
+from dashboard_pages.frames import history_source
+from page_common import memoized, to_frame
+
+TIME_COLUMNS = ['Entry Time', 'Exit Time']
+# Where closed positions come from: the backend's precomputed payload, or
+# trade_history fills matched locally
+SOURCES = {
+    "Backend": None,
+    "FIFO from trades": lot_matching.FIFO,
+    "Average cost from trades": lot_matching.AVERAGE,
+}
+
+
+def matched_positions(method):
+    """Closed positions matched from trade_history with local times; shared, read-only"""
+    def build(trades):
+        df = lot_matching.match(trades, method)
+        formatting.normalize_time_columns(df, TIME_COLUMNS)
+        return df
+
+    source = history_source("trade_history")
+    if source is None:
+        return None
+    return memoized(f"closed_positions_{method}", source, build)
+
+
+def column_config(time_columns):
+    """Datetime and signed PNL display formats of the closed positions table"""
+    return {
+        **formatting.datetime_column_config(time_columns),
+        **formatting.currency_column_config(['PNL'], signed=True),
+    }
+
+
+def load_closed_positions(key):
+    """Closed positions from the selected source, closed within the selected dates
+
+    Returns a frame the caller may modify, or None if the source failed.
+    """
+    label = st.radio(
+        "Source", list(SOURCES), horizontal=True, key=f"{key} source",
+        help="Rebuilding from trades re-runs over the full synced history; assumes one-way position mode",
+    )
+    method = SOURCES[label]
+    if method is None:
+        data = fetch_data("closed_positions")
+        if not data:
+            return None
+        df = to_frame("closed_positions", data)
+        formatting.normalize_time_columns(df, TIME_COLUMNS)
+    else:
+        df = matched_positions(method)
+        if df is None:
+            return None
+    if 'Exit Time' in df.columns and df['Exit Time'].notna().any():
+        exits = df['Exit Time']
+        first, last = exits.min().date(), exits.max().date()
+        selected = st.date_input(
+            "Closed between", (first, last), min_value=first, max_value=last, key=f"{key} dates",
+        )
+        if len(selected) == 2:
+            start = pd.Timestamp(selected[0], tz=formatting.INDIAN_TZ)
+            end = pd.Timestamp(selected[1], tz=formatting.INDIAN_TZ) + pd.Timedelta(days=1)
+            df = df[(exits >= start) & (exits < end)]
+    return df.copy()
+
+
+@perf.timed_section
+def closed_positions_cost_analysis():
+    """Display Closed Positions Cost Analysis"""
+    st.subheader("Closed Positions Analysis")
+    df = load_closed_positions("Closed Positions Analysis")
+
+    if df is not None:
+        if not df.empty:
+            # Sort by Exit Time, latest first
+            time_columns = [name for name in TIME_COLUMNS if name in df.columns]
+            df.sort_values(by='Exit Time', ascending=False, inplace=True)
+            
+            # Highlight Positions with Loss
+            df['Profit/Loss'] = df['PNL'].lt(0).map({True: "Loss", False: "Profit"}).astype("category")
+            table_view.paged_dataframe(
+                df, key="Closed Positions Analysis", column_config=column_config(time_columns), pnl_columns=['PNL'],
+            )
+
+            # Visualization: Loss vs Profit
+            with perf.span(perf.CHART, 'Profit vs Loss in Closed Positions'):
+                fig = px.pie(
+                    df,
+                    names='Profit/Loss',
+                    title='Profit vs Loss in Closed Positions',
+                    color_discrete_sequence=px.colors.qualitative.Safe
+                )
+            st.plotly_chart(fig, use_container_width=True)
+        else:
+            st.warning("No closed positions data found.")
+    else:
+        st.error("Failed to fetch closed positions data.")
+
+
+@perf.timed_section
+def closed_positions():
+    """Display Closed Positions"""
+    st.subheader("Closed Positions")
+    df = load_closed_positions("Closed Positions")
+
+    if df is not None:
+        if not df.empty:
+            # Sort by Exit Time, latest first
+            time_columns = [name for name in TIME_COLUMNS if name in df.columns]
+            df.sort_values(by='Exit Time', ascending=False, inplace=True)
+
+            # Display DataFrame; PNL stays numeric, signed and coloured on screen only
+            table_view.paged_dataframe(
+                df, key="Closed Positions", height=500, column_config=column_config(time_columns), pnl_columns=['PNL'],
+            )
+
+            # PNL Distribution Chart
+            if 'PNL' in df.columns:
+                fig = charts.binned_histogram(
+                    df['PNL'],
+                    title='Closed Positions PNL Distribution',
+                    x_label='Profit/Loss (USDT)',
+                    color='#EF553B'
+                )
+                st.plotly_chart(fig, use_container_width=True)
+
+            # Entry vs Exit Price Scatter Plot
+            if 'Entry Price' in df.columns and 'Exit Price' in df.columns:
+                scatter_fig = charts.scatter(
+                    df,
+                    x='Entry Price',
+                    y='Exit Price',
+                    color='Symbol',
+                    size='PNL',
+                    hover_data=['Entry Time', 'Exit Time'],
+                    title='Entry vs Exit Price by Symbol',
+                    labels={'Entry Price': 'Entry Price (USDT)', 'Exit Price': 'Exit Price (USDT)'}
+                )
+                st.plotly_chart(scatter_fig, use_container_width=True)
+        else:
+            st.warning("No closed positions available.")
+    else:
+        st.warning("Failed to fetch closed positions.")
@@ -0,0 +1,177 @@
+"""Configuration and light helpers shared by the main dashboard's pages.
+
+Nothing here imports pandas or plotly, so the metric-only pages start
+without the data stack; DataFrame and table helpers live in frames.
+"""
+import os
+
+import streamlit as st
+import requests
+
+import accounts
+import data_client
+import live_feed
+from page_common import get_poller, record_snapshot
+
+# Flask API Server URL
+API_SERVER = os.environ.get("DASHBOARD_API_SERVER", "http://34.47.211.154:5058")  # Replace with your AWS server IP, or set DASHBOARD_API_SERVER
+INCREMENTAL_SYNC = True  # Fetch only new history rows after the first full download
+LIVE_UPDATES = False  # Default for the sidebar toggle; needs the backend's push feed
+LIVE_FEED_URL = f"{API_SERVER}/{live_feed.STREAM_PATH}"
+LIVE_TOPICS = ["account_summary", "positions", "open_orders"]
+LIVE_REFRESH_SECONDS = 0.5  # How often live sections check for a pushed update
+SHARED_POLLING = True  # One process-wide poller fetches for every session
+# Multi-account mode: DASHBOARD_ACCOUNTS="main=http://host:5058,hedge=http://host:5059"
+# gives Account Summary, Positions and Analytics firm-wide and per-account
+# views; the other pages show API_SERVER
+ACCOUNTS = accounts.parse(os.environ.get("DASHBOARD_ACCOUNTS", "")) or {"main": API_SERVER}
+MULTI_ACCOUNT = len(ACCOUNTS) > 1
+ALL_ACCOUNTS = "All accounts"
+# Direct ingestion: with BINANCE_API_KEY and BINANCE_API_SECRET set, account
+# summary, positions, open orders and the trade and order histories of
+# API_SERVER's account come from the Binance API (see binance_ingest)
+DIRECT_BINANCE = bool(os.environ.get("BINANCE_API_KEY") and os.environ.get("BINANCE_API_SECRET"))
+
+
+@st.cache_resource
+def get_ingestor():
+    """Process-wide direct Binance ingestor, shared by every session"""
+    # Imported on demand: it loads pandas for the history frames
+    import binance_ingest
+    return binance_ingest.from_env()
+
+
+def direct_ingestor(endpoint):
+    """The Binance ingestor when DIRECT_BINANCE serves an endpoint, else None"""
+    if not DIRECT_BINANCE:
+        return None
+    ingestor = get_ingestor()
+    return ingestor if ingestor is not None and ingestor.serves(endpoint) else None
+
+
+def fetch_data(endpoint):
+    """Fetch data from API with error handling
+
+    With SHARED_POLLING this is the poller's shared snapshot: read-only,
+    watched by watch_snapshots, and served with a stale badge while the
+    backend is failing. With DIRECT_BINANCE the endpoints binance_ingest
+    serves come from Binance instead.
+    """
+    try:
+        ingestor = direct_ingestor(endpoint)
+        if ingestor is not None:
+            return ingestor.payload(endpoint)
+        if SHARED_POLLING:
+            snapshot = get_poller(API_SERVER).read(endpoint)
+            record_snapshot(API_SERVER, endpoint, snapshot)
+            return snapshot.data
+        return data_client.get_json(API_SERVER, endpoint)
+    except requests.exceptions.RequestException as e:
+        st.error(f"Error fetching data from {endpoint}: {e}")
+        return None
+
+
+def fetch_data_many(endpoints):
+    """Fetch several endpoints concurrently, yielding (endpoint, data) as each arrives"""
+    direct = [endpoint for endpoint in endpoints if direct_ingestor(endpoint) is not None]
+    for endpoint in direct:
+        yield endpoint, fetch_data(endpoint)
+    endpoints = [endpoint for endpoint in endpoints if endpoint not in direct]
+    if not endpoints:
+        return
+    if SHARED_POLLING:
+        for endpoint, snapshot, error in get_poller(API_SERVER).read_many(endpoints):
+            if error is not None:
+                st.error(f"Error fetching data from {endpoint}: {error}")
+                yield endpoint, None
+            else:
+                record_snapshot(API_SERVER, endpoint, snapshot)
+                yield endpoint, snapshot.data
+        return
+    for endpoint, data, error in data_client.fetch_many(API_SERVER, endpoints):
+        if error is not None:
+            st.error(f"Error fetching data from {endpoint}: {error}")
+        yield endpoint, data
+
+
+def selected_accounts():
+    """Account name -> backend URL of the accounts the sidebar selected"""
+    choice = st.session_state.get("account", ALL_ACCOUNTS)
+    if choice in ACCOUNTS:
+        return {choice: ACCOUNTS[choice]}
+    return dict(ACCOUNTS)
+
+
+def fetch_accounts(endpoints):
+    """Fetch endpoints from every selected account at once
+
+    Returns {endpoint: {account: data}} without the accounts that failed,
+    which are reported. All calls run concurrently under one deadline, so
+    the wait is the slowest account's rather than the sum.
+    """
+    selected = selected_accounts()
+    if SHARED_POLLING:
+        pollers = {account: get_poller(base_url) for account, base_url in selected.items()}
+        calls = {
+            (account, endpoint): (lambda shared=shared, endpoint=endpoint: shared.read(endpoint))
+            for account, shared in pollers.items() for endpoint in endpoints
+        }
+    else:
+        calls = {
+            (account, endpoint): (lambda base_url=base_url, endpoint=endpoint: data_client.get_json(base_url, endpoint))
+            for account, base_url in selected.items() for endpoint in endpoints
+        }
+    results = {endpoint: {} for endpoint in endpoints}
+    for (account, endpoint), result, error in accounts.gather(calls):
+        if error is not None:
+            st.error(f"Error fetching {endpoint} from account {account}: {error}")
+            continue
+        if SHARED_POLLING:
+            record_snapshot(selected[account], endpoint, result)
+            result = result.data
+        results[endpoint][account] = result
+    return results
+
+
+@st.cache_resource
+def get_live_feed():
+    """Process-wide push feed consumer, shared by every session"""
+    return live_feed.LiveFeed(LIVE_FEED_URL, LIVE_TOPICS).start()
+
+
+def live_section(endpoint, render):
+    """Render an endpoint's data, re-running only this section on pushed updates"""
+    if not st.session_state.get("live_updates", LIVE_UPDATES):
+        render(fetch_data(endpoint))
+        return
+    feed = get_live_feed()
+
+    @st.fragment(run_every=LIVE_REFRESH_SECONDS)
+    def section():
+        snapshot = feed.snapshot(endpoint)
+        if snapshot is None:
+            # Nothing pushed yet (or the feed is down): poll as before
+            render(fetch_data(endpoint))
+            st.caption("⚡ Waiting for the live feed…")
+            return
+        render(snapshot.data)
+        version_key = f"{endpoint}_live_version"
+        if st.session_state.get(version_key) != snapshot.version:
+            st.session_state[version_key] = snapshot.version
+            st.session_state[f"{endpoint}_live_latency"] = feed.record_render(endpoint, snapshot)
+        if not feed.connected:
+            st.caption(f"⚠️ Live feed reconnecting · showing update {snapshot.version}", help=str(feed.last_error))
+            return
+        latency = st.session_state[f"{endpoint}_live_latency"]
+        st.caption(f"⚡ Live · update {snapshot.version} reached the screen in {latency * 1000:.0f} ms")
+
+    section()
+
+
+def display_flashcard(title, value, emoji):
+    """Display a single flashcard."""
+    st.markdown(f"""
+    <div class="flashcard">
+        {emoji} {title}: <br><span style="font-size: 24px;">{value}</span>
+    </div>
+    """, unsafe_allow_html=True)
@@ -0,0 +1,159 @@
+"""DataFrame, history and table helpers shared by the table and chart pages."""
+import numpy as np
+import pandas as pd
+import requests
+import streamlit as st
+
+import accounts
+import charts
+import data_client
+import delta_sync
+import formatting
+import schemas
+import search_index
+import table_view
+from dashboard_pages.common import API_SERVER, INCREMENTAL_SYNC, direct_ingestor, fetch_accounts, selected_accounts
+from page_common import memoized, report_issues, stale_badge, synced_frame, to_frame
+
+
+def live_frame(endpoint, data, prepare=None):
+    """Typed, optionally prepared frame of a live section's payload, built once per payload
+
+    The feed publishes a new payload object per version (and the poller keeps
+    its object until the data changes), so fragment ticks without an update
+    reuse the frame. Schema issues are still reported on every tick. Shared
+    across reruns: callers must not modify it.
+    """
+    def build(data):
+        df = to_frame(endpoint, data)
+        return df if prepare is None else prepare(df)
+
+    return memoized(f"{endpoint}_live_frame", data, build)
+
+
+def history_source(endpoint, columns=None):
+    """Shared, read-only history frame of an endpoint, incrementally synced when enabled
+
+    ``columns`` are those the caller reads, None for every column; a store
+    may hold fewer, but never fewer than asked for.
+    """
+    try:
+        ingestor = direct_ingestor(endpoint)
+        if ingestor is not None:
+            source = synced_frame(ingestor.stores[endpoint], lambda: ingestor.history(endpoint, columns))
+        elif INCREMENTAL_SYNC:
+            store = delta_sync.get_store(API_SERVER, endpoint, columns)
+            source = synced_frame(store, store.sync)
+        else:
+            payload = data_client.get_json(API_SERVER, endpoint)
+            source = memoized(f"{endpoint}_frame", payload, lambda data: to_frame(endpoint, data))
+    except requests.exceptions.RequestException as e:
+        st.error(f"Error fetching data from {endpoint}: {e}")
+        return None
+    return source
+
+
+def history_generation(endpoint, base_url=None, columns=None):
+    """Generation of the store behind a history, which changes on a full replace
+
+    Without base_url, of history_source's store; with one, of that
+    account's store as account_histories syncs it. Pass the same columns as
+    to those. None when histories are not kept in a store, i.e. without
+    incremental sync.
+    """
+    ingestor = direct_ingestor(endpoint) if base_url is None else None
+    if ingestor is not None:
+        return ingestor.stores[endpoint].generation
+    if INCREMENTAL_SYNC:
+        return delta_sync.get_store(base_url or API_SERVER, endpoint, columns).generation
+    return None
+
+
+def fetch_history(endpoint, prepare=None):
+    """Fetch a history endpoint as a DataFrame, incrementally when enabled
+
+    With ``prepare`` the prepared frame is memoized until the data changes
+    and is shared across reruns, so callers must not modify it.
+    """
+    source = history_source(endpoint)
+    if source is None:
+        return None
+    if prepare is None:
+        return source.copy()
+    return memoized(endpoint, source, lambda frame: prepare(frame.copy()))
+
+
+def account_frame(endpoint, payloads):
+    """One typed frame of an endpoint across accounts, with an Account column first"""
+    frames = {account: to_frame(endpoint, data) for account, data in payloads.items() if data}
+    frames = {account: df for account, df in frames.items() if not df.empty}
+    if not frames:
+        return pd.DataFrame()
+    df = pd.concat(frames.values(), ignore_index=True)
+    # Each account brings its own categories; re-apply the schema to unify them
+    df, _ = schemas.coerce_frame(endpoint, df)
+    codes = np.repeat(np.arange(len(frames)), [len(frame) for frame in frames.values()])
+    df.insert(0, accounts.ACCOUNT_COLUMN, pd.Categorical.from_codes(codes, categories=list(frames)))
+    return df
+
+
+def account_histories(endpoint, columns=None):
+    """{account: shared, read-only history frame} of the selected accounts, synced concurrently
+
+    ``columns`` as for history_source.
+    """
+    selected = selected_accounts()
+    if not INCREMENTAL_SYNC:
+        payloads = fetch_accounts([endpoint])[endpoint]
+        return {
+            account: memoized(f"{endpoint}_frame_{account}", data, lambda data: to_frame(endpoint, data))
+            for account, data in payloads.items()
+        }
+    stores = {account: delta_sync.get_store(base_url, endpoint, columns) for account, base_url in selected.items()}
+    sources = {}
+    for account, frame, error in accounts.gather({account: store.sync for account, store in stores.items()}):
+        store = stores[account]
+        if error is not None:
+            if store.frame.empty:
+                st.error(f"Error fetching {endpoint} from account {account}: {error}")
+                continue
+            stale_badge(store.synced_at, error)
+            frame = store.frame
+        else:
+            report_issues(store.issues)
+        sources[account] = frame
+    return sources
+
+
+def localize_times(columns):
+    """fetch_history prepare step converting epoch columns to local datetimes"""
+    def prepare(df):
+        formatting.normalize_time_columns(df, columns)
+        return df
+    return prepare
+
+
+@st.fragment
+def display_dataframe_with_search(df, title, column_config=None):
+    """Display a searchable dataframe."""
+    st.subheader(title + " 🔎")
+    search_term = st.text_input(
+        f"Search {title}:", "",
+        help="Matches any column, or one column with field:value, e.g. symbol:BTCUSDT status:FILLED"
+    )
+    if not df.empty:
+        if search_term:
+            df = search_index.filter_frame(df, search_term, title)
+        table_view.paged_dataframe(df, key=title, column_config=column_config, gradient=True)
+    else:
+        st.warning(f"No data available for {title}.")
+
+
+@st.fragment
+def display_trend_graph(df, x_col, y_col, title):
+    """Create a trend graph."""
+    if x_col in df.columns and y_col in df.columns:
+        fig = charts.downsampled_line(df, x_col, y_col, title, key=title, markers=True)
+        st.plotly_chart(fig, use_container_width=True)
+    else:
+        st.warning(f"Missing columns for trend graph: {x_col}, {y_col}")
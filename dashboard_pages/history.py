@@ -0,0 +1,135 @@
+"""Trade, order and position history pages."""
+import streamlit as st
+import plotly.express as px
+import requests
+
+import charts
+import formatting
+import perf
+import table_view
+from dashboard_pages.frames import display_dataframe_with_search, display_trend_graph, fetch_history, localize_times
+
+
+@perf.timed_section
+def trade_history():
+    """Display Trade History."""
+    st.subheader("📊 Trade History")
+    df = fetch_history("trade_history", prepare=localize_times(['Time']))
+    if df is not None:
+        if not df.empty:
+            time_columns = [name for name in ['Time'] if name in df.columns]
+            display_dataframe_with_search(df, "Trade History", formatting.datetime_column_config(time_columns))
+            display_trend_graph(df, "Time", "PNL", "Trade History PNL Over Time")
+        else:
+            st.warning("No trade history found.")
+    else:
+        st.error("Failed to fetch trade history data.")
+
+
+def prepare_position_history(df):
+    """fetch_history prepare step: IST entry and exit times, latest exit first"""
+    # Display formats are set via column_config
+    formatting.normalize_time_columns(df, ['Entry Time', 'Exit Time'])
+    if 'Exit Time' in df.columns:
+        df.sort_values(by='Exit Time', ascending=False, inplace=True)
+    return df
+
+
+@perf.timed_section
+def position_history():
+    """Display Position History with Improved Formatting"""
+    st.subheader("Position History")
+    # Prepared once per data version, so the table's sort orders are reused
+    df = fetch_history("position_history", prepare=prepare_position_history)  # Ensure correct API endpoint
+
+    if df is not None:
+        if not df.empty:
+            time_columns = [name for name in ['Entry Time', 'Exit Time'] if name in df.columns]
+
+            # Display DataFrame; PNL stays numeric, signed and coloured on screen only
+            column_config = {
+                **formatting.datetime_column_config(time_columns),
+                **formatting.currency_column_config(['PNL'], signed=True),
+            }
+            table_view.paged_dataframe(df, key="Position History", height=500, column_config=column_config, pnl_columns=['PNL'])
+
+            # PNL Distribution Chart
+            if 'PNL' in df.columns:
+                fig = charts.binned_histogram(
+                    df['PNL'],
+                    title='Position PNL Distribution',
+                    x_label='Profit/Loss (USDT)',
+                    color='#EF553B'
+                )
+                st.plotly_chart(fig, use_container_width=True)
+
+            # Entry vs Exit Price Scatter Plot
+            if 'Entry Price' in df.columns and 'Exit Price' in df.columns:
+                scatter_fig = charts.scatter(
+                    df,
+                    x='Entry Price',
+                    y='Exit Price',
+                    color='Symbol',
+                    size='PNL',
+                    hover_data=['Entry Time', 'Exit Time'],
+                    title='Entry vs Exit Price by Symbol',
+                    labels={'Entry Price': 'Entry Price (USDT)', 'Exit Price': 'Exit Price (USDT)'}
+                )
+                st.plotly_chart(scatter_fig, use_container_width=True)
+
+        else:
+            st.warning("No position history available.")
+    else:
+        st.warning("Failed to fetch position history.")
+
+
+def prepare_order_history(df):
+    """fetch_history prepare step: IST order times, latest first"""
+    formatting.normalize_time_columns(df, ['Order Time'])
+    df.sort_values(by='Order Time', ascending=False, inplace=True)
+    return df
+
+
+@perf.timed_section
+def order_history():
+    """Display Order History"""
+    st.subheader("Order History")
+    try:
+        df = fetch_history("order_history", prepare=prepare_order_history)
+        if df is not None:
+            if not df.empty:
+                time_columns = [name for name in ['Order Time'] if name in df.columns]
+
+                # Display DataFrame
+                table_view.paged_dataframe(df, key="Order History Table", height=500, column_config=formatting.datetime_column_config(time_columns))
+
+                # Order Status Distribution Pie Chart
+                if 'Status' in df.columns:
+                    with perf.span(perf.CHART, 'Order Status Distribution'):
+                        status_fig = px.pie(
+                            df,
+                            names='Status',
+                            title='Order Status Distribution',
+                            color_discrete_sequence=px.colors.qualitative.Set3
+                        )
+                    st.plotly_chart(status_fig, use_container_width=True)
+
+                # Order Type Distribution Bar Chart
+                if 'Type' in df.columns:
+                    with perf.span(perf.CHART, 'Order Type Distribution'):
+                        type_fig = px.bar(
+                            df,
+                            x='Type',
+                            title='Order Type Distribution',
+                            labels={'Type': 'Order Type', 'count': 'Count'},
+                            color_discrete_sequence=['#636EFA']
+                        )
+                    st.plotly_chart(type_fig, use_container_width=True)
+            else:
+                st.warning("No order history found.")
+        else:
+            st.error("No data received from the backend. Please ensure the `/order_history` endpoint is correctly configured.")
+    except requests.exceptions.HTTPError as http_err:
+        st.error(f"HTTP error occurred: {http_err}")
+    except Exception as e:
+        st.error(f"An unexpected error occurred: {e}")
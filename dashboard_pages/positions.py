@@ -0,0 +1,153 @@
+"""Positions, Open Orders and open positions by trader."""
+import streamlit as st
+import plotly.express as px
+
+import formatting
+import perf
+from accounts import ACCOUNT_COLUMN
+from dashboard_pages.common import MULTI_ACCOUNT, fetch_accounts, fetch_data, live_section
+from dashboard_pages.frames import account_frame, live_frame
+from page_common import memoized, to_frame
+
+
+@perf.timed_section
+def positions():
+    """Advanced Positions Analysis"""
+    st.subheader("Active Positions")
+    if MULTI_ACCOUNT:
+        # Polled from every account; the push feed follows API_SERVER only
+        render_positions_frame(account_frame("positions", fetch_accounts(["positions"])["positions"]))
+        return
+    live_section("positions", render_positions)
+
+
+def render_positions(positions_data):
+    """Positions table and size distribution"""
+    if positions_data:
+        render_positions_frame(live_frame("positions", positions_data))
+
+
+def size_figure(df):
+    """Position size distribution pie"""
+    with perf.span(perf.CHART, 'Position Size Distribution'):
+        fig = px.pie(df, names='Symbol', values='Size', title='Position Size Distribution')
+    return fig
+
+
+def account_figure(df, values):
+    """Exposure and PNL per account"""
+    by_account = df.groupby(ACCOUNT_COLUMN, observed=True)[values].sum().reset_index()
+    with perf.span(perf.CHART, 'Exposure and PNL by Account'):
+        fig = px.bar(by_account, x=ACCOUNT_COLUMN, y=values, barmode='group', title='Exposure and PNL by Account')
+    return fig
+
+
+def render_positions_frame(df):
+    """Positions table and size distribution, broken down by account when there are several"""
+    if not df.empty:
+        st.dataframe(df, use_container_width=True)
+        # Figures are rebuilt only when the frame does, i.e. on a new feed version
+        st.plotly_chart(memoized("positions_size_fig", df, size_figure), use_container_width=True)
+        values = [column for column in ('Amount', 'PNL') if column in df.columns]
+        if ACCOUNT_COLUMN in df.columns and df[ACCOUNT_COLUMN].nunique() > 1 and values:
+            st.plotly_chart(
+                memoized("positions_account_fig", df, lambda df: account_figure(df, values)), use_container_width=True,
+            )
+    else:
+        st.warning("No active positions found.")
+
+
+@perf.timed_section
+def open_orders():
+    """Open Orders Analysis with Enhanced Visualization"""
+    st.subheader("Open Orders")
+    live_section("open_orders", render_open_orders)
+
+
+def prepare_open_orders(df):
+    """Order Time as local datetimes, latest first"""
+    if formatting.normalize_time_columns(df, ['Order Time']):
+        df.sort_values(by='Order Time', ascending=False, inplace=True)
+    return df
+
+
+def status_figure(df):
+    """Order status distribution pie"""
+    with perf.span(perf.CHART, 'Order Status Distribution'):
+        fig = px.pie(
+            df,
+            names='Status',
+            title='Order Status Distribution',
+            color_discrete_sequence=px.colors.qualitative.Set3
+        )
+    return fig
+
+
+def type_figure(df):
+    """Order type distribution bars"""
+    type_counts = df['Type'].value_counts().rename_axis('Order Type').reset_index(name='Count')
+    with perf.span(perf.CHART, 'Order Type Distribution'):
+        fig = px.bar(
+            type_counts,
+            x='Order Type',
+            y='Count',
+            title='Order Type Distribution',
+            text_auto=True
+        )
+    return fig
+
+
+def render_open_orders(open_orders_data):
+    """Open orders table with status and type distributions"""
+    if open_orders_data:
+        df = live_frame("open_orders", open_orders_data, prepare_open_orders)
+
+        if not df.empty:
+            time_columns = [name for name in ['Order Time'] if name in df.columns]
+            if not time_columns:
+                st.warning("'Order Time' column is missing from the API response.")
+
+            # Display DataFrame
+            st.dataframe(df, use_container_width=True, height=500, column_config=formatting.datetime_column_config(time_columns))
+
+            # Order Status Distribution Pie Chart
+            if 'Status' in df.columns:
+                st.plotly_chart(memoized("open_orders_status_fig", df, status_figure), use_container_width=True)
+
+            # Order Type Distribution Bar Chart
+            if 'Type' in df.columns:
+                st.plotly_chart(memoized("open_orders_type_fig", df, type_figure), use_container_width=True)
+
+        else:
+            st.warning("No open orders found.")
+    else:
+        st.warning("Failed to fetch open orders.")
+
+
+@perf.timed_section
+def traders_with_open_positions():
+    """Display Open Positions by Traders"""
+    st.subheader("Traders with Open Positions")
+    open_positions_data = fetch_data("open_positions")  # Replace with the correct API endpoint for open positions
+    
+    if open_positions_data:
+        df = to_frame("open_positions", open_positions_data)
+        if not df.empty:
+            # Display Open Positions grouped by Trader
+            st.dataframe(df, use_container_width=True)
+            # Visualization: Group positions by Trader
+            grouped_data = df.groupby('Trader')['Size'].sum().reset_index()
+            with perf.span(perf.CHART, 'Open Positions Size by Trader'):
+                fig = px.bar(
+                    grouped_data,
+                    x='Trader',
+                    y='Size',
+                    title='Open Positions Size by Trader',
+                    labels={'Trader': 'Trader', 'Size': 'Position Size (USDT)'},
+                    text='Size'
+                )
+            st.plotly_chart(fig, use_container_width=True)
+        else:
+            st.warning("No open positions found.")
+    else:
+        st.error("Failed to fetch open positions data.")
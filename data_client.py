@@ -0,0 +1,434 @@
+"""Shared data-access layer for the dashboard backends.
+
+app.py and app1.py both fetch through this module so every Streamlit rerun
+reuses one keep-alive connection pool and a short-lived response cache
+instead of re-downloading each endpoint from the Flask server. Pages that
+need several endpoints at once get them in a single round trip through the
+backend's bundle route when it has one. The big table endpoints ask for a
+binary columnar payload (see transport) and fall back to JSON. A circuit
+breaker per backend stops calling one that keeps failing, so a hung server
+costs one timeout per backoff period instead of one per section.
+"""
+import contextvars
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeoutError, as_completed
+
+import requests
+from requests.adapters import HTTPAdapter
+
+import jsonio
+import perf
+import transport
+
+DEFAULT_TIMEOUT = 10  # seconds
+DEFAULT_TTL = 30  # seconds
+CACHE_MAX_ENTRIES = 128
+FANOUT_MAX_WORKERS = 8
+# Batch route: GET /bundle?resources=a,b answers {"a": <payload>, "b": <payload>}
+USE_BUNDLE = True
+BUNDLE_PATH = "bundle"
+BUNDLE_PARAM = "resources"
+# Statuses meaning the backend has no bundle route at all
+NO_BUNDLE_STATUSES = {404, 405, 501}
+# Statuses meaning the route exists but cannot build bundles; it is skipped
+# too, but tried again after BUNDLE_RECHECK_INTERVAL seconds
+BROKEN_BUNDLE_STATUSES = {500}
+BUNDLE_RECHECK_INTERVAL = 300
+# Table endpoints fetched as Arrow (or msgpack) when the backend offers it;
+# their payloads may be pyarrow Tables, which schemas.build_frame accepts
+USE_BINARY = True
+BINARY_ENDPOINTS = {"trade_history", "order_history", "position_history", "closed_positions", "trade_analytics"}
+
+# Circuit breaker: consecutive outages (transport errors, 5xx) that open it,
+# then seconds until a trial call, doubled after each failed trial
+BREAKER_FAILURES = 3
+BREAKER_MIN_BACKOFF = 2
+BREAKER_MAX_BACKOFF = 120
+
+# Freshness per endpoint in seconds: live views stay close to real time,
+# histories only change when trades happen.
+ENDPOINT_TTL = {
+    "account_summary": 5,
+    "positions": 3,
+    "open_positions": 3,
+    "open_orders": 3,
+    "pnl_analytics": 60,
+    "trade_analytics": 60,
+    "trade_history": 120,
+    "position_history": 300,
+    "closed_positions": 300,
+    "order_history": 300,
+}
+
+
+class TTLCache:
+    """Bounded LRU cache whose entries expire after a per-entry TTL."""
+
+    def __init__(self, max_entries=CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        """Return (hit, value); expired entries count as misses."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return True, value
+                del self._entries[key]
+            self.misses += 1
+            return False, None
+
+    def set(self, key, value, ttl):
+        """Store value for ttl seconds, evicting least recently used entries."""
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def discard(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "size": len(self._entries),
+            }
+
+
+class CircuitOpenError(requests.exceptions.ConnectionError):
+    """Raised instead of calling a backend whose circuit breaker is open."""
+
+
+def _is_outage(error):
+    if isinstance(error, (requests.exceptions.ConnectionError, requests.exceptions.Timeout)):
+        return True
+    response = getattr(error, "response", None)
+    return isinstance(error, requests.exceptions.HTTPError) and response is not None and response.status_code >= 500
+
+
+class CircuitBreaker:
+    """Fails calls to a backend fast after repeated outages.
+
+    After ``failures`` consecutive outages the circuit opens and calls raise
+    CircuitOpenError without touching the network. Once the backoff has
+    elapsed one trial call goes through: success closes the circuit, an
+    outage reopens it for twice as long, up to ``max_backoff``. Answers
+    with a 4xx status are not outages; the backend is up.
+    """
+
+    def __init__(self, failures=BREAKER_FAILURES, min_backoff=BREAKER_MIN_BACKOFF, max_backoff=BREAKER_MAX_BACKOFF):
+        self.failure_threshold = failures
+        self.min_backoff = min_backoff
+        self.max_backoff = max_backoff
+        self.failures = 0
+        self.backoff = min_backoff
+        self.open_until = None  # monotonic time of the next trial; None while closed
+        self.last_error = None
+        self._trial = None  # thread making the trial call, if one is under way
+        self._lock = threading.Lock()
+
+    @property
+    def is_open(self):
+        return self.open_until is not None
+
+    def retry_in(self):
+        """Seconds until the next trial call, 0 while closed."""
+        with self._lock:
+            if self.open_until is None:
+                return 0.0
+            return max(self.open_until - time.monotonic(), 0.0)
+
+    def before_call(self):
+        """Raise CircuitOpenError unless a call may go through now."""
+        with self._lock:
+            if self.open_until is None:
+                return
+            if self._trial is not None or time.monotonic() < self.open_until:
+                wait = max(self.open_until - time.monotonic(), 0.0)
+                raise CircuitOpenError(f"backend unavailable ({self.last_error}); next attempt in {wait:.0f}s")
+            self._trial = threading.get_ident()
+
+    def record(self, error=None):
+        """Record the outcome of a call; error is the exception it raised, if any."""
+        with self._lock:
+            trial, self._trial = self._trial is not None, None
+            if error is None or not _is_outage(error):
+                self.failures = 0
+                self.backoff = self.min_backoff
+                self.open_until = None
+                return
+            self.failures += 1
+            self.last_error = error
+            if trial:
+                self.backoff = min(self.backoff * 2, self.max_backoff)
+            if trial or self.failures >= self.failure_threshold:
+                self.open_until = time.monotonic() + self.backoff
+
+    def release(self):
+        """End this thread's call without recording an outcome.
+
+        Callers run it in a ``finally``, so a call that raised anything
+        else, or told nothing about the backend's health, never leaves a
+        trial pending; after record() it does nothing.
+        """
+        with self._lock:
+            if self._trial == threading.get_ident():
+                self._trial = None
+
+
+_session = None
+_session_lock = threading.Lock()
+_cache = TTLCache()
+_bundle_support = {}  # base_url -> whether its backend has the bundle route
+_bundle_recheck_at = {}  # base_url -> monotonic time to try a broken bundle route again
+_breakers = {}
+_breakers_lock = threading.Lock()
+_executor = ThreadPoolExecutor(max_workers=FANOUT_MAX_WORKERS, thread_name_prefix="fetch")
+
+
+def get_session():
+    """Return the process-wide pooled keep-alive session."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=8, pool_maxsize=32)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            _session = session
+        return _session
+
+
+def breaker(base_url):
+    """Return the circuit breaker of a backend, creating it on first use."""
+    with _breakers_lock:
+        if base_url not in _breakers:
+            _breakers[base_url] = CircuitBreaker(BREAKER_FAILURES, BREAKER_MIN_BACKOFF, BREAKER_MAX_BACKOFF)
+        return _breakers[base_url]
+
+
+def _get(base_url, path, allow=(), unrecorded=(), **kwargs):
+    """GET through the backend's circuit breaker, raising for error statuses.
+
+    Statuses in ``allow`` are returned instead of raised. So are those in
+    ``unrecorded``, which count as neither a success nor a failure.
+    """
+    circuit = breaker(base_url)
+    circuit.before_call()
+    try:
+        response = get_session().get(f"{base_url}/{path}", **kwargs)
+        if response.status_code not in allow and response.status_code not in unrecorded:
+            response.raise_for_status()
+    except requests.exceptions.RequestException as e:
+        circuit.record(e)
+        raise
+    else:
+        if response.status_code not in unrecorded:
+            circuit.record()
+    finally:
+        circuit.release()
+    return response
+
+
+def endpoint_ttl(endpoint):
+    """Freshness window for an endpoint, ignoring any query string."""
+    return ENDPOINT_TTL.get(endpoint.split("?", 1)[0], DEFAULT_TTL)
+
+
+def get_json(base_url, endpoint, params=None, timeout=DEFAULT_TIMEOUT, ttl=None):
+    """Fetch an endpoint's JSON, served from the TTL cache while fresh.
+
+    With USE_BINARY, BINARY_ENDPOINTS may come back as a pyarrow Table
+    instead of a list of records. Raises requests.exceptions.RequestException on transport or HTTP errors;
+    failures are never cached.
+    """
+    if ttl is None:
+        ttl = endpoint_ttl(endpoint)
+    hit, data = _cache.get(_cache_key(base_url, endpoint, params))
+    if hit:
+        return data
+    return _download(base_url, endpoint, params, timeout, ttl)
+
+
+def _cache_key(base_url, endpoint, params=None):
+    return (base_url, endpoint, tuple(sorted((params or {}).items())))
+
+
+def _download(base_url, endpoint, params=None, timeout=DEFAULT_TIMEOUT, ttl=None):
+    """get_json without the cache lookup; the result is still cached."""
+    if ttl is None:
+        ttl = endpoint_ttl(endpoint)
+    headers = None
+    if USE_BINARY and endpoint.split("?", 1)[0] in BINARY_ENDPOINTS:
+        headers = {"Accept": transport.accept_header()}
+    with perf.span(perf.NETWORK, endpoint) as span:
+        response = _get(base_url, endpoint, params=params, headers=headers, timeout=timeout)
+        span.bytes = len(response.content)
+    content_type = response.headers.get("Content-Type")
+    try:
+        with perf.span(perf.DECODE, endpoint) as span:
+            data = transport.decode(response.content, content_type)
+            span.rows = transport.rows(data)
+    except ValueError as e:
+        raise requests.exceptions.InvalidJSONError(
+            f"Invalid {transport.media_type(content_type) or 'payload'} from {endpoint}: {e}", response=response
+        ) from e
+    if ttl > 0:
+        _cache.set(_cache_key(base_url, endpoint, params), data, ttl)
+    return data
+
+
+def get_bundle(base_url, endpoints, timeout=DEFAULT_TIMEOUT):
+    """Fetch several endpoints in one round trip through the bundle route.
+
+    Returns {endpoint: data} for the endpoints the response carried, each
+    cached as get_json would. Returns None if the backend has no bundle
+    route; that is detected on the first call and remembered per backend,
+    so later calls cost nothing. A route answering 500 is remembered the
+    same way for BUNDLE_RECHECK_INTERVAL, without counting for or against
+    the backend's circuit breaker. Raises requests.exceptions.RequestException
+    on other failures.
+    """
+    if _bundle_support.get(base_url) is False and time.monotonic() < _bundle_recheck_at.get(base_url, float("inf")):
+        return None
+    with perf.span(perf.NETWORK, BUNDLE_PATH) as span:
+        response = _get(
+            base_url, BUNDLE_PATH, params={BUNDLE_PARAM: ",".join(endpoints)}, timeout=timeout,
+            allow=NO_BUNDLE_STATUSES, unrecorded=BROKEN_BUNDLE_STATUSES,
+        )
+        span.bytes = len(response.content)
+    _bundle_recheck_at.pop(base_url, None)
+    if response.status_code in BROKEN_BUNDLE_STATUSES:
+        _bundle_support[base_url] = False
+        _bundle_recheck_at[base_url] = time.monotonic() + BUNDLE_RECHECK_INTERVAL
+        return None
+    if response.status_code in NO_BUNDLE_STATUSES:
+        _bundle_support[base_url] = False
+        return None
+    try:
+        with perf.span(perf.DECODE, BUNDLE_PATH):
+            parts = jsonio.loads(response.content)
+    except ValueError as e:
+        raise requests.exceptions.InvalidJSONError(f"Invalid JSON from {BUNDLE_PATH}: {e}", response=response) from e
+    if not isinstance(parts, dict):
+        # A catch-all route answered instead of a bundle
+        _bundle_support[base_url] = False
+        return None
+    _bundle_support[base_url] = True
+    results = {endpoint: parts[endpoint] for endpoint in endpoints if endpoint in parts}
+    for endpoint, data in results.items():
+        ttl = endpoint_ttl(endpoint)
+        if ttl > 0:
+            _cache.set(_cache_key(base_url, endpoint), data, ttl)
+    return results
+
+
+def cache_stats():
+    """Hit/miss counters for the response cache."""
+    return _cache.stats()
+
+
+def clear_cache():
+    """Empty the response cache and forget which backends lack the bundle route."""
+    _cache.clear()
+    _bundle_support.clear()
+    _bundle_recheck_at.clear()
+
+
+def fetch_many(base_url, endpoints, timeout=DEFAULT_TIMEOUT, refresh=False):
+    """Fetch several endpoints concurrently, yielding results as they complete.
+
+    Yields (endpoint, data, error) tuples in completion order; exactly one of
+    data/error is set. A failing or slow endpoint never hides the others:
+    anything still pending once the timeout elapses is yielded as an error.
+
+    With USE_BUNDLE, endpoints missing from the response cache are asked for
+    in one round trip through the bundle route. Whatever that cannot answer
+    (no bundle route, an error status, resources left out) is fetched with
+    concurrent individual calls.
+
+    With ``refresh`` every endpoint is downloaded without consulting the
+    response cache, which is still filled.
+    """
+    endpoints = list(dict.fromkeys(endpoints))
+    fetch = _download if refresh else get_json
+    if USE_BUNDLE and len(endpoints) > 1:
+        endpoints = yield from _fetch_bundled(base_url, endpoints, timeout, refresh)
+        # Those left over already missed the cache
+        fetch = _download
+    # Workers run in a copy of the caller's context so their spans land in
+    # the caller's section
+    futures = {
+        _executor.submit(contextvars.copy_context().run, fetch, base_url, endpoint, timeout=timeout): endpoint
+        for endpoint in endpoints
+    }
+    pending = set(futures)
+    try:
+        for future in as_completed(futures, timeout=timeout):
+            pending.discard(future)
+            yield _outcome(futures[future], future)
+    except FuturesTimeoutError:
+        # The deadline also runs while the caller renders earlier results,
+        # so anything that finished in the meantime is still delivered.
+        for future in pending:
+            if future.done():
+                yield _outcome(futures[future], future)
+            else:
+                error = requests.exceptions.Timeout(f"no response within {timeout}s")
+                yield futures[future], None, error
+
+
+def _fetch_bundled(base_url, endpoints, timeout, refresh=False):
+    """Yield what the cache and one bundle request answer; return the rest."""
+    missing = []
+    for endpoint in endpoints:
+        hit, data = (False, None) if refresh else _cache.get(_cache_key(base_url, endpoint))
+        if hit:
+            yield endpoint, data, None
+        else:
+            missing.append(endpoint)
+    if len(missing) < 2:
+        return missing
+    try:
+        parts = get_bundle(base_url, missing, timeout=timeout)
+    except requests.exceptions.HTTPError:
+        # The server answered but could not build the bundle; individual
+        # calls isolate the resource that failed
+        return missing
+    except requests.exceptions.RequestException as e:
+        # Transport failure: individual calls would only wait out the same timeout
+        for endpoint in missing:
+            yield endpoint, None, e
+        return []
+    if parts is None:
+        return missing
+    for endpoint, data in parts.items():
+        yield endpoint, data, None
+    return [endpoint for endpoint in missing if endpoint not in parts]
+
+
+def _outcome(endpoint, future):
+    try:
+        return endpoint, future.result(), None
+    except requests.exceptions.RequestException as e:
+        return endpoint, None, e
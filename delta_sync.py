@@ -0,0 +1,273 @@
+"""Incremental delta sync for the append-only history endpoints.
+
+Each history endpoint keeps a local append-only store. After the first full
+download only records at or after the last seen cursor timestamp are
+requested (``?since=<epoch ms>``), so per-render transfer and parse cost is
+proportional to the new rows rather than the whole history. A backend that
+ignores ``since`` is remembered and its full responses are filtered down to
+the new rows locally. Stores are persisted through history_cache's
+background writer, so a fresh process starts from disk and only asks the
+backend for what happened since.
+
+A store can keep only the columns its pages use: those are all it holds in
+memory and reads back from disk, while the disk copy keeps every column.
+Asking for more columns reloads it with the wider selection.
+"""
+import hashlib
+import json
+import threading
+import time
+from collections import Counter
+from urllib.parse import urlparse
+
+import numpy as np
+import pandas as pd
+
+import data_client
+import history_cache
+import schemas
+
+# Timestamp column that orders each history endpoint
+CURSOR_FIELDS = {
+    "trade_history": "Time",
+    "order_history": "Order Time",
+    "position_history": "Exit Time",
+}
+SINCE_PARAM = "since"
+FULL_RESYNC_INTERVAL = 30 * 60  # seconds; catches amended or deleted rows
+PERSIST_HISTORY = True
+
+
+def _json_default(value):
+    # Rows taken from frames may carry NumPy scalars instead of Python ones
+    return value.item() if hasattr(value, "item") else str(value)
+
+
+def _scalar(value):
+    value = value.item() if hasattr(value, "item") else value
+    if isinstance(value, float) and value.is_integer():
+        # A NaN elsewhere in the column turns epoch-ms ints into floats
+        value = int(value)
+    return value
+
+
+def _row_key(row):
+    return json.dumps(row, sort_keys=True, default=_json_default)
+
+
+def _digest(frame):
+    """Content hash of a whole frame, column names and row order included."""
+    digest = hashlib.blake2b(json.dumps(list(map(str, frame.columns))).encode())
+    digest.update(pd.util.hash_pandas_object(frame, index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+class DeltaStore:
+    """Append-only local copy of one history endpoint.
+
+    ``columns`` are the columns kept in ``frame``, None for every column;
+    the cursor field is always kept.
+    """
+
+    def __init__(self, base_url, endpoint, cursor_field, columns=None):
+        self.base_url = base_url
+        self.endpoint = endpoint
+        self.cursor_field = cursor_field
+        self.columns = None if columns is None else list(columns)
+        # Disk cache namespace, so several backends never share history
+        self.cache_name = f"{urlparse(base_url).netloc.replace(':', '_')}__{endpoint}"
+        self.frame = pd.DataFrame()
+        self.cursor = None
+        self.last_full_sync = 0.0
+        self.rows_fetched = 0
+        self.issues = []  # schema issues found in the last sync
+        self.synced_at = None  # epoch seconds of the last successful sync
+        self.honors_since = True  # False once the backend answered ``since`` with older rows
+        self.generation = 0  # bumped whenever the frame is replaced rather than appended to
+        self._loaded_from_disk = not PERSIST_HISTORY
+        # Rows sharing the cursor timestamp, counted by key; ``since`` is
+        # inclusive, so these come back on the next request and must not be
+        # appended twice. Counted, since kept columns may not tell rows apart.
+        self._boundary_keys = Counter()
+        self._digest = None  # of the last full download, every column
+        self._lock = threading.Lock()
+
+    def sync(self, timeout=data_client.DEFAULT_TIMEOUT):
+        """Bring the store up to date and return the full history frame.
+
+        Raises requests.exceptions.RequestException if the backend call fails;
+        the store is left untouched in that case, and ``frame`` still holds
+        the last good history.
+        """
+        with self._lock:
+            if not self._loaded_from_disk:
+                self._load_from_disk()
+            full = (
+                self.cursor is None
+                or time.monotonic() - self.last_full_sync > FULL_RESYNC_INTERVAL
+            )
+            params = None if full or not self.honors_since else {SINCE_PARAM: self.cursor}
+            payload = data_client.get_json(self.base_url, self.endpoint, params=params, timeout=timeout)
+            # Arrow tables and JSON records alike become one typed frame,
+            # and the cursor bookkeeping below works on its kept columns
+            full_frame, issues = schemas.build_frame(self.endpoint, payload or [])
+            frame = self._project(full_frame)
+            self.rows_fetched = len(frame)
+
+            if params is not None and self._stamps(frame).lt(self.cursor).any():
+                # The backend ignored ``since`` and sent everything. Stop
+                # asking; _append keeps only what is past the cursor.
+                self.honors_since = False
+
+            if full:
+                self._replace(frame, full_frame, issues)
+            else:
+                self._append(frame, full_frame, issues)
+            self.synced_at = time.time()
+            return self.frame
+
+    def reset(self):
+        """Drop local state so the next sync downloads the full history."""
+        with self._lock:
+            self._clear()
+            self.honors_since = True
+            # Skip the disk copy too; the next full download replaces it
+            self._loaded_from_disk = True
+
+    def require(self, columns):
+        """Keep ``columns`` too (None: every column) from the next sync on.
+
+        Widening drops the rows in memory, which lack the new columns; the
+        next sync reloads them from disk, or downloads them again.
+        """
+        with self._lock:
+            columns = history_cache.wider_columns(self.columns, columns)
+            if columns == self.columns:
+                return
+            self.columns = columns
+            self._clear()
+            self._loaded_from_disk = not PERSIST_HISTORY
+
+    def _clear(self):
+        self.frame = pd.DataFrame()
+        self.cursor = None
+        self._boundary_keys = Counter()
+        self._digest = None
+        self.generation += 1
+
+    def _project(self, frame):
+        if self.columns is None:
+            return frame
+        kept = dict.fromkeys([self.cursor_field, *self.columns])
+        return frame[[name for name in kept if name in frame.columns]]
+
+    def _load_from_disk(self):
+        self._loaded_from_disk = True
+        if history_cache.truncated(self.cache_name):
+            # Older months were evicted; a cursor from this copy would never
+            # bring them back, so start with a full download instead
+            return
+        # Writes still queued, e.g. before require() widened the columns
+        history_cache.flush()
+        columns = None if self.columns is None else [self.cursor_field, *self.columns]
+        try:
+            frame = history_cache.read_history(self.cache_name, columns)
+        except OSError:
+            return
+        if frame is None or frame.empty or self.cursor_field not in frame.columns:
+            return
+        self.frame, _ = schemas.coerce_frame(self.endpoint, frame)
+        self._advance_cursor(self.frame)
+        if self.cursor is not None:
+            self.last_full_sync = time.monotonic()
+
+    def _persist(self, write, frame):
+        if PERSIST_HISTORY:
+            history_cache.submit(write, self.cache_name, frame, self.cursor_field)
+
+    def _stamps(self, frame):
+        if self.cursor_field not in frame.columns:
+            return pd.Series(dtype="float64")
+        return frame[self.cursor_field]
+
+    def _replace(self, frame, full_frame, issues):
+        self.issues = issues
+        self.last_full_sync = time.monotonic()
+        digest = _digest(full_frame)
+        if digest == self._digest:
+            # Nothing amended: keep the frame object, so memoized pages and
+            # the disk copy stay as they are
+            return
+        self._digest = digest
+        self._persist(history_cache.replace, full_frame)
+        if frame.equals(self.frame):
+            # Only columns this store does not keep changed
+            return
+        self.frame = frame
+        self.generation += 1
+        self.cursor = None
+        self._boundary_keys = Counter()
+        self._advance_cursor(frame)
+
+    def _append(self, frame, full_frame, issues):
+        self.issues = issues
+        stamps = self._stamps(frame)
+        is_new = np.array(stamps.gt(self.cursor).fillna(False), dtype=bool)
+        at_cursor = np.flatnonzero(stamps.eq(self.cursor).fillna(False).to_numpy(dtype=bool))
+        if len(at_cursor):
+            # The first rows of each key at the cursor are the ones stored
+            seen = Counter()
+            for position, row in zip(at_cursor, frame.iloc[at_cursor].to_dict("records")):
+                key = _row_key(row)
+                seen[key] += 1
+                is_new[position] = seen[key] > self._boundary_keys[key]
+        if not is_new.any():
+            return
+        new_frame = frame[is_new].reset_index(drop=True)
+        self._persist(history_cache.append, full_frame[is_new].reset_index(drop=True))
+        if self.frame.empty:
+            self.frame = new_frame
+        else:
+            # Concatenating categoricals with different categories yields
+            # object columns; re-apply the schema to get them back
+            self.frame, _ = schemas.coerce_frame(self.endpoint, pd.concat([self.frame, new_frame], ignore_index=True))
+        self._advance_cursor(new_frame)
+
+    def _advance_cursor(self, frame):
+        stamps = self._stamps(frame)
+        if stamps.isna().all():
+            return
+        newest = _scalar(stamps.max())
+        if self.cursor is None or newest > self.cursor:
+            self.cursor = newest
+            self._boundary_keys = Counter()
+        at_cursor = frame[stamps.eq(self.cursor).fillna(False).to_numpy(dtype=bool)]
+        self._boundary_keys.update(_row_key(row) for row in at_cursor.to_dict("records"))
+
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def get_store(base_url, endpoint, columns=None):
+    """Return the process-wide store for an endpoint, creating it on first use.
+
+    ``columns`` are those the caller reads, None for every column; the
+    store keeps what all of its callers asked for.
+    """
+    with _stores_lock:
+        key = (base_url, endpoint)
+        if key not in _stores:
+            _stores[key] = DeltaStore(base_url, endpoint, CURSOR_FIELDS[endpoint], columns)
+            return _stores[key]
+        store = _stores[key]
+    store.require(columns)
+    return store
+
+
+def reset_all():
+    """Force a full resync of every store on its next use."""
+    with _stores_lock:
+        stores = list(_stores.values())
+    for store in stores:
+        store.reset()
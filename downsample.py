@@ -0,0 +1,86 @@
+"""Time-series downsampling for the dashboard charts.
+
+Both methods work on NumPy arrays and return the indices of the points to
+keep, in ascending order, so callers can take whole rows of a DataFrame.
+x must be sorted ascending; datetimes are accepted and compared as int64.
+"""
+import numpy as np
+
+DEFAULT_CHART_WIDTH_PX = 1200
+POINTS_PER_PIXEL = 1.0
+MIN_POINTS = 100
+
+
+def target_points(width_px=DEFAULT_CHART_WIDTH_PX, points_per_pixel=POINTS_PER_PIXEL):
+    """How many points a chart of this width can usefully show."""
+    return max(MIN_POINTS, int(width_px * points_per_pixel))
+
+
+def _as_float(values):
+    values = np.asarray(values)
+    if np.issubdtype(values.dtype, np.datetime64):
+        values = values.astype("datetime64[ns]").astype(np.int64)
+    return values.astype(np.float64)
+
+
+def lttb(x, y, n_out):
+    """Largest-Triangle-Three-Buckets: keep the n_out most shape-defining points."""
+    x = _as_float(x)
+    y = _as_float(y)
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    # First and last points are always kept; the rest is split into
+    # n_out - 2 buckets of (nearly) equal size.
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    ends = edges[1:]
+    # Average of the bucket following each bucket (the last one is followed
+    # by the final point), computed for all buckets in one pass.
+    counts = np.diff(np.append(ends, n))
+    avg_x = np.add.reduceat(x, ends) / counts
+    avg_y = np.add.reduceat(y, ends) / counts
+
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0] = 0
+    selected[-1] = n - 1
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], ends[i]
+        bucket_x = x[lo:hi]
+        bucket_y = y[lo:hi]
+        area = np.abs(
+            (x[a] - avg_x[i]) * (bucket_y - y[a]) - (x[a] - bucket_x) * (avg_y[i] - y[a])
+        )
+        a = lo + int(np.argmax(area))
+        selected[i + 1] = a
+    return selected
+
+
+def minmax(y, n_out):
+    """Min/max decimation: the lowest and highest point of each bucket."""
+    y = _as_float(y)
+    n = len(y)
+    if n_out >= n or n_out < 2:
+        return np.arange(n)
+    bucket_count = n_out // 2
+    width = -(-n // bucket_count)
+    # Pad to a (buckets, width) matrix; padding never wins argmin/argmax
+    low = np.full(bucket_count * width, np.inf)
+    low[:n] = y
+    high = np.full(bucket_count * width, -np.inf)
+    high[:n] = y
+    offsets = np.arange(bucket_count) * width
+    keep = np.concatenate([
+        offsets + low.reshape(bucket_count, width).argmin(axis=1),
+        offsets + high.reshape(bucket_count, width).argmax(axis=1),
+        [0, n - 1],
+    ])
+    return np.unique(keep[keep < n])
+
+
+def downsample(x, y, n_out, method="lttb"):
+    """Indices of at most n_out points (min/max may keep a couple more)."""
+    if method == "minmax":
+        return minmax(y, n_out)
+    return lttb(x, y, n_out)
@@ -0,0 +1,104 @@
+"""Column normalization and display formatting shared by the dashboards.
+
+Data stays typed (numeric, tz-aware datetime) in the DataFrames; how values
+look on screen is declared through st.column_config and st.metric's format
+at render time, and PNL colours through a Styler over the visible rows only.
+Light enough for the metric-only pages: pandas is imported when a column is
+first converted.
+"""
+import streamlit as st
+
+import perf
+
+INDIAN_TZ = "Asia/Kolkata"
+# moment.js pattern used by st.column_config.DatetimeColumn
+DISPLAY_DATETIME_FORMAT = "DD MMM YYYY hh:mm:ss A"
+# The same, as a strftime pattern for text rendered outside the table
+TEXT_DATETIME_FORMAT = "%d %b %Y %I:%M:%S %p"
+CURRENCY = "USDT"
+# printf-style number formats, applied in the browser by st.column_config
+# and st.metric(format=...)
+CURRENCY_FORMAT = f"%,.2f {CURRENCY}"
+PNL_FORMAT = f"%+,.2f {CURRENCY}"  # signed, for profits and losses
+PERCENT_FORMAT = "%.2f%%"
+COUNT_FORMAT = "%,d"
+PNL_COLORS = {1: "color: green", -1: "color: red", 0: ""}
+
+# Epoch values at or above this are milliseconds (1e11 s is the year 5138)
+_EPOCH_MS_THRESHOLD = 1e11
+
+
+def _epoch_unit(numeric):
+    median = numeric.abs().median()
+    return "s" if median == median and median < _EPOCH_MS_THRESHOLD else "ms"
+
+
+def to_local_datetime(values, unit="auto", tz=INDIAN_TZ):
+    """Convert an epoch column to tz-aware datetimes in one vectorized pass.
+
+    ``unit`` is "s", "ms" or "auto", which picks seconds or milliseconds from
+    the magnitude of the values. Unparseable entries become NaT.
+    """
+    import pandas as pd
+
+    if pd.api.types.is_datetime64_any_dtype(values):
+        stamps = values if values.dt.tz is not None else values.dt.tz_localize("UTC")
+        return stamps.dt.tz_convert(tz)
+    numeric = pd.to_numeric(values, errors="coerce")
+    if unit == "auto":
+        unit = _epoch_unit(numeric)
+    return pd.to_datetime(numeric, unit=unit, utc=True).dt.tz_convert(tz)
+
+
+def datetime_text(values, fmt=TEXT_DATETIME_FORMAT):
+    """Datetimes as strings, like the tables show them, as a pyarrow array.
+
+    Truncated to whole seconds first: pyarrow's %S adds the fraction of a
+    millisecond column (``05.000``), which the tables never display.
+    """
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    array = pa.array(values)
+    array = array.cast(pa.timestamp("s", tz=array.type.tz), safe=False)
+    return pc.strftime(array, format=fmt)
+
+
+def normalize_time_columns(df, columns, unit="auto", tz=INDIAN_TZ):
+    """Convert the epoch columns of df that exist, in place.
+
+    Returns the names of the converted columns.
+    """
+    converted = [name for name in columns if name in df.columns]
+    with perf.span(perf.TRANSFORM, "normalize_time_columns") as span:
+        span.rows = len(df)
+        for name in converted:
+            df[name] = to_local_datetime(df[name], unit=unit, tz=tz)
+    return converted
+
+
+def datetime_column_config(columns):
+    """st.dataframe column_config rendering datetimes in the dashboard format."""
+    return {
+        name: st.column_config.DatetimeColumn(name, format=DISPLAY_DATETIME_FORMAT)
+        for name in columns
+    }
+
+
+def currency_column_config(columns, signed=False):
+    """st.dataframe column_config showing amounts in CURRENCY; ``signed`` for PNL."""
+    return {
+        name: st.column_config.NumberColumn(name, format=PNL_FORMAT if signed else CURRENCY_FORMAT)
+        for name in columns
+    }
+
+
+def color_pnl(styler, columns):
+    """Colour gains green and losses red in the columns of a Styler that exist.
+
+    Only CSS is added; the numbers keep their column_config format.
+    """
+    columns = [name for name in columns if name in styler.data.columns]
+    if not columns:
+        return styler
+    return styler.apply(lambda values: values.gt(0).astype(int).sub(values.lt(0)).map(PNL_COLORS), subset=columns)
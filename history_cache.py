@@ -0,0 +1,253 @@
+"""On-disk Arrow IPC cache for the history endpoints.
+
+History frames are persisted as uncompressed Arrow IPC (Feather v2) files,
+one directory per endpoint and one sub-directory per UTC month, so a full
+replace of two years writes about two dozen files. Reads are memory-mapped,
+so a cold start or a new browser session loads months of rows without
+waiting on the backend. Appends add a part file to each touched month;
+compaction folds a month's parts back into one file and the total size is
+capped by evicting the oldest months first. An endpoint that lost months
+that way is marked truncated until its next replace. Stores hand their
+writes to submit(), which runs them on one background thread, so a render
+never waits on the disk, and read back only the columns their pages use.
+"""
+import os
+import shutil
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+
+import perf
+
+HISTORY_CACHE_DIR = os.environ.get("DASHBOARD_HISTORY_CACHE", os.path.join(".cache", "history"))
+MAX_CACHE_BYTES = 512 * 1024 * 1024
+COMPACT_PART_THRESHOLD = 8  # parts per month before an append triggers compaction
+UNDATED_PARTITION = "undated"
+TRUNCATED_MARKER = ".truncated"
+
+# One worker: writes land on disk in the order they were submitted
+_writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="history-writer")
+
+
+def _endpoint_dir(endpoint):
+    return os.path.join(HISTORY_CACHE_DIR, endpoint)
+
+
+def _partitions(endpoint):
+    """Month partition directories for an endpoint, oldest first."""
+    root = _endpoint_dir(endpoint)
+    if not os.path.isdir(root):
+        return []
+    paths = (os.path.join(root, month) for month in sorted(os.listdir(root)))
+    return [path for path in paths if os.path.isdir(path)]
+
+
+def _parts(partition):
+    return sorted(
+        os.path.join(partition, name)
+        for name in os.listdir(partition)
+        if name.endswith(".arrow")
+    )
+
+
+def _month_keys(frame, time_field):
+    if time_field not in frame.columns:
+        return pd.Series(UNDATED_PARTITION, index=frame.index)
+    stamps = pd.to_datetime(pd.to_numeric(frame[time_field], errors="coerce"), unit="ms", utc=True)
+    return stamps.dt.strftime("%Y-%m").fillna(UNDATED_PARTITION)
+
+
+def _write_part(partition, frame):
+    os.makedirs(partition, exist_ok=True)
+    name = f"part-{time.time_ns()}-{os.getpid()}.arrow"
+    tmp_path = os.path.join(partition, f".{name}.tmp")
+    table = pa.Table.from_pandas(frame, preserve_index=False)
+    # Categories are per-frame dictionaries; store plain strings so parts
+    # written at different times concatenate cleanly
+    table = table.cast(pa.schema([
+        field.with_type(field.type.value_type) if pa.types.is_dictionary(field.type) else field
+        for field in table.schema
+    ], metadata=table.schema.metadata))
+    feather.write_feather(table, tmp_path, compression="uncompressed")
+    # Readers in other dashboard processes only ever see complete files
+    os.replace(tmp_path, os.path.join(partition, name))
+
+
+def _read_part(path, columns=None):
+    try:
+        if columns is not None:
+            # read_table rejects names the file lacks, e.g. in older parts
+            with pa.memory_map(path) as source:
+                names = set(pa.ipc.open_file(source).schema.names)
+            columns = [name for name in columns if name in names]
+        return feather.read_table(path, columns=columns, memory_map=True)
+    except (FileNotFoundError, pa.ArrowInvalid):
+        # Removed by a concurrent compaction or eviction
+        return None
+
+
+def append(endpoint, frame, time_field):
+    """Persist new rows into their month partitions."""
+    if frame.empty:
+        return
+    with perf.span(perf.STORAGE, f"{endpoint} append") as span:
+        span.rows = len(frame)
+        for month, rows in frame.groupby(_month_keys(frame, time_field), sort=False):
+            partition = os.path.join(_endpoint_dir(endpoint), month)
+            _write_part(partition, rows)
+            if len(_parts(partition)) > COMPACT_PART_THRESHOLD:
+                compact_partition(partition)
+        enforce_size_cap()
+
+
+def upsert(endpoint, frame, time_field, key_field):
+    """Swap the stored rows sharing a key with frame's rows for them, adding the rest.
+
+    Only the months frame's rows fall in are rewritten, so a row must not
+    move to another month, e.g. its time must not change.
+    """
+    if frame.empty:
+        return
+    with perf.span(perf.STORAGE, f"{endpoint} upsert") as span:
+        span.rows = len(frame)
+        for month, rows in frame.groupby(_month_keys(frame, time_field), sort=False):
+            partition = os.path.join(_endpoint_dir(endpoint), month)
+            paths = _parts(partition) if os.path.isdir(partition) else []
+            tables = [table for table in (_read_part(path) for path in paths) if table is not None]
+            if tables:
+                stored = pa.concat_tables(tables, promote_options="default").to_pandas()
+                if key_field in stored.columns:
+                    stored = stored[~stored[key_field].isin(rows[key_field])]
+                rows = pd.concat([stored, rows], ignore_index=True)
+            _write_part(partition, rows)
+            _remove_parts(paths)
+        enforce_size_cap()
+
+
+def replace(endpoint, frame, time_field):
+    """Swap an endpoint's cached history for a fresh full download.
+
+    Also clears the truncated mark.
+    """
+    shutil.rmtree(_endpoint_dir(endpoint), ignore_errors=True)
+    append(endpoint, frame, time_field)
+
+
+def _write_quietly(write, endpoint, frame, time_field):
+    try:
+        write(endpoint, frame, time_field)
+    except OSError:
+        # The disk cache only speeds up cold starts; a failed write costs a refetch
+        pass
+
+
+def submit(write, endpoint, frame, time_field):
+    """Run write(endpoint, frame, time_field), e.g. append or replace, in the background.
+
+    ``frame`` must not be modified afterwards; stores replace their frames
+    rather than mutating them, so passing the store's own frame is safe.
+    """
+    _writer.submit(_write_quietly, write, endpoint, frame, time_field)
+
+
+def flush():
+    """Wait until every submitted write is on disk."""
+    _writer.submit(lambda: None).result()
+
+
+def read_history(endpoint, columns=None):
+    """Load an endpoint's cached history, optionally only some columns.
+
+    Returns None when nothing is cached. Columns the cache lacks are skipped.
+    """
+    with perf.span(perf.STORAGE, f"{endpoint} read") as span:
+        tables = []
+        for partition in _partitions(endpoint):
+            for path in _parts(partition):
+                table = _read_part(path, columns)
+                if table is not None:
+                    tables.append(table)
+        if not tables:
+            return None
+        span.rows = sum(table.num_rows for table in tables)
+        span.bytes = sum(table.nbytes for table in tables)
+        return pa.concat_tables(tables, promote_options="default").to_pandas()
+
+
+def wider_columns(current, requested):
+    """Union of two column selections, where None stands for every column."""
+    if current is None or requested is None:
+        return None
+    return list(dict.fromkeys([*current, *requested]))
+
+
+def truncated(endpoint):
+    """Whether size-cap eviction dropped older months of the endpoint's history."""
+    return os.path.exists(os.path.join(_endpoint_dir(endpoint), TRUNCATED_MARKER))
+
+
+def compact_partition(partition):
+    """Merge a month's part files into one, dropping duplicate rows."""
+    paths = _parts(partition)
+    if len(paths) < 2:
+        return
+    tables = [table for table in (_read_part(path) for path in paths) if table is not None]
+    frame = pa.concat_tables(tables, promote_options="default").to_pandas().drop_duplicates(ignore_index=True)
+    _write_part(partition, frame)
+    _remove_parts(paths)
+
+
+def _remove_parts(paths):
+    for path in paths:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+
+def compact(endpoint=None):
+    """Compact every month partition of one endpoint, or of all endpoints."""
+    endpoints = [endpoint] if endpoint else _cached_endpoints()
+    for name in endpoints:
+        for partition in _partitions(name):
+            compact_partition(partition)
+
+
+def cache_size():
+    """Total bytes used by the cache directory."""
+    total = 0
+    for root, _, files in os.walk(HISTORY_CACHE_DIR):
+        total += sum(os.path.getsize(os.path.join(root, name)) for name in files)
+    return total
+
+
+def enforce_size_cap(max_bytes=MAX_CACHE_BYTES):
+    """Evict the oldest month partitions, across endpoints, until under the cap.
+
+    Endpoints that lose a partition are marked truncated.
+    """
+    size = cache_size()
+    if size <= max_bytes:
+        return
+    partitions = sorted(
+        (os.path.basename(partition), partition)
+        for name in _cached_endpoints()
+        for partition in _partitions(name)
+    )
+    for _, partition in partitions:
+        if size <= max_bytes:
+            break
+        freed = sum(os.path.getsize(path) for path in _parts(partition))
+        shutil.rmtree(partition, ignore_errors=True)
+        with open(os.path.join(os.path.dirname(partition), TRUNCATED_MARKER), "w"):
+            pass
+        size -= freed
+
+
+def _cached_endpoints():
+    if not os.path.isdir(HISTORY_CACHE_DIR):
+        return []
+    return sorted(os.listdir(HISTORY_CACHE_DIR))
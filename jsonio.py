@@ -0,0 +1,19 @@
+"""JSON decoding for backend payloads, with orjson when it is installed.
+
+Kept free of pandas and NumPy: the HTTP client and the live feed decode
+through it, so a page that only shows a few metrics never loads the data
+stack.
+"""
+import json
+
+try:
+    import orjson
+except ImportError:  # optional speed-up
+    orjson = None
+
+
+def loads(content):
+    """Decode a JSON payload, with orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(content)
+    return json.loads(content)
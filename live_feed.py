@@ -0,0 +1,203 @@
+"""Push-based live updates over Server-Sent Events.
+
+A LiveFeed runs one background consumer per process. It subscribes to the
+backend's ``/stream`` endpoint and folds every pushed message into an
+immutable, versioned snapshot per topic that all sessions read. Sections
+showing live topics poll these in-memory snapshots from their own
+st.fragment instead of re-running the whole script and refetching.
+
+Each SSE event is named after its topic (``positions``, ``open_orders``,
+``account_summary``) and carries a JSON message:
+
+    {"op": "snapshot", "data": <full payload>, "ts": <sent, epoch seconds>}
+    {"op": "upsert", "rows": [...], "ts": ...}   rows replace rows with the same key
+    {"op": "delete", "keys": [...], "ts": ...}
+    {"op": "patch", "data": {...}, "ts": ...}    dict topics: update fields
+
+Until a topic's first snapshot arrives, sections fall back to fetching.
+"""
+import statistics
+import threading
+import time
+from collections import deque, namedtuple
+
+import requests
+import urllib3
+
+import jsonio
+
+STREAM_PATH = "stream"
+# Row identity for list topics, used by upsert/delete deltas
+KEY_FIELDS = {
+    "positions": "Symbol",
+    "open_orders": "Order ID",
+}
+CONNECT_TIMEOUT = 5  # seconds
+# The server sends a heartbeat comment at least this often
+READ_TIMEOUT = 30
+RECONNECT_MIN_DELAY = 1
+RECONNECT_MAX_DELAY = 30
+READ_CHUNK_BYTES = 64 * 1024
+LATENCY_SAMPLES = 500  # per topic, for the push-to-screen percentiles
+
+Snapshot = namedtuple("Snapshot", ["version", "data", "sent_at", "received_at"])
+
+
+def iter_events(lines):
+    """Parse SSE lines into (event, data) pairs; comments are heartbeats."""
+    event, data = "message", []
+    for line in lines:
+        if line is None:
+            continue
+        if isinstance(line, bytes):
+            line = line.decode("utf-8")
+        if not line:
+            if data:
+                yield event, "\n".join(data)
+            event, data = "message", []
+        elif line.startswith(":"):
+            continue
+        else:
+            field, _, value = line.partition(":")
+            value = value[1:] if value.startswith(" ") else value
+            if field == "event":
+                event = value
+            elif field == "data":
+                data.append(value)
+
+
+def read_lines(raw):
+    """Yield lines from a raw response as soon as they arrive.
+
+    Response.iter_lines blocks until a whole chunk is filled, which holds
+    back a small event until later ones push it out.
+    """
+    buffer = b""
+    while True:
+        chunk = raw.read1(READ_CHUNK_BYTES, decode_content=True)
+        if not chunk:
+            break
+        *lines, buffer = (buffer + chunk).split(b"\n")
+        for line in lines:
+            yield line.rstrip(b"\r")
+    if buffer:
+        yield buffer
+
+
+def apply_message(current, message, key_field=None):
+    """Return the topic payload after applying one message; never mutates."""
+    op = message.get("op", "snapshot")
+    if op == "snapshot":
+        return message.get("data")
+    if op == "patch":
+        return {**(current or {}), **message.get("data", {})}
+    if key_field is None:
+        raise ValueError(f"'{op}' needs a key field")
+    rows = {row.get(key_field): row for row in current or []}
+    if op == "upsert":
+        for row in message.get("rows", []):
+            rows[row.get(key_field)] = row
+    elif op == "delete":
+        for key in message.get("keys", []):
+            rows.pop(key, None)
+    else:
+        raise ValueError(f"Unknown op '{op}'")
+    return list(rows.values())
+
+
+class LiveFeed:
+    """Background SSE consumer publishing versioned snapshots per topic."""
+
+    def __init__(self, url, topics):
+        self.url = url
+        self.topics = list(topics)
+        self.connected = False
+        self.last_error = None
+        self._snapshots = {}
+        self._latencies = {topic: deque(maxlen=LATENCY_SAMPLES) for topic in self.topics}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="live-feed", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    def snapshot(self, topic):
+        """Latest Snapshot for a topic, or None before its first message."""
+        with self._lock:
+            return self._snapshots.get(topic)
+
+    def apply(self, topic, message):
+        """Fold one message into the topic's snapshot and bump its version."""
+        with self._lock:
+            current = self._snapshots.get(topic)
+            if current is None and message.get("op", "snapshot") != "snapshot":
+                # A delta without a base is meaningless; wait for a snapshot
+                return
+            data = apply_message(current.data if current else None, message, KEY_FIELDS.get(topic))
+            self._snapshots[topic] = Snapshot(
+                version=(current.version + 1) if current else 1,
+                data=data,
+                sent_at=message.get("ts"),
+                received_at=time.time(),
+            )
+
+    def record_render(self, topic, snapshot):
+        """Record how long a snapshot took from the server to the screen.
+
+        Returns the latency in seconds. Uses the server's send time when the
+        message carried one, else the time the consumer received it.
+        """
+        latency = time.time() - (snapshot.sent_at or snapshot.received_at)
+        with self._lock:
+            self._latencies[topic].append(latency)
+        return latency
+
+    def latency_stats(self):
+        """(p50, p95, samples) of push-to-screen latency in seconds, all topics."""
+        with self._lock:
+            samples = [value for values in self._latencies.values() for value in values]
+        if not samples:
+            return None
+        if len(samples) == 1:
+            return samples[0], samples[0], 1
+        cuts = statistics.quantiles(samples, n=20, method="inclusive")
+        p50, p95 = cuts[9], cuts[18]
+        return p50, p95, len(samples)
+
+    def _run(self):
+        delay = RECONNECT_MIN_DELAY
+        session = requests.Session()
+        while not self._stop.is_set():
+            try:
+                with session.get(
+                    self.url,
+                    params={"topics": ",".join(self.topics)},
+                    headers={"Accept": "text/event-stream"},
+                    stream=True,
+                    timeout=(CONNECT_TIMEOUT, READ_TIMEOUT),
+                ) as response:
+                    response.raise_for_status()
+                    self.connected = True
+                    delay = RECONNECT_MIN_DELAY
+                    for event, data in iter_events(read_lines(response.raw)):
+                        if self._stop.is_set():
+                            break
+                        if event in self.topics:
+                            self.apply(event, jsonio.loads(data))
+            # read_lines reads urllib3's raw stream, so a stalled or dropped
+            # connection raises urllib3's errors, not requests'
+            except (requests.exceptions.RequestException, urllib3.exceptions.HTTPError, ValueError) as e:
+                self.last_error = e
+            finally:
+                self.connected = False
+            # Snapshots stay readable while we back off and reconnect
+            self._stop.wait(delay)
+            delay = min(delay * 2, RECONNECT_MAX_DELAY)
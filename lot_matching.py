@@ -0,0 +1,218 @@
+"""Closed positions rebuilt from raw trade fills by lot matching.
+
+The backend's closed_positions payload is precomputed server-side, slowly,
+over a range the dashboard cannot change. match() derives the same columns
+from trade_history instead: every closing fill is paired with the lots it
+closes, first in first out or at the position's average cost, giving entry
+and exit prices, realized PNL, fees and holding time, for any range.
+
+Both methods work on all symbols at once with NumPy, without a loop per
+fill. Each fill is split into the quantity that opens or adds to the long
+or short exposure and the quantity that reduces it; a fill that flips the
+position does both. Quantities are matched as integers, so lots close
+exactly.
+
+  FIFO      On each side, laid end to end along the cumulative quantity
+            axis, lots and closes line up exactly as FIFO pairs them: the
+            pairs are the intervals between the two sets of cumulative sums.
+  AVERAGE   A close reduces every open lot in proportion, so the entry
+            price, fee and time of a close are running averages weighted
+            by each lot's surviving share, kept in log space so that
+            positions that never go flat stay finite.
+
+Assumes one-way position mode, and that every symbol is flat before its
+first fill in the history.
+"""
+import numpy as np
+import pandas as pd
+
+import perf
+
+FIFO = "fifo"
+AVERAGE = "average"
+METHODS = (FIFO, AVERAGE)
+QUANTITY_DECIMALS = 8  # quantities are matched as integers of this precision
+HOLDING_TIME = "Holding Time"
+COLUMNS = [
+    "Symbol", "Side", "Size", "Entry Price", "Exit Price", "PNL", "Fee", "Entry Time", "Exit Time", HOLDING_TIME,
+]
+# Log-space block of the average-cost weights; e^512 leaves room for price,
+# quantity and epoch-ms factors within float64
+LOG_BLOCK = 512.0
+REQUIRED_COLUMNS = ["Symbol", "Side", "Price", "Quantity", "Time"]
+
+
+class _Fills:
+    """trade_history columns as arrays, sorted by symbol, time and trade id."""
+
+    def __init__(self, trades):
+        codes, self.symbols = pd.factorize(trades["Symbol"].astype("string"))
+        time = trades["Time"].to_numpy(dtype="int64")
+        keys = [time, codes]
+        if "Trade ID" in trades.columns:
+            keys.insert(0, trades["Trade ID"].to_numpy(dtype="float64", na_value=np.nan))
+        order = np.lexsort(keys)
+        quantity = trades["Quantity"].to_numpy(dtype="float64")[order]
+        buy = (trades["Side"].astype("string").str.upper() == "BUY").to_numpy(dtype=bool, na_value=False)[order]
+        self.codes = codes[order]
+        self.time = time[order]
+        self.price = trades["Price"].to_numpy(dtype="float64")[order]
+        commission = trades["Commission"].to_numpy(dtype="float64", na_value=0.0)[order] \
+            if "Commission" in trades.columns else np.zeros(len(order))
+
+        total = np.abs(quantity).sum()
+        decimals = QUANTITY_DECIMALS
+        if total > 0:
+            # Keep every cumulative sum within int64
+            decimals = min(decimals, int(np.floor(np.log10(2.0 ** 62 / total))))
+        self.scale = 10.0 ** decimals
+        self.units = np.rint(np.abs(quantity) * self.scale).astype("int64")
+        with np.errstate(divide="ignore", invalid="ignore"):
+            self.unit_fee = np.where(self.units > 0, commission / self.units, 0.0)
+
+        signed = np.where(buy, self.units, -self.units)
+        starts = np.flatnonzero(np.r_[True, self.codes[1:] != self.codes[:-1]])
+        self.group_end = np.r_[starts[1:], len(order)] - 1  # last fill of each symbol
+        running = np.cumsum(signed)
+        # Position after each fill, per symbol
+        self.after = running - np.repeat(running[starts] - signed[starts], np.diff(np.r_[starts, len(order)]))
+        self.before = self.after - signed
+
+    def side(self, direction):
+        """(exposure before, exposure after, opened, closed) for +1 long, -1 short."""
+        before = np.maximum(direction * self.before, 0)
+        after = np.maximum(direction * self.after, 0)
+        change = after - before
+        return before, after, np.maximum(change, 0), np.maximum(-change, 0)
+
+
+def _fifo_pairs(fills, direction):
+    """(entry fill, exit fill, units) of every FIFO pair on one side."""
+    _, after, opened, closed = fills.side(direction)
+    open_fill = np.flatnonzero(opened)
+    if not len(open_fill):
+        return open_fill, open_fill, opened[open_fill]
+    close_fill = np.flatnonzero(closed)
+    # What is still open at each symbol's end is closed by a virtual fill
+    # (-1), so every symbol's opens and closes end at the same cumulative sum
+    residual = after[fills.group_end]
+    still_open = residual > 0
+    close_fill = np.r_[close_fill, np.full(still_open.sum(), -1)]
+    close_units = np.r_[closed[closed > 0], residual[still_open]]
+    close_code = np.r_[fills.codes[closed > 0], fills.codes[fills.group_end][still_open]]
+    order = np.lexsort((close_fill < 0, close_code))
+    close_fill, close_units = close_fill[order], close_units[order]
+
+    open_ends = np.cumsum(opened[open_fill])
+    close_ends = np.cumsum(close_units)
+    # Both are increasing: a stable sort merges the two runs
+    ends = np.sort(np.r_[open_ends, close_ends], kind="stable")
+    ends = ends[np.r_[True, ends[1:] != ends[:-1]]]
+    starts = np.r_[0, ends[:-1]]
+    entry = open_fill[np.searchsorted(open_ends, starts, side="right")]
+    exit_ = close_fill[np.searchsorted(close_ends, starts, side="right")]
+    closed_pair = exit_ >= 0
+    return entry[closed_pair], exit_[closed_pair], (ends - starts)[closed_pair]
+
+
+def _grouped_cumsum(values, groups):
+    return pd.DataFrame(values).groupby(groups, sort=False).cumsum().to_numpy()
+
+
+def _average_closes(fills, direction):
+    """(exit fill, units, entry price, entry fee per unit, entry time) of every close on one side."""
+    before, after, opened, closed = fills.side(direction)
+    events = np.flatnonzero((opened > 0) | (closed > 0))
+    if not len(events):
+        return events, closed[events], np.zeros(0), np.zeros(0), fills.time[events]
+    before, after, opened, closed = before[events], after[events], opened[events], closed[events]
+    # Times relative to the first event keep the weighted sums small
+    time = fills.time[events] - fills.time[events[0]]
+    episode = np.cumsum((before == 0) & (opened > 0))
+    # u: log of how much every earlier lot of the episode has shrunk; a
+    # lot's weight is its quantity times e^u at its opening
+    shrink = np.zeros(len(events))
+    partial = (closed > 0) & (after > 0)
+    shrink[partial] = np.log(before[partial] / after[partial])
+    u = _grouped_cumsum(shrink, episode)[:, 0] - shrink
+    block = np.floor(u / LOG_BLOCK)
+    new_group = np.r_[True, (episode[1:] != episode[:-1]) | (block[1:] != block[:-1])]
+    group = np.cumsum(new_group) - 1
+    weight = opened * np.exp(u - block * LOG_BLOCK)
+    sums = _grouped_cumsum(
+        np.column_stack([
+            weight,
+            weight * fills.price[events],
+            weight * fills.unit_fee[events],
+            weight * time,
+        ]),
+        group,
+    )
+    # A block that continues an episode starts from the previous block's
+    # totals, rescaled; episodes rarely span more than one
+    firsts = np.flatnonzero(new_group)
+    continued = np.flatnonzero(np.r_[False, episode[firsts[1:]] == episode[firsts[:-1]]])
+    if len(continued):
+        carry = np.zeros((len(firsts), sums.shape[1]))
+        totals = sums[np.r_[firsts[1:], len(events)] - 1]
+        for index in continued:
+            factor = np.exp((block[firsts[index - 1]] - block[firsts[index]]) * LOG_BLOCK)
+            carry[index] = (totals[index - 1] + carry[index - 1]) * factor
+        sums = sums + carry[group]
+    closes = closed > 0
+    sums = sums[closes]
+    weights = sums[:, 0]
+    entry_time = (sums[:, 3] / weights).round().astype("int64") + fills.time[events[0]]
+    return events[closes], closed[closes], sums[:, 1] / weights, sums[:, 2] / weights, entry_time
+
+
+def _frame(fills, direction, exit_fill, units, entry_price, entry_unit_fee, entry_time):
+    size = units / fills.scale
+    exit_price = fills.price[exit_fill]
+    exit_time = fills.time[exit_fill]
+    return pd.DataFrame({
+        "Symbol": pd.Categorical(fills.symbols[fills.codes[exit_fill]]),
+        "Side": "LONG" if direction > 0 else "SHORT",
+        "Size": direction * size,
+        "Entry Price": entry_price,
+        "Exit Price": exit_price,
+        "PNL": direction * (exit_price - entry_price) * size,
+        "Fee": units * (entry_unit_fee + fills.unit_fee[exit_fill]),
+        "Entry Time": entry_time,
+        "Exit Time": exit_time,
+        HOLDING_TIME: pd.to_timedelta(exit_time - entry_time, unit="ms"),
+    })
+
+
+def match(trades, method=FIFO):
+    """Closed positions of a trade_history frame, in closed_positions' columns.
+
+    FIFO gives one row per closing fill and lot it closes; AVERAGE one row
+    per closing fill, at the average entry price, fee and time of the
+    position it reduces. Size is negative for shorts; PNL excludes Fee.
+    Rows are in exit order.
+    """
+    if method not in METHODS:
+        raise ValueError(f"Unknown lot matching method: {method!r}")
+    if any(column not in trades.columns for column in REQUIRED_COLUMNS):
+        return pd.DataFrame(columns=COLUMNS)
+    trades = trades.dropna(subset=REQUIRED_COLUMNS)
+    if trades.empty:
+        return pd.DataFrame(columns=COLUMNS)
+    with perf.span(perf.TRANSFORM, f"lot_matching {method}") as span:
+        fills = _Fills(trades)
+        frames = []
+        for direction in (1, -1):
+            if method == FIFO:
+                entry, exit_fill, units = _fifo_pairs(fills, direction)
+                frames.append(_frame(
+                    fills, direction, exit_fill, units, fills.price[entry], fills.unit_fee[entry], fills.time[entry],
+                ))
+            else:
+                frames.append(_frame(fills, direction, *_average_closes(fills, direction)))
+        closed = pd.concat(frames, ignore_index=True)
+        closed["Symbol"] = closed["Symbol"].astype("category")
+        closed["Side"] = closed["Side"].astype("category")
+        closed = closed.sort_values(["Exit Time", "Entry Time"], ignore_index=True, kind="stable")
+        span.rows = len(closed)
+    return closed
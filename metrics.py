@@ -0,0 +1,180 @@
+"""Risk and performance metrics of a PNL history, vectorized.
+
+prepare() reduces a pnl_analytics, trade_analytics or trade_history frame
+once per data version to what every window length shares: one PNL per
+calendar day (days without trades count as 0), the equity curve and its
+drawdowns, and trade statistics overall and per symbol. rolling() then
+derives the rolling Sharpe and Sortino ratios of the daily series for one
+window with pandas rolling sums, which takes milliseconds, so switching
+windows is cheap when prepare()'s result is cached.
+
+There is no account equity in these payloads, so the ratios are of daily
+PNL in USDT rather than of returns: mean over standard (or downside)
+deviation, annualized by the square root of PERIODS_PER_YEAR.
+"""
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+import formatting
+import perf
+
+PERIODS_PER_YEAR = 365  # crypto futures trade every day
+WINDOWS = [7, 14, 30, 60, 90]  # rolling window lengths offered, in days
+DEFAULT_WINDOW = 30
+
+PNL_FIELD = "PNL"
+SYMBOL_FIELD = "Symbol"
+# Column ordering each source in time
+TIME_FIELDS = {
+    "pnl_analytics": "Date",
+    "trade_analytics": "Timestamp",
+    "trade_history": "Time",
+}
+SUMMARY_COLUMNS = [
+    "Trades", "Win Rate", "Total PNL", "Gross Profit", "Gross Loss", "Profit Factor", "Expectancy",
+    "Average Win", "Average Loss", "Max Drawdown",
+]
+
+Performance = namedtuple("Performance", ["daily", "drawdown", "summary", "by_symbol"])
+
+
+def source_columns(endpoint):
+    """Columns prepare() reads from an endpoint's frame."""
+    return [TIME_FIELDS[endpoint], SYMBOL_FIELD, PNL_FIELD]
+
+
+def daily_pnl(frame, time_field, tz=formatting.INDIAN_TZ):
+    """PNL summed per local calendar day, every day from the first to the last."""
+    times = frame[time_field]
+    if pd.api.types.is_datetime64_any_dtype(times) and times.dt.tz is None:
+        days = times.dt.normalize()  # already calendar dates, e.g. pnl_analytics
+    else:
+        days = formatting.to_local_datetime(times, unit="ms", tz=tz).dt.tz_localize(None).dt.normalize()
+    pnl = pd.to_numeric(frame[PNL_FIELD], errors="coerce")
+    daily = pnl.groupby(days.to_numpy()).sum()
+    if daily.empty:
+        return pd.Series(dtype="float64", name=PNL_FIELD)
+    daily.index = pd.DatetimeIndex(daily.index, name="Date")
+    return daily.asfreq("D", fill_value=0.0).rename(PNL_FIELD)
+
+
+def drawdown(daily):
+    """Equity, drawdown from the running peak and days since that peak, per day.
+
+    Equity starts from 0, so losses before the first gain are drawdown too.
+    """
+    equity = daily.cumsum()
+    peak = np.maximum.accumulate(np.maximum(equity.to_numpy(), 0.0))
+    under = equity.to_numpy() - peak
+    position = np.arange(len(equity))
+    # Position of the last day at a peak, -1 before the first one
+    last_peak = np.maximum.accumulate(np.where(under >= 0, position, -1))
+    return pd.DataFrame({"Equity": equity, "Drawdown": under, "Duration": position - last_peak}, index=daily.index)
+
+
+def _trade_stats(pnl, keys=None):
+    """SUMMARY_COLUMNS of pnl in order, overall (keys None) or per key."""
+    frame = pd.DataFrame({
+        "pnl": pnl,
+        "profit": np.maximum(pnl, 0.0),
+        "loss": np.minimum(pnl, 0.0),
+        "win": pnl > 0,
+        "losing": pnl < 0,
+    })
+    if keys is None:
+        keys = np.zeros(len(frame), dtype="int8")
+    frame["key"] = keys
+    grouped = frame.groupby("key", observed=True, sort=False)
+    sums = grouped[["pnl", "profit", "loss", "win", "losing"]].sum()
+    count = grouped.size()
+    # Max drawdown of the cumulative PNL, in order, within each key
+    equity = grouped["pnl"].cumsum()
+    peak = equity.clip(lower=0).groupby(frame["key"], observed=True).cummax()
+    max_drawdown = (equity - peak).groupby(frame["key"], observed=True, sort=False).min()
+    with np.errstate(divide="ignore", invalid="ignore"):
+        stats = pd.DataFrame({
+            "Trades": count,
+            "Win Rate": sums["win"] / count * 100,
+            "Total PNL": sums["pnl"],
+            "Gross Profit": sums["profit"],
+            "Gross Loss": sums["loss"],
+            "Profit Factor": sums["profit"] / sums["loss"].abs(),
+            "Expectancy": sums["pnl"] / count,
+            "Average Win": sums["profit"] / sums["win"],
+            "Average Loss": sums["loss"] / sums["losing"],
+            "Max Drawdown": max_drawdown,
+        })
+    return stats[SUMMARY_COLUMNS]
+
+
+def trade_summary(pnl):
+    """SUMMARY_COLUMNS of a PNL series as a Series; Profit Factor is inf without losses."""
+    values = pd.to_numeric(pnl, errors="coerce").dropna().to_numpy(dtype="float64")
+    if not len(values):
+        return pd.Series(np.nan, index=SUMMARY_COLUMNS)
+    return _trade_stats(values).iloc[0]
+
+
+def symbol_breakdown(frame):
+    """SUMMARY_COLUMNS per symbol of a time-ordered frame, best total first."""
+    if SYMBOL_FIELD not in frame.columns:
+        return None
+    ordered = frame[[SYMBOL_FIELD, PNL_FIELD]].dropna()
+    if ordered.empty:
+        return None
+    stats = _trade_stats(ordered[PNL_FIELD].to_numpy(dtype="float64"), ordered[SYMBOL_FIELD].to_numpy())
+    stats.index.name = SYMBOL_FIELD
+    return stats.sort_values("Total PNL", ascending=False)
+
+
+def prepare(endpoint, frame):
+    """Window-independent Performance of an endpoint's typed frame."""
+    time_field = TIME_FIELDS[endpoint]
+    with perf.span(perf.TRANSFORM, f"metrics {endpoint}") as span:
+        span.rows = len(frame)
+        # Drawdowns of the trade statistics follow time order
+        frame = frame.dropna(subset=[time_field, PNL_FIELD]).sort_values(time_field, kind="stable")
+        daily = daily_pnl(frame, time_field)
+        return Performance(
+            daily=daily,
+            drawdown=drawdown(daily),
+            summary=trade_summary(frame[PNL_FIELD]),
+            by_symbol=symbol_breakdown(frame),
+        )
+
+
+def ratios(daily):
+    """(Sharpe, Sortino) of a whole daily PNL series, annualized."""
+    values = daily.to_numpy(dtype="float64")
+    if len(values) < 2:
+        return np.nan, np.nan
+    mean = values.mean()
+    std = values.std(ddof=1)
+    downside = np.sqrt(np.mean(np.minimum(values, 0.0) ** 2))
+    scale = np.sqrt(PERIODS_PER_YEAR)
+    return (
+        mean / std * scale if std > 0 else np.nan,
+        mean / downside * scale if downside > 0 else np.nan,
+    )
+
+
+def rolling(daily, window):
+    """Rolling annualized Sharpe and Sortino over ``window`` days, per day.
+
+    Undefined (NaN) until a full window, and where the window has no
+    variation or no losing day.
+    """
+    with perf.span(perf.TRANSFORM, f"metrics rolling {window}d") as span:
+        span.rows = len(daily)
+        windowed = daily.rolling(window, min_periods=window)
+        mean = windowed.mean()
+        std = windowed.std()
+        downside = np.sqrt((np.minimum(daily, 0.0) ** 2).rolling(window, min_periods=window).mean())
+        scale = np.sqrt(PERIODS_PER_YEAR)
+        result = pd.DataFrame({
+            "Sharpe": mean / std.where(std > 0) * scale,
+            "Sortino": mean / downside.where(downside > 0) * scale,
+        })
+    return result
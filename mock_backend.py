@@ -0,0 +1,340 @@
+"""Local mock of the dashboard backend, for development and benchmarks.
+
+Implements every endpoint app.py and app1.py call, with seeded synthetic
+data, so runs are reproducible. History endpoints hold ``rows`` records
+(1k to 1M are practical) and honour the ``since`` cursor the incremental
+sync sends. ``/bundle?resources=a,b`` answers several endpoints in one
+response, unless started with --no-bundle. ``/stream`` serves the live push
+feed from mock_feed. --latency adds a fixed delay to every request, to
+stand in for a backend in another region. Table endpoints answer with an
+Arrow IPC stream or msgpack instead of JSON when the Accept header prefers
+them (msgpack only when it is installed), unless started with --json-only.
+
+Usage: python mock_backend.py [--rows 100000] [--port 5058] [--latency 0.08]
+Then point a dashboard at it: DASHBOARD_API_SERVER=http://127.0.0.1:5058
+"""
+import argparse
+import json
+import random
+import threading
+import time
+
+import numpy as np
+import pyarrow as pa
+from flask import Flask, Response, abort, request
+from werkzeug.serving import WSGIRequestHandler, make_server
+
+import mock_feed
+import transport
+
+try:
+    import orjson
+except ImportError:  # optional speed-up
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # optional second transport
+    msgpack = None
+
+DEFAULT_PORT = 5058
+DEFAULT_ROWS = 10_000
+OPEN_ORDER_ROWS = 50
+PNL_DAYS = 730
+SYMBOLS = ["BTCUSDT", "ETHUSDT", "SOLUSDT", "BNBUSDT", "XRPUSDT", "ADAUSDT", "DOGEUSDT", "LINKUSDT"]
+TRADERS = ["alpha", "beta", "gamma", "delta"]
+ORDER_TYPES = ["LIMIT", "MARKET", "STOP_MARKET", "TAKE_PROFIT_MARKET"]
+ORDER_STATUSES = ["FILLED", "CANCELED", "NEW", "PARTIALLY_FILLED", "EXPIRED"]
+# Newest history record is this long before the server started
+HISTORY_SPAN_MS = 365 * 86_400_000
+# Endpoints that accept ``since`` and the field it filters on
+CURSOR_FIELDS = {
+    "trade_history": "Time",
+    "order_history": "Order Time",
+    "position_history": "Exit Time",
+}
+
+
+def _dumps(value):
+    if orjson is not None:
+        return orjson.dumps(value)
+    return json.dumps(value).encode()
+
+
+ENCODE_CHUNK_ROWS = 50_000
+
+
+def _records(columns, start=0, stop=None):
+    """Rows start:stop of a column name -> array mapping, as JSON-ready dicts."""
+    names = list(columns)
+    values = [np.asarray(columns[name])[start:stop].tolist() for name in names]
+    return [dict(zip(names, row)) for row in zip(*values)]
+
+
+def _row_count(columns):
+    return len(next(iter(columns.values())))
+
+
+def _encode(payload, start=0):
+    """JSON for a payload, rows from ``start`` on for column tables.
+
+    Tables are encoded a chunk of rows at a time so a million-row endpoint
+    never exists as a million dicts at once.
+    """
+    if not _is_table(payload):
+        return _dumps(payload)
+    rows = _row_count(payload)
+    chunks = [
+        _dumps(_records(payload, offset, offset + ENCODE_CHUNK_ROWS))[1:-1]
+        for offset in range(start, rows, ENCODE_CHUNK_ROWS)
+    ]
+    return b"[" + b",".join(chunk for chunk in chunks if chunk) + b"]"
+
+
+def _is_table(payload):
+    return isinstance(payload, dict) and all(isinstance(v, np.ndarray) for v in payload.values())
+
+
+def encode_arrow(columns, start=0):
+    """Arrow IPC stream of a column table, rows from ``start`` on.
+
+    String columns are dictionary-encoded: each label travels once and
+    decodes straight into a categorical.
+    """
+    arrays = {}
+    for name, values in columns.items():
+        array = pa.array(values[start:])
+        if pa.types.is_string(array.type) or pa.types.is_large_string(array.type):
+            array = array.dictionary_encode()
+        arrays[name] = array
+    table = pa.table(arrays)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def encode_msgpack(columns, start=0):
+    """msgpack array of records for a column table, rows from ``start`` on."""
+    return msgpack.packb(_records(columns, start))
+
+
+def _table(columns):
+    return {name: np.asarray(values) for name, values in columns.items()}
+
+
+def _times(rng, rows, now_ms):
+    return np.sort(rng.integers(now_ms - HISTORY_SPAN_MS, now_ms, rows))
+
+
+def _orders(rng, rows, now_ms, statuses=ORDER_STATUSES):
+    price = rng.uniform(0.1, 60_000, rows).round(2)
+    quantity = rng.uniform(0.001, 10, rows).round(3)
+    status = rng.choice(statuses, rows)
+    return _table({
+        "Order ID": np.arange(rows) + 1_000_000,
+        "Symbol": rng.choice(SYMBOLS, rows),
+        "Side": rng.choice(["BUY", "SELL"], rows),
+        "Type": rng.choice(ORDER_TYPES, rows),
+        "Status": status,
+        "Price": price,
+        "Quantity": quantity,
+        "Executed Qty": np.where(status == "FILLED", quantity, 0.0),
+        "Order Time": _times(rng, rows, now_ms),
+    })
+
+
+def _trades(rng, rows, now_ms):
+    return _table({
+        "Symbol": rng.choice(SYMBOLS, rows),
+        "Side": rng.choice(["BUY", "SELL"], rows),
+        "Trade ID": np.arange(rows) + 5_000_000,
+        "Order ID": rng.integers(1_000_000, 1_000_000 + rows, rows),
+        "Price": rng.uniform(0.1, 60_000, rows).round(2),
+        "Quantity": rng.uniform(0.001, 10, rows).round(3),
+        "PNL": rng.normal(0, 25, rows).round(2),
+        "Commission": rng.uniform(0, 2, rows).round(4),
+        "Time": _times(rng, rows, now_ms),
+    })
+
+
+def _closed_positions(rng, rows, now_ms):
+    entry_price = rng.uniform(0.1, 60_000, rows).round(2)
+    exit_time = _times(rng, rows, now_ms)
+    return _table({
+        "Symbol": rng.choice(SYMBOLS, rows),
+        "Side": rng.choice(["LONG", "SHORT"], rows),
+        "Size": rng.uniform(-10, 10, rows).round(3),
+        "Entry Price": entry_price,
+        "Exit Price": (entry_price * rng.normal(1, 0.02, rows)).round(2),
+        "PNL": rng.normal(0, 40, rows).round(2),
+        "Fee": rng.uniform(0, 3, rows).round(4),
+        "Entry Time": exit_time - rng.integers(60_000, 7 * 86_400_000, rows),
+        "Exit Time": exit_time,
+    })
+
+
+def _positions(rng, now_ms):
+    count = len(SYMBOLS)
+    size = rng.uniform(-5, 5, count).round(3)
+    entry_price = rng.uniform(0.1, 60_000, count).round(2)
+    mark_price = (entry_price * rng.normal(1, 0.01, count)).round(2)
+    pnl = ((mark_price - entry_price) * size).round(2)
+    return _table({
+        "Symbol": SYMBOLS,
+        "Side": np.where(size > 0, "LONG", "SHORT"),
+        "Size": size,
+        "Amount": (np.abs(size) * mark_price).round(2),
+        "Entry Price": entry_price,
+        "Mark Price": mark_price,
+        "PNL": pnl,
+        "Current PNL": pnl,
+        "Leverage": rng.choice([5, 10, 20], count),
+        "Entry Time": now_ms - rng.integers(0, 30 * 86_400_000, count),
+    })
+
+
+def generate(rows=DEFAULT_ROWS, seed=0):
+    """Synthetic payload for every endpoint, reproducible for a seed.
+
+    Tables are column name -> NumPy array mappings, sorted by time.
+    """
+    rng = np.random.default_rng(seed)
+    now_ms = int(time.time() * 1000)
+    positions = _positions(rng, now_ms)
+    days = np.datetime64("today") - np.arange(PNL_DAYS)[::-1]
+    return {
+        "account_summary": {
+            "Balance": 10_000.0,
+            "Unrealized PNL": round(float(positions["PNL"].sum()), 2),
+            "Margin Balance": 10_250.0,
+            "Available Balance": 7_500.0,
+        },
+        "positions": positions,
+        "open_positions": _table({
+            "Trader": rng.choice(TRADERS, 20),
+            "Symbol": rng.choice(SYMBOLS, 20),
+            "Size": rng.uniform(0.01, 5, 20).round(3),
+        }),
+        "open_orders": _orders(rng, OPEN_ORDER_ROWS, now_ms, statuses=["NEW", "PARTIALLY_FILLED"]),
+        "order_history": _orders(rng, rows, now_ms),
+        "trade_history": _trades(rng, rows, now_ms),
+        "position_history": _closed_positions(rng, rows, now_ms),
+        "closed_positions": _closed_positions(rng, rows, now_ms),
+        "pnl_analytics": _table({
+            "Date": days.astype(str),
+            "PNL": rng.normal(20, 150, PNL_DAYS).round(2),
+        }),
+        "trade_analytics": _table({
+            "Symbol": rng.choice(SYMBOLS, rows),
+            "PNL": rng.normal(0, 25, rows).round(2),
+            "Timestamp": _times(rng, rows, now_ms),
+        }),
+    }
+
+
+def create_app(rows=DEFAULT_ROWS, seed=0, feed_interval=mock_feed.DEFAULT_INTERVAL, bundle=True, latency=0.0,
+               binary=True):
+    """Flask app serving generated data; payloads are encoded once up front.
+
+    ``latency`` seconds are slept before answering each request. With
+    ``binary`` off every endpoint answers JSON whatever the client accepts.
+    """
+    app = Flask(__name__)
+    payloads = generate(rows, seed)
+    encoded = {name: _encode(payload) for name, payload in payloads.items()}
+    offers = [transport.JSON]
+    if binary:
+        offers += [transport.ARROW_STREAM] + ([transport.MSGPACK] if msgpack is not None else [])
+    # Binary bodies of whole tables, encoded on first request
+    binary_bodies = {}
+    feed = mock_feed.FeedState()
+
+    if latency:
+        @app.before_request
+        def delay():
+            time.sleep(latency)
+
+    if bundle:
+        @app.route("/bundle")
+        def serve_bundle():
+            requested = request.args.get("resources", "").split(",")
+            parts = [
+                b'"%s":%s' % (name.encode(), encoded[name])
+                for name in dict.fromkeys(requested) if name in encoded
+            ]
+            return Response(b"{" + b",".join(parts) + b"}", mimetype="application/json")
+
+    @app.route("/<endpoint>")
+    def serve_endpoint(endpoint):
+        if endpoint not in encoded:
+            abort(404)
+        payload = payloads[endpoint]
+        start = 0
+        since = request.args.get("since", type=int)
+        if since is not None and endpoint in CURSOR_FIELDS:
+            # Records are sorted by the cursor field; ``since`` is inclusive
+            start = int(np.searchsorted(payload[CURSOR_FIELDS[endpoint]], since, side="left"))
+        media_type = request.accept_mimetypes.best_match(offers, default=transport.JSON)
+        if media_type == transport.JSON or not _is_table(payload):
+            return Response(encoded[endpoint] if not start else _encode(payload, start), mimetype=transport.JSON)
+        encode = encode_arrow if media_type == transport.ARROW_STREAM else encode_msgpack
+        if start:
+            body = encode(payload, start)
+        else:
+            if (endpoint, media_type) not in binary_bodies:
+                binary_bodies[endpoint, media_type] = encode(payload)
+            body = binary_bodies[endpoint, media_type]
+        return Response(body, mimetype=media_type)
+
+    @app.route("/stream")
+    def stream():
+        requested = request.args.get("topics", ",".join(mock_feed.TOPICS)).split(",")
+        topics = [topic for topic in requested if topic in mock_feed.TOPICS]
+
+        def events():
+            for topic in topics:
+                yield mock_feed.encode_event(topic, feed.snapshot(topic))
+            while topics:
+                time.sleep(feed_interval)
+                topic = random.choice(topics)
+                yield mock_feed.encode_event(topic, feed.delta(topic))
+
+        return Response(events(), mimetype="text/event-stream", headers={"Cache-Control": "no-cache"})
+
+    return app
+
+
+class _QuietRequestHandler(WSGIRequestHandler):
+    def log_request(self, *args, **kwargs):
+        pass
+
+
+def serve(app, port=0, host="127.0.0.1", threaded=True):
+    """Run app on a background thread without request logging; returns the server.
+
+    Port 0 picks a free port (server.server_port). With ``threaded`` off
+    requests are answered one at a time, like a single sync worker.
+    """
+    server = make_server(host, port, app, threaded=threaded, request_handler=_QuietRequestHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--rows", type=int, default=DEFAULT_ROWS, help="records per history endpoint")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--no-bundle", action="store_true", help="serve without the /bundle route")
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every request")
+    parser.add_argument("--json-only", action="store_true", help="never answer with Arrow or msgpack")
+    args = parser.parse_args()
+    app = create_app(args.rows, args.seed, bundle=not args.no_bundle, latency=args.latency, binary=not args.json_only)
+    print(f"Mock backend with {args.rows:,} rows per history endpoint on http://{args.host}:{args.port}")
+    make_server(args.host, args.port, app, threaded=True).serve_forever()
+
+
+if __name__ == "__main__":
+    main()
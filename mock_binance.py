@@ -0,0 +1,250 @@
+"""Local stub of the Binance futures REST endpoints binance_ingest calls.
+
+Answers /fapi/v2/account, /fapi/v2/positionRisk, /fapi/v1/openOrders,
+/fapi/v1/userTrades and /fapi/v1/allOrders with seeded synthetic data in
+Binance's shapes (numbers as strings, epoch-ms times), checks each request's
+HMAC signature, and meters request weight the way Binance does: a
+fixed-window counter per --window seconds, reported in X-MBX-USED-WEIGHT-1M
+on every response, with 429 and Retry-After once --limit is exceeded.
+userTrades pages by ``fromId`` and allOrders by ``orderId``; without them
+the most recent ``limit`` records come back.
+
+Usage: python mock_binance.py [--trades 20000] [--port 5059] [--limit 2400] [--window 60]
+Then: BINANCE_FAPI_URL=http://127.0.0.1:5059 BINANCE_API_KEY=stub-key BINANCE_API_SECRET=stub-secret
+"""
+import argparse
+import hashlib
+import hmac
+import math
+import threading
+import time
+
+import numpy as np
+from flask import Flask, abort, jsonify, request
+from werkzeug.serving import make_server
+
+import binance_ingest
+import mock_backend
+
+DEFAULT_PORT = 5059
+DEFAULT_TRADES = 20_000
+API_KEY = "stub-key"
+API_SECRET = "stub-secret"
+SYMBOLS = mock_backend.SYMBOLS
+POSITION_SYMBOLS = SYMBOLS[:5]
+DEFAULT_PAGE = 500
+MAX_PAGE = 1000
+WEIGHTS = {path: weight for path, weight in binance_ingest.ROUTES.values()}
+
+
+class WeightMeter:
+    """Fixed-window request weight counter, like Binance's per-minute one."""
+
+    def __init__(self, limit, window):
+        self.limit = limit
+        self.window = window
+        self.requests = 0
+        self.rejected = 0
+        self.peak = 0  # highest weight used in any window
+        self._window_index = None
+        self._used = 0
+        self._lock = threading.Lock()
+
+    def charge(self, weight):
+        """Count a request; returns (used weight, seconds to wait or None)."""
+        with self._lock:
+            now = time.time()
+            index = int(now // self.window)
+            if index != self._window_index:
+                self._window_index, self._used = index, 0
+            self.requests += 1
+            self._used += weight
+            self.peak = max(self.peak, self._used)
+            if self._used > self.limit:
+                self.rejected += 1
+                return self._used, math.ceil((index + 1) * self.window - now)
+            return self._used, None
+
+
+def _strings(values, decimals):
+    return [f"{value:.{decimals}f}" for value in values]
+
+
+def generate(trades=DEFAULT_TRADES, seed=0):
+    """Synthetic account state, trades and orders, in Binance's field names."""
+    rng = np.random.default_rng(seed)
+    now_ms = int(time.time() * 1000)
+    times = np.sort(rng.integers(now_ms - mock_backend.HISTORY_SPAN_MS, now_ms, trades))
+    orders = max(trades // 2, 1)
+    order_ids = np.arange(orders) + 8_000_000
+    order_symbols = rng.choice(SYMBOLS, orders)
+    order_times = np.sort(rng.integers(now_ms - mock_backend.HISTORY_SPAN_MS, now_ms, orders))
+    # Old orders are done; only the newest can still be working
+    closed = [status for status in mock_backend.ORDER_STATUSES if status not in binance_ingest.OPEN_STATUSES]
+    statuses = rng.choice(closed, orders).astype(object)
+    open_count = min(mock_backend.OPEN_ORDER_ROWS, orders)
+    statuses[orders - open_count:] = rng.choice(sorted(binance_ingest.OPEN_STATUSES), open_count)
+    quantities = rng.uniform(0.001, 10, orders)
+    order_list = [
+        {
+            "orderId": int(order_id), "symbol": str(symbol), "status": str(status),
+            "clientOrderId": f"stub{order_id}", "price": price, "avgPrice": price,
+            "origQty": quantity, "executedQty": quantity if status == "FILLED" else "0",
+            "type": str(kind), "side": str(side), "positionSide": "BOTH", "time": int(at), "updateTime": int(at),
+        }
+        for order_id, symbol, status, price, quantity, kind, side, at in zip(
+            order_ids, order_symbols, statuses, _strings(rng.uniform(0.1, 60_000, orders), 2),
+            _strings(quantities, 3), rng.choice(mock_backend.ORDER_TYPES, orders),
+            rng.choice(["BUY", "SELL"], orders), order_times,
+        )
+    ]
+    trade_list = [
+        {
+            "symbol": str(symbol), "id": int(trade_id), "orderId": int(rng_order), "side": str(side),
+            "price": price, "qty": qty, "realizedPnl": pnl, "marginAsset": "USDT",
+            "commission": commission, "commissionAsset": "USDT", "time": int(at),
+            "positionSide": "BOTH", "buyer": side == "BUY", "maker": False,
+        }
+        for symbol, trade_id, rng_order, side, price, qty, pnl, commission, at in zip(
+            rng.choice(SYMBOLS, trades), np.arange(trades) + 100_000_000,
+            rng.choice(order_ids, trades), rng.choice(["BUY", "SELL"], trades),
+            _strings(rng.uniform(0.1, 60_000, trades), 2), _strings(rng.uniform(0.001, 10, trades), 3),
+            _strings(rng.normal(0, 25, trades), 8), _strings(rng.uniform(0, 2, trades), 8), times,
+        )
+    ]
+    sizes = rng.uniform(-5, 5, len(POSITION_SYMBOLS))
+    entry_prices = rng.uniform(0.1, 60_000, len(POSITION_SYMBOLS))
+    mark_prices = entry_prices * rng.normal(1, 0.01, len(POSITION_SYMBOLS))
+    positions = [
+        {
+            "symbol": symbol, "positionAmt": f"{size:.3f}", "entryPrice": f"{entry:.2f}",
+            "markPrice": f"{mark:.2f}", "unRealizedProfit": f"{(mark - entry) * size:.8f}",
+            "leverage": "10", "marginType": "cross", "positionSide": "BOTH", "updateTime": now_ms,
+        }
+        for symbol, size, entry, mark in zip(POSITION_SYMBOLS, sizes, entry_prices, mark_prices)
+    ]
+    # Flat symbols are listed too, as Binance does
+    positions += [
+        {
+            "symbol": symbol, "positionAmt": "0.000", "entryPrice": "0.0", "markPrice": "1.00",
+            "unRealizedProfit": "0.00000000", "leverage": "20", "marginType": "cross",
+            "positionSide": "BOTH", "updateTime": 0,
+        }
+        for symbol in SYMBOLS[len(POSITION_SYMBOLS):]
+    ]
+    unrealized = sum(float(position["unRealizedProfit"]) for position in positions)
+    return {
+        "account": {
+            "totalWalletBalance": "10000.00000000",
+            "totalUnrealizedProfit": f"{unrealized:.8f}",
+            "totalMarginBalance": f"{10_000 + unrealized:.8f}",
+            "availableBalance": "7500.00000000",
+        },
+        "positions": positions,
+        "trades": trade_list,
+        "orders": order_list,
+    }
+
+
+def _by_symbol(records):
+    grouped = {}
+    for record in records:
+        grouped.setdefault(record["symbol"], []).append(record)
+    return grouped
+
+
+def _page(records, id_field, start, limit):
+    """Records with id >= start, or the newest ``limit`` without a start."""
+    if start is None:
+        return records[-limit:]
+    ids = [record[id_field] for record in records]
+    first = int(np.searchsorted(ids, start, side="left"))
+    return records[first:first + limit]
+
+
+def create_app(trades=DEFAULT_TRADES, seed=0, limit=binance_ingest.WEIGHT_LIMIT, window=binance_ingest.WEIGHT_WINDOW,
+               latency=0.0, api_key=API_KEY, api_secret=API_SECRET):
+    """Flask stub; app.config["WEIGHT_METER"] holds its WeightMeter."""
+    app = Flask(__name__)
+    data = generate(trades, seed)
+    trades_by_symbol = _by_symbol(data["trades"])
+    orders_by_symbol = _by_symbol(data["orders"])
+    open_orders = [order for order in data["orders"] if order["status"] in binance_ingest.OPEN_STATUSES]
+    meter = app.config["WEIGHT_METER"] = WeightMeter(limit, window)
+
+    def error(status, code, message, headers=None):
+        response = jsonify({"code": code, "msg": message})
+        response.status_code = status
+        response.headers.update(headers or {})
+        return response
+
+    @app.before_request
+    def check():
+        if latency:
+            time.sleep(latency)
+        weight = WEIGHTS.get(request.path)
+        if weight is None:
+            abort(404)
+        used, retry_after = meter.charge(weight)
+        request.environ["used_weight"] = used
+        if retry_after is not None:
+            return error(429, -1003, "Too many requests.", {"Retry-After": str(retry_after)})
+        query, _, signature = request.query_string.decode().rpartition("&signature=")
+        expected = hmac.new(api_secret.encode(), query.encode(), hashlib.sha256).hexdigest()
+        if request.headers.get("X-MBX-APIKEY") != api_key or not hmac.compare_digest(signature, expected):
+            return error(401, -1022, "Signature for this request is not valid.")
+
+    @app.after_request
+    def weight_header(response):
+        if "used_weight" in request.environ:
+            response.headers[binance_ingest.WEIGHT_HEADER] = str(request.environ["used_weight"])
+        return response
+
+    def history(records_by_symbol, id_param, id_field):
+        symbol = request.args.get("symbol")
+        if not symbol:
+            return error(400, -1102, "Mandatory parameter 'symbol' was not sent.")
+        limit = min(request.args.get("limit", DEFAULT_PAGE, type=int), MAX_PAGE)
+        start = request.args.get(id_param, type=int)
+        return jsonify(_page(records_by_symbol.get(symbol, []), id_field, start, limit))
+
+    @app.route("/fapi/v2/account")
+    def account():
+        return jsonify({**data["account"], "positions": data["positions"]})
+
+    @app.route("/fapi/v2/positionRisk")
+    def position_risk():
+        return jsonify(data["positions"])
+
+    @app.route("/fapi/v1/openOrders")
+    def open_orders_route():
+        return jsonify(open_orders)
+
+    @app.route("/fapi/v1/userTrades")
+    def user_trades():
+        return history(trades_by_symbol, "fromId", "id")
+
+    @app.route("/fapi/v1/allOrders")
+    def all_orders():
+        return history(orders_by_symbol, "orderId", "orderId")
+
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--trades", type=int, default=DEFAULT_TRADES)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--limit", type=int, default=binance_ingest.WEIGHT_LIMIT, help="request weight per window")
+    parser.add_argument("--window", type=float, default=binance_ingest.WEIGHT_WINDOW, help="seconds per weight window")
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every request")
+    args = parser.parse_args()
+    app = create_app(args.trades, args.seed, args.limit, args.window, args.latency)
+    print(f"Binance stub with {args.trades:,} trades on http://{args.host}:{args.port}")
+    make_server(args.host, args.port, app, threaded=True).serve_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+"""Stand-in push feed for local runs of the live dashboard sections.
+
+Serves ``GET /stream?topics=positions,open_orders,account_summary`` as
+Server-Sent Events in the format live_feed expects: a snapshot per topic on
+connect, then a random delta every interval, plus heartbeat comments.
+
+Usage: python mock_feed.py [--port 5059] [--interval 0.5]
+"""
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+DEFAULT_PORT = 5059
+DEFAULT_INTERVAL = 0.5  # seconds between deltas
+HEARTBEAT_INTERVAL = 10
+SYMBOLS = ["BTCUSDT", "ETHUSDT", "SOLUSDT", "BNBUSDT", "XRPUSDT"]
+TOPICS = ("positions", "open_orders", "account_summary")
+
+
+def _position(symbol):
+    size = round(random.uniform(-5, 5), 3)
+    entry = round(random.uniform(10, 60000), 2)
+    mark = round(entry * random.uniform(0.97, 1.03), 2)
+    return {
+        "Symbol": symbol,
+        "Side": "LONG" if size > 0 else "SHORT",
+        "Size": size,
+        "Entry Price": entry,
+        "Mark Price": mark,
+        "PNL": round((mark - entry) * size, 2),
+        "Leverage": random.choice([5, 10, 20]),
+        "Entry Time": int(time.time() * 1000) - random.randint(0, 86_400_000),
+    }
+
+
+def _order(order_id):
+    return {
+        "Order ID": order_id,
+        "Symbol": random.choice(SYMBOLS),
+        "Side": random.choice(["BUY", "SELL"]),
+        "Type": random.choice(["LIMIT", "STOP_MARKET", "TAKE_PROFIT_MARKET"]),
+        "Status": "NEW",
+        "Price": round(random.uniform(10, 60000), 2),
+        "Quantity": round(random.uniform(0.01, 5), 3),
+        "Executed Qty": 0.0,
+        "Order Time": int(time.time() * 1000),
+    }
+
+
+def _summary():
+    balance = round(random.uniform(9000, 11000), 2)
+    return {
+        "Balance": balance,
+        "Unrealized PNL": round(random.uniform(-300, 300), 2),
+        "Margin Balance": round(balance * 1.01, 2),
+        "Available Balance": round(balance * 0.7, 2),
+    }
+
+
+class FeedState:
+    """The feed's current truth, mutated by random deltas."""
+
+    def __init__(self):
+        self.positions = {symbol: _position(symbol) for symbol in SYMBOLS[:3]}
+        self.next_order_id = 1_000_000
+        self.orders = {}
+        for _ in range(5):
+            self._new_order()
+        self.summary = _summary()
+        self.lock = threading.Lock()
+
+    def _new_order(self):
+        order = _order(self.next_order_id)
+        self.orders[order["Order ID"]] = order
+        self.next_order_id += 1
+        return order
+
+    def snapshot(self, topic):
+        with self.lock:
+            if topic == "positions":
+                return {"op": "snapshot", "data": list(self.positions.values())}
+            if topic == "open_orders":
+                return {"op": "snapshot", "data": list(self.orders.values())}
+            return {"op": "snapshot", "data": dict(self.summary)}
+
+    def delta(self, topic):
+        with self.lock:
+            if topic == "positions":
+                symbol = random.choice(SYMBOLS)
+                if symbol in self.positions and random.random() < 0.2:
+                    del self.positions[symbol]
+                    return {"op": "delete", "keys": [symbol]}
+                self.positions[symbol] = _position(symbol)
+                return {"op": "upsert", "rows": [self.positions[symbol]]}
+            if topic == "open_orders":
+                if self.orders and random.random() < 0.4:
+                    order_id = random.choice(list(self.orders))
+                    del self.orders[order_id]
+                    return {"op": "delete", "keys": [order_id]}
+                return {"op": "upsert", "rows": [self._new_order()]}
+            change = {"Unrealized PNL": round(random.uniform(-300, 300), 2)}
+            self.summary.update(change)
+            return {"op": "patch", "data": change}
+
+
+def encode_event(topic, message):
+    """One SSE event carrying a message stamped with its send time."""
+    message["ts"] = time.time()
+    return f"event: {topic}\ndata: {json.dumps(message)}\n\n".encode()
+
+
+def make_handler(state, interval):
+    class StreamHandler(BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            if url.path.rstrip("/") != "/stream":
+                self.send_error(404)
+                return
+            requested = parse_qs(url.query).get("topics", [",".join(TOPICS)])[0].split(",")
+            topics = [topic for topic in requested if topic in TOPICS]
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Cache-Control", "no-cache")
+            self.end_headers()
+            try:
+                for topic in topics:
+                    self.wfile.write(encode_event(topic, state.snapshot(topic)))
+                self.wfile.flush()
+                last_beat = time.time()
+                while topics:
+                    time.sleep(interval)
+                    topic = random.choice(topics)
+                    self.wfile.write(encode_event(topic, state.delta(topic)))
+                    if time.time() - last_beat > HEARTBEAT_INTERVAL:
+                        self.wfile.write(b": heartbeat\n\n")
+                        last_beat = time.time()
+                    self.wfile.flush()
+            except (BrokenPipeError, ConnectionResetError):
+                pass
+
+    return StreamHandler
+
+
+def serve(port=DEFAULT_PORT, interval=DEFAULT_INTERVAL, host="127.0.0.1"):
+    """Start the feed on a background thread; returns the server."""
+    server = ThreadingHTTPServer((host, port), make_handler(FeedState(), interval))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--interval", type=float, default=DEFAULT_INTERVAL)
+    args = parser.parse_args()
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(FeedState(), args.interval))
+    server.daemon_threads = True
+    print(f"Serving live feed on http://{args.host}:{args.port}/stream")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+"""Streamlit helpers shared by the pages of both dashboards.
+
+Nothing here imports pandas or plotly, so the metric-only pages of either
+app start without the data stack; to_frame loads pandas on first use.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+import streamlit as st
+import requests
+
+import poller
+
+SNAPSHOT_CHECK_SECONDS = 2  # How often an open page checks for newer polled data
+SNAPSHOT_STATES_KEY = "_snapshot_states"
+
+
+@st.cache_resource
+def get_poller(base_url):
+    """Process-wide endpoint poller of a backend, shared by every session of either app"""
+    return poller.SharedPoller(base_url).start()
+
+
+def record_snapshot(base_url, endpoint, snapshot):
+    """Remember what this run showed for watch_snapshots, badging stale data"""
+    st.session_state.setdefault(SNAPSHOT_STATES_KEY, {})[base_url, endpoint] = snapshot.state
+    if snapshot.error is not None:
+        stale_badge(snapshot.fetched_at, snapshot.error)
+
+
+def stale_badge(as_of, error):
+    """Caption marking data as the last good copy while the backend is failing"""
+    when = time.strftime("%H:%M:%S", time.localtime(as_of)) if as_of else "the last sync"
+    st.caption(f"⚠️ Stale as of {when} · backend unavailable, refreshing in the background", help=str(error))
+
+
+def synced_frame(store, sync):
+    """Run a history store's sync, serving its last good frame with a stale badge if that fails"""
+    try:
+        frame = sync()
+    except requests.exceptions.RequestException as e:
+        if store.frame.empty:
+            raise
+        # An open circuit makes this instant
+        stale_badge(store.synced_at, e)
+        return store.frame
+    report_issues(store.issues)
+    return frame
+
+
+def watch_snapshots():
+    """Rerun the app once polled data read during this run changes or goes stale
+
+    Call at the end of the script: sessions re-render only when the shared
+    poller publishes something new for what they show.
+    """
+    states = st.session_state.pop(SNAPSHOT_STATES_KEY, {})
+    if not states:
+        return
+    pollers = {base_url: get_poller(base_url) for base_url, _ in states}
+
+    @st.fragment(run_every=SNAPSHOT_CHECK_SECONDS)
+    def watcher():
+        if any(pollers[base_url].state(endpoint) != state for (base_url, endpoint), state in states.items()):
+            st.rerun()
+
+    watcher()
+
+
+MEMO_MAX_ENTRIES = 64  # memoized results kept, least recently used dropped first
+
+# name -> (source, build(source), schema issues found while building it),
+# shared by every session of the process
+_memo = OrderedDict()
+_memo_locks = {}
+_memo_lock = threading.Lock()
+# Issues to_frame found during the memoized build running in this thread
+_building = threading.local()
+
+
+def _same_source(old, new):
+    if isinstance(old, tuple) and isinstance(new, tuple):
+        return len(old) == len(new) and all(a is b for a, b in zip(old, new))
+    return old is new
+
+
+def report_issues(issues):
+    """Warn about schema issues, or hand them to the memoized build in progress"""
+    collected = getattr(_building, "issues", None)
+    if collected is not None:
+        collected.extend(issues)
+        return
+    if issues:
+        # Imported on demand: it loads pandas
+        import schemas
+        for issue in issues:
+            st.warning(schemas.describe(issue))
+
+
+def _build(build, source):
+    """(build(source), schema issues reported while it ran)"""
+    outer = getattr(_building, "issues", None)
+    _building.issues = issues = []
+    try:
+        return build(source), issues
+    finally:
+        _building.issues = outer
+
+
+def memoized(name, source, build):
+    """Return build(source), reused across reruns and sessions until the source object changes
+
+    Polled payloads and delta-store frames are replaced, never mutated, when
+    new data arrives, so identity is enough to tell that a rebuild is due.
+    A tuple source (e.g. one payload per account) is compared item by item.
+    Sources are process-wide, so the memo is too: every viewer shares one
+    result per name, built by whichever session needs it first while the
+    others wait. ``name`` must therefore cover every input of build besides
+    source, and callers must not modify the result. Schema issues to_frame
+    finds while building are kept with the result and reported on every
+    call. The MEMO_MAX_ENTRIES most recently used names are kept.
+    """
+    with _memo_lock:
+        lock = _memo_locks.setdefault(name, threading.Lock())
+    with lock:
+        with _memo_lock:
+            entry = _memo.get(name)
+            if entry is not None:
+                _memo.move_to_end(name)
+        if entry is None or not _same_source(entry[0], source):
+            entry = (source, *_build(build, source))
+            with _memo_lock:
+                _memo[name] = entry
+                _memo.move_to_end(name)
+                while len(_memo) > MEMO_MAX_ENTRIES:
+                    evicted, _ = _memo.popitem(last=False)
+                    _memo_locks.pop(evicted, None)
+    report_issues(entry[2])
+    return entry[1]
+
+
+def to_frame(endpoint, data):
+    """Typed DataFrame for an endpoint; malformed fields are reported, not hidden"""
+    # Imported on demand: it loads pandas
+    import schemas
+    df, issues = schemas.build_frame(endpoint, data)
+    report_issues(issues)
+    return df
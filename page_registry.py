@@ -0,0 +1,36 @@
+"""Lazily imported dashboard pages.
+
+An app lists its pages as Page(label, module, function) and renders the
+selected one with render(). A page's module is imported the first time the
+page is opened, so the libraries it draws with (pandas, plotly, pyarrow)
+load only then, not when the server starts or a session opens on a page
+that shows a few metrics. First imports are recorded as perf IMPORT spans.
+"""
+import importlib
+import sys
+from collections import namedtuple
+
+import perf
+
+# ``module`` None marks a menu entry without a page yet
+Page = namedtuple("Page", ["label", "module", "function"])
+
+
+def labels(pages):
+    return [page.label for page in pages]
+
+
+def find(pages, label):
+    """The page with a label, or None."""
+    return next((page for page in pages if page.label == label), None)
+
+
+def render(page):
+    """Run a page's function, importing its module on first use."""
+    if page is None or page.module is None:
+        return
+    module = sys.modules.get(page.module)
+    if module is None:
+        with perf.span(perf.IMPORT, page.module):
+            module = importlib.import_module(page.module)
+    getattr(module, page.function)()
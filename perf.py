@@ -0,0 +1,215 @@
+"""Timed spans on the dashboards' hot paths.
+
+Shared modules wrap their expensive steps in ``perf.span(kind, name)``:
+network round trips, JSON decoding, DataFrame builds, transforms, disk cache
+I/O, chart construction and the first import of a lazily loaded page. Page functions are sections
+(``@perf.timed_section``), so every span records the page it ran under.
+Spans nest: ``self_ms`` is a span's own time without its children, which is
+what per-kind totals add up. A section's self time is therefore what the
+page spent on everything else, mostly Streamlit rendering.
+
+Spans go to a process-wide ring buffer and cumulative per-(section, kind,
+name) totals. They can be viewed in the optional sidebar panel and exported
+as JSON lines or in the Prometheus text format. Set DASHBOARD_PERF_JSONL and
+DASHBOARD_PERF_PROM to write both files after every script run.
+"""
+import contextvars
+import itertools
+import json
+import os
+import threading
+import time
+from collections import deque, namedtuple
+from contextlib import contextmanager
+from functools import wraps
+
+import streamlit as st
+
+NETWORK = "network"
+DECODE = "decode"
+BUILD = "build"
+TRANSFORM = "transform"
+STORAGE = "storage"
+CHART = "chart"
+SECTION = "section"
+IMPORT = "import"
+
+MAX_SPANS = 5000
+JSONL_PATH = os.environ.get("DASHBOARD_PERF_JSONL")
+PROMETHEUS_PATH = os.environ.get("DASHBOARD_PERF_PROM")
+METRIC_PREFIX = "dashboard_span"
+# Shown for spans recorded outside any page, e.g. in a fragment-only rerun
+NO_SECTION = "(fragment)"
+
+Span = namedtuple("Span", ["run", "section", "kind", "name", "started", "duration_ms", "self_ms", "bytes", "rows"])
+
+_run_ids = itertools.count(1)
+_run = contextvars.ContextVar("perf_run", default=0)
+_section = contextvars.ContextVar("perf_section", default=NO_SECTION)
+_stack = contextvars.ContextVar("perf_stack", default=())
+
+_spans = deque(maxlen=MAX_SPANS)
+_totals = {}  # (section, kind, name) -> [count, seconds, bytes, rows]
+_lock = threading.Lock()
+
+
+class _OpenSpan:
+    """A span being timed; set ``rows`` and ``bytes`` once they are known."""
+
+    __slots__ = ("rows", "bytes", "children")
+
+    def __init__(self):
+        self.rows = None
+        self.bytes = None
+        self.children = 0.0
+
+
+def start_run():
+    """Begin a script run; returns its id for spans()."""
+    run = next(_run_ids)
+    _run.set(run)
+    return run
+
+
+@contextmanager
+def span(kind, name):
+    """Time the enclosed block as one span."""
+    stack = _stack.get()
+    current = _OpenSpan()
+    token = _stack.set(stack + (current,))
+    started = time.time()
+    start = time.perf_counter()
+    try:
+        yield current
+    finally:
+        duration = time.perf_counter() - start
+        _stack.reset(token)
+        if stack:
+            # Concurrent children (fetch_many workers) can add up to more than
+            # the parent's wall time; self time is clamped at zero below
+            stack[-1].children += duration
+        _record(Span(
+            run=_run.get(),
+            section=_section.get(),
+            kind=kind,
+            name=name,
+            started=started,
+            duration_ms=duration * 1000,
+            self_ms=max(duration - current.children, 0.0) * 1000,
+            bytes=current.bytes,
+            rows=current.rows,
+        ))
+
+
+@contextmanager
+def section(name):
+    """Attribute the spans of the enclosed block to a dashboard section."""
+    token = _section.set(name)
+    try:
+        with span(SECTION, name):
+            yield
+    finally:
+        _section.reset(token)
+
+
+def timed_section(func):
+    """Decorator making a page function a section named after it."""
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        with section(func.__name__):
+            return func(*args, **kwargs)
+    return wrapper
+
+
+def _record(record):
+    key = (record.section, record.kind, record.name)
+    with _lock:
+        _spans.append(record)
+        totals = _totals.setdefault(key, [0, 0.0, 0, 0])
+        totals[0] += 1
+        totals[1] += record.self_ms / 1000
+        totals[2] += record.bytes or 0
+        totals[3] += record.rows or 0
+
+
+def spans(run=None):
+    """Recorded spans, oldest first, optionally of one run only."""
+    with _lock:
+        recorded = list(_spans)
+    if run is None:
+        return recorded
+    return [record for record in recorded if record.run == run]
+
+
+def clear():
+    with _lock:
+        _spans.clear()
+        _totals.clear()
+
+
+def to_jsonl(records):
+    """Spans as JSON lines, one object per span."""
+    return "".join(json.dumps(record._asdict()) + "\n" for record in records)
+
+
+def _label(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def to_prometheus():
+    """Cumulative per-span totals in the Prometheus text exposition format."""
+    with _lock:
+        totals = {key: list(values) for key, values in _totals.items()}
+    metrics = [
+        ("count_total", "Spans recorded", 0),
+        ("seconds_total", "Self time spent in spans", 1),
+        ("bytes_total", "Payload bytes seen by spans", 2),
+        ("rows_total", "Rows handled by spans", 3),
+    ]
+    lines = []
+    for suffix, help_text, index in metrics:
+        name = f"{METRIC_PREFIX}_{suffix}"
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} counter")
+        for (section_name, kind, span_name), values in sorted(totals.items()):
+            labels = f'section="{_label(section_name)}",kind="{_label(kind)}",name="{_label(span_name)}"'
+            lines.append(f"{name}{{{labels}}} {values[index]:.6g}")
+    return "\n".join(lines) + "\n"
+
+
+def write_exports(records):
+    """Append spans to DASHBOARD_PERF_JSONL and rewrite DASHBOARD_PERF_PROM, when set."""
+    if JSONL_PATH and records:
+        with open(JSONL_PATH, "a") as f:
+            f.write(to_jsonl(records))
+    if PROMETHEUS_PATH:
+        # Scrapers (e.g. node_exporter's textfile collector) never see a partial file
+        tmp_path = f"{PROMETHEUS_PATH}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            f.write(to_prometheus())
+        os.replace(tmp_path, PROMETHEUS_PATH)
+
+
+def sidebar_panel(run):
+    """Sidebar "Perf" panel: this run's spans, per-kind totals and exports."""
+    # Imported on first use: pages that draw no tables should not load pandas
+    import pandas as pd
+
+    records = spans(run)
+    with st.sidebar.expander("⏱ Perf", expanded=True):
+        if not records:
+            st.caption("No spans recorded in this run.")
+            return
+        df = pd.DataFrame(records, columns=Span._fields)
+        by_kind = df.groupby("kind")["self_ms"].sum().sort_values(ascending=False)
+        st.caption(" · ".join(f"{kind} {ms:,.0f} ms" for kind, ms in by_kind.items()))
+        st.dataframe(
+            df.sort_values("self_ms", ascending=False)[["section", "kind", "name", "self_ms", "duration_ms", "bytes", "rows"]],
+            hide_index=True,
+            column_config={
+                "self_ms": st.column_config.NumberColumn("self ms", format="%.1f"),
+                "duration_ms": st.column_config.NumberColumn("total ms", format="%.1f"),
+            },
+        )
+        st.download_button("Spans (JSON lines)", to_jsonl(records), file_name="spans.jsonl", mime="application/jsonl")
+        st.download_button("Totals (Prometheus)", to_prometheus(), file_name="dashboard.prom", mime="text/plain")
@@ -0,0 +1,211 @@
+"""Process-wide polling of backend endpoints, shared by every session.
+
+Each Streamlit session used to fetch the endpoints it showed on its own, so
+twenty people on the dashboard meant twenty times the backend load, and
+twenty times the Binance rate-limit pressure behind it. A SharedPoller runs
+one background thread per process that refreshes each endpoint on its own
+schedule (data_client's per-endpoint TTL) and publishes it as an immutable,
+versioned snapshot that every session reads. The version only changes when
+the payload does, so a session can tell cheaply whether it has anything
+new to render.
+
+Endpoints are polled only while someone reads them. The first read fetches
+right away, with concurrent first readers waiting on that one fetch, and an
+endpoint nobody has read for IDLE_SECONDS is dropped from the schedule.
+Endpoints falling due together are fetched with data_client.fetch_many, so
+they share one bundle round trip; refreshes always reach the backend, and
+fill the response cache on the way.
+
+When a refresh fails the snapshot keeps its last good data and carries the
+error, so sessions serve it at once, marked stale, while the poller keeps
+revalidating; data_client's circuit breaker makes those attempts free while
+the backend is down.
+
+Snapshot data is shared: callers must treat it as read-only.
+"""
+import threading
+import time
+from collections import namedtuple
+from contextlib import ExitStack
+
+import data_client
+import perf
+
+IDLE_SECONDS = 5 * 60
+MIN_INTERVAL = 1  # seconds; floor for any endpoint's schedule
+SECTION = "shared poller"  # perf section of the background fetches
+
+
+class Snapshot(namedtuple("Snapshot", ["version", "data", "fetched_at", "error"])):
+    """One published payload. error is the last failed refresh, if any; data
+    is then the last good payload, fetched at fetched_at (epoch seconds)."""
+
+    __slots__ = ()
+
+    @property
+    def state(self):
+        """(version, stale): changes whenever a page would render differently."""
+        return self.version, self.error is not None
+
+
+def _unchanged(old, new):
+    if old is new:
+        return True
+    if type(old) is not type(new):
+        return False
+    try:
+        # pyarrow Tables compare with equals(); records and dicts with ==
+        return bool(new.equals(old)) if hasattr(new, "equals") else new == old
+    except (TypeError, ValueError):
+        return False
+
+
+class SharedPoller:
+    """Background refresher publishing one versioned snapshot per endpoint."""
+
+    def __init__(self, base_url, intervals=None, timeout=data_client.DEFAULT_TIMEOUT):
+        self.base_url = base_url
+        self.intervals = dict(intervals or {})
+        self.timeout = timeout
+        self.polls = 0  # background refreshes done, for monitoring
+        self.last_error = None
+        self._snapshots = {}
+        self._due = {}  # endpoint -> monotonic time of its next refresh
+        self._last_read = {}
+        self._fetch_locks = {}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="shared-poller", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+
+    def interval(self, endpoint):
+        """Seconds between refreshes of an endpoint."""
+        return max(self.intervals.get(endpoint, data_client.endpoint_ttl(endpoint)), MIN_INTERVAL)
+
+    def snapshot(self, endpoint):
+        """Latest Snapshot of an endpoint, or None while it is not polled."""
+        with self._lock:
+            return self._snapshots.get(endpoint)
+
+    def state(self, endpoint):
+        """Snapshot.state of an endpoint, None while it is not polled.
+
+        Counts as a read: an open page watching for changes keeps the
+        endpoint on the schedule.
+        """
+        return getattr(self._touch(endpoint), "state", None)
+
+    def read(self, endpoint):
+        """Latest Snapshot of an endpoint, fetching it first if it is not polled yet.
+
+        Raises requests.exceptions.RequestException if that first fetch fails.
+        """
+        _, snapshot, error = next(self.read_many([endpoint]))
+        if error is not None:
+            raise error
+        return snapshot
+
+    def read_many(self, endpoints):
+        """Yield (endpoint, snapshot, error) for several endpoints.
+
+        Exactly one of snapshot/error is set. Endpoints not polled yet are
+        fetched together, once, however many sessions ask at the same time.
+        """
+        missing = []
+        for endpoint in dict.fromkeys(endpoints):
+            snapshot = self._touch(endpoint)
+            if snapshot is None:
+                missing.append(endpoint)
+            else:
+                yield endpoint, snapshot, None
+        if missing:
+            # Results are gathered before yielding so no lock is held while
+            # the caller renders
+            yield from self._fetch_first(missing)
+
+    def _touch(self, endpoint):
+        with self._lock:
+            self._last_read[endpoint] = time.monotonic()
+            return self._snapshots.get(endpoint)
+
+    def _fetch_first(self, endpoints):
+        with ExitStack() as stack:
+            for endpoint in sorted(endpoints):
+                with self._lock:
+                    fetch_lock = self._fetch_locks.setdefault(endpoint, threading.Lock())
+                stack.enter_context(fetch_lock)
+            results = []
+            pending = []
+            for endpoint in endpoints:
+                # Another session may have fetched it while this one waited
+                snapshot = self.snapshot(endpoint)
+                if snapshot is None:
+                    pending.append(endpoint)
+                else:
+                    results.append((endpoint, snapshot, None))
+            for endpoint, data, error in data_client.fetch_many(self.base_url, pending, timeout=self.timeout):
+                snapshot = None if error is not None else self._publish(endpoint, data)
+                results.append((endpoint, snapshot, error))
+        self._wake.set()
+        return results
+
+    def _publish(self, endpoint, data):
+        current = self.snapshot(endpoint)
+        if current is not None and _unchanged(current.data, data):
+            snapshot = current._replace(fetched_at=time.time(), error=None)
+        else:
+            version = current.version + 1 if current is not None else 1
+            snapshot = Snapshot(version=version, data=data, fetched_at=time.time(), error=None)
+        with self._lock:
+            self._snapshots[endpoint] = snapshot
+            self._due[endpoint] = time.monotonic() + self.interval(endpoint)
+        return snapshot
+
+    def _fail(self, endpoint, error):
+        self.last_error = error
+        with self._lock:
+            current = self._snapshots.get(endpoint)
+            if current is not None:
+                # Sessions keep the last good data and can show the error
+                self._snapshots[endpoint] = current._replace(error=error)
+            self._due[endpoint] = time.monotonic() + self.interval(endpoint)
+
+    def _next_due(self):
+        """(endpoints due now, seconds until the next one), dropping idle ones."""
+        now = time.monotonic()
+        with self._lock:
+            for endpoint, last_read in list(self._last_read.items()):
+                if now - last_read > IDLE_SECONDS:
+                    del self._last_read[endpoint]
+                    self._snapshots.pop(endpoint, None)
+                    self._due.pop(endpoint, None)
+            due = [endpoint for endpoint, at in self._due.items() if at <= now]
+            wait = min(self._due.values(), default=now + IDLE_SECONDS) - now
+        return due, max(wait, 0)
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._wake.clear()
+            due, wait = self._next_due()
+            if not due:
+                self._wake.wait(wait)
+                continue
+            with perf.section(SECTION):
+                responses = data_client.fetch_many(self.base_url, due, timeout=self.timeout, refresh=True)
+                for endpoint, data, error in responses:
+                    if error is None:
+                        self._publish(endpoint, data)
+                    else:
+                        self._fail(endpoint, error)
+            self.polls += len(due)
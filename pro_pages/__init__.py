@@ -0,0 +1,14 @@
+"""Pages of the pro dashboard (app1.py), rendered through page_registry.
+
+Account Overview needs neither pandas nor plotly; the chart pages load
+them the first time one is opened.
+"""
+from page_registry import Page
+
+PAGES = [
+    Page("🏦 Account Overview", "pro_pages.account", "account_overview"),
+    Page("📊 Positions", "pro_pages.positions", "positions_analysis"),
+    Page("📝 Orders", None, None),
+    Page("📈 Trade Analytics", "pro_pages.trades", "trade_analytics"),
+    Page("💹 Performance Metrics", "pro_pages.performance", "performance_metrics"),
+]
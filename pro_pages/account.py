@@ -0,0 +1,52 @@
+"""Account Overview: four metrics, so this page loads neither pandas nor plotly."""
+import streamlit as st
+
+import formatting
+import perf
+from pro_pages.common import safe_fetch_data
+
+
+@perf.timed_section
+def account_overview():
+    """Comprehensive Account Overview Section"""
+    st.header("Account Overview")
+    account_data = safe_fetch_data("account_summary")
+    
+    if not account_data:
+        st.warning("Unable to fetch account data")
+        return
+    
+    # Create columns for key metrics
+    col1, col2, col3, col4 = st.columns(4)
+    
+    with col1:
+        st.metric(
+            label="Total Balance", 
+            value=account_data.get('Balance', 0),
+            format=formatting.CURRENCY_FORMAT,
+            help="Total account balance across all assets"
+        )
+    
+    with col2:
+        st.metric(
+            label="Unrealized PNL", 
+            value=account_data.get('Unrealized PNL', 0),
+            format=formatting.PNL_FORMAT,
+            help="Profit/Loss from current open positions"
+        )
+    
+    with col3:
+        st.metric(
+            label="Available Margin", 
+            value=account_data.get('Margin Balance', 0),
+            format=formatting.CURRENCY_FORMAT,
+            help="Margin balance available for trading"
+        )
+    
+    with col4:
+        st.metric(
+            label="Free Balance", 
+            value=account_data.get('Available Balance', 0),
+            format=formatting.CURRENCY_FORMAT,
+            help="Balance available for new trades"
+        )
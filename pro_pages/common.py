@@ -0,0 +1,44 @@
+"""Configuration and light helpers shared by the pro dashboard's pages.
+
+Nothing here imports pandas or plotly; the helpers shared with the main
+dashboard live in page_common.
+"""
+import os
+
+import streamlit as st
+import requests
+
+import data_client
+from page_common import get_poller, record_snapshot, synced_frame
+
+# Configuration and Constants
+API_SERVER = os.environ.get("DASHBOARD_API_SERVER", "http://34.47.211.154:5000")  # Replace with your actual server URL, or set DASHBOARD_API_SERVER
+SHARED_POLLING = True  # One process-wide poller fetches for every session
+
+
+def safe_fetch_data(endpoint):
+    """Enhanced error handling and logging for API requests"""
+    try:
+        if SHARED_POLLING:
+            snapshot = get_poller(API_SERVER).read(endpoint)
+            record_snapshot(API_SERVER, endpoint, snapshot)
+            return snapshot.data
+        return data_client.get_json(API_SERVER, endpoint, timeout=10)
+    except requests.exceptions.RequestException as e:
+        st.error(f"API Request Error for {endpoint}: {e}")
+        return None
+
+
+def history_source(endpoint, columns=None):
+    """Shared, read-only history frame of an endpoint, synced incrementally
+
+    ``columns`` as for delta_sync.get_store. None when the first sync fails.
+    """
+    # Imported on demand: it loads pandas
+    import delta_sync
+    store = delta_sync.get_store(API_SERVER, endpoint, columns)
+    try:
+        return synced_frame(store, store.sync)
+    except requests.exceptions.RequestException as e:
+        st.error(f"API Request Error for {endpoint}: {e}")
+        return None
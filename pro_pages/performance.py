@@ -0,0 +1,140 @@
+"""Risk and performance metrics: rolling Sharpe and Sortino, drawdowns and trade statistics."""
+import numpy as np
+import streamlit as st
+import plotly.express as px
+
+import formatting
+import metrics
+import perf
+from page_common import memoized, to_frame
+from pro_pages.common import history_source, safe_fetch_data
+
+# PNL series the metrics can be computed over
+SOURCES = {
+    "Daily PNL": "pnl_analytics",
+    "Trade analytics": "trade_analytics",
+    "Trade history": "trade_history",
+}
+HISTORY_SOURCES = {"trade_history"}  # kept in an incrementally synced store
+RATIO_FORMAT = "%.2f"
+SYMBOL_COLUMN_CONFIG = {
+    "Trades": st.column_config.NumberColumn("Trades", format=formatting.COUNT_FORMAT),
+    "Win Rate": st.column_config.NumberColumn("Win Rate", format=formatting.PERCENT_FORMAT),
+    "Profit Factor": st.column_config.NumberColumn("Profit Factor", format=RATIO_FORMAT),
+    **formatting.currency_column_config(
+        ["Total PNL", "Gross Profit", "Gross Loss", "Expectancy", "Average Win", "Average Loss", "Max Drawdown"],
+        signed=True,
+    ),
+}
+SIGNED_COLUMNS = ["Total PNL", "Expectancy"]  # coloured by sign
+
+
+def _ratio(value):
+    """A ratio for st.metric: the number, or a sign where it is infinite or undefined"""
+    if np.isnan(value):
+        return "N/A"
+    return "∞" if np.isinf(value) else float(value)
+
+
+def source_frame(endpoint):
+    """Typed frame of a PNL source, shared and read-only; None when unavailable"""
+    if endpoint in HISTORY_SOURCES:
+        # Only new rows are fetched, and the frame object changes only with them
+        return history_source(endpoint, metrics.source_columns(endpoint))
+    data = safe_fetch_data(endpoint)
+    if not data:
+        return None
+    return memoized(f"performance_{endpoint}_frame", data, lambda data: to_frame(endpoint, data))
+
+
+def rolling_figure(rolling, window):
+    """Rolling Sharpe and Sortino lines"""
+    with perf.span(perf.CHART, 'Rolling Sharpe and Sortino'):
+        fig = px.line(
+            rolling.reset_index(),
+            x='Date',
+            y=['Sharpe', 'Sortino'],
+            title=f'Rolling {window}-Day Sharpe and Sortino (annualized)',
+            labels={'value': 'Ratio', 'variable': ''},
+        )
+    return fig
+
+
+def drawdown_figure(drawdown):
+    """Underwater curve of the cumulative PNL"""
+    with perf.span(perf.CHART, 'Drawdown'):
+        fig = px.area(
+            drawdown.reset_index(),
+            x='Date',
+            y='Drawdown',
+            title='Drawdown from Peak Cumulative PNL',
+            labels={'Drawdown': 'Drawdown (USDT)'},
+            hover_data=['Equity', 'Duration'],
+            color_discrete_sequence=['#EF553B'],
+        )
+    return fig
+
+
+@perf.timed_section
+def performance_metrics():
+    """Risk and Performance Metrics"""
+    st.header("Performance Metrics")
+    source_col, window_col = st.columns([2, 1])
+    with source_col:
+        label = st.radio("PNL source", list(SOURCES), horizontal=True, key="performance_source")
+    with window_col:
+        window = st.select_slider(
+            "Rolling window (days)", options=metrics.WINDOWS, value=metrics.DEFAULT_WINDOW, key="performance_window",
+        )
+    endpoint = SOURCES[label]
+
+    frame = source_frame(endpoint)
+    if frame is None or frame.empty:
+        st.warning(f"{label} unavailable")
+        return
+
+    # Everything but the rolling ratios is computed once per data version,
+    # and the ratios once per version and window
+    performance = memoized(f"performance_{endpoint}", frame, lambda frame: metrics.prepare(endpoint, frame))
+    if performance.daily.empty:
+        st.warning(f"No PNL in {label}")
+        return
+    rolling = memoized(
+        f"performance_{endpoint}_{window}", performance.daily, lambda daily: metrics.rolling(daily, window),
+    )
+    sharpe, sortino = memoized(f"performance_{endpoint}_ratios", performance.daily, metrics.ratios)
+    summary = performance.summary
+    drawdown = performance.drawdown
+    # pnl_analytics has one row per day rather than per trade
+    unit = "Days" if endpoint == "pnl_analytics" else "Trades"
+
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Total PNL", summary['Total PNL'], format=formatting.PNL_FORMAT)
+    col2.metric("Sharpe Ratio", _ratio(sharpe), format=RATIO_FORMAT, help="Annualized, over daily PNL")
+    col3.metric("Sortino Ratio", _ratio(sortino), format=RATIO_FORMAT, help="Annualized, over daily PNL")
+    col4.metric(
+        "Max Drawdown", drawdown['Drawdown'].min(), format=formatting.PNL_FORMAT,
+        help="Largest fall of the cumulative PNL from its running peak",
+    )
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric(
+        "Longest Drawdown", int(drawdown['Duration'].max()), format="%,d days",
+        delta=int(drawdown['Duration'].iloc[-1]), delta_color="off", delta_description="now",
+    )
+    col2.metric("Profit Factor", _ratio(summary['Profit Factor']), format=RATIO_FORMAT, help="Gross profit over gross loss")
+    col3.metric(
+        "Expectancy", summary['Expectancy'], format=formatting.PNL_FORMAT, help=f"Average PNL per {unit.lower()[:-1]}",
+    )
+    col4.metric(f"Win Rate ({summary['Trades']:,.0f} {unit.lower()})", summary['Win Rate'], format=formatting.PERCENT_FORMAT)
+
+    st.plotly_chart(memoized(f"performance_{endpoint}_{window}_fig", rolling, lambda r: rolling_figure(r, window)),
+                    use_container_width=True)
+    st.plotly_chart(memoized(f"performance_{endpoint}_drawdown_fig", drawdown, drawdown_figure), use_container_width=True)
+
+    if performance.by_symbol is not None:
+        st.subheader("By Symbol")
+        st.dataframe(
+            formatting.color_pnl(performance.by_symbol.style, SIGNED_COLUMNS),
+            use_container_width=True,
+            column_config=SYMBOL_COLUMN_CONFIG,
+        )
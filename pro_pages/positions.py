@@ -0,0 +1,43 @@
+"""Active positions table and size distribution."""
+import streamlit as st
+import plotly.express as px
+
+import formatting
+import perf
+from page_common import to_frame
+from pro_pages.common import safe_fetch_data
+
+
+@perf.timed_section
+def positions_analysis():
+    """Advanced Positions Analysis"""
+    st.header("Active Positions Dashboard")
+    positions_data = safe_fetch_data("positions")
+    
+    if not positions_data:
+        st.warning("No active positions found")
+        return
+    
+    df = to_frame("positions", positions_data)
+    time_columns = formatting.normalize_time_columns(df, ['Entry Time'])
+    
+    # Enhanced DataFrame Display
+    st.dataframe(
+        formatting.color_pnl(df.style, ['Current PNL']),
+        use_container_width=True,
+        column_config={
+            **formatting.datetime_column_config(time_columns),
+            **formatting.currency_column_config(['Current PNL'], signed=True),
+        }
+    )
+    
+    # Position Distribution Chart
+    if not df.empty:
+        with perf.span(perf.CHART, 'Position Size Distribution'):
+            fig = px.pie(
+                df, 
+                names='Symbol', 
+                values='Amount', 
+                title='Position Size Distribution'
+            )
+        st.plotly_chart(fig, use_container_width=True)
@@ -0,0 +1,76 @@
+"""Trade analytics from running aggregates of the traded PNL."""
+import streamlit as st
+import plotly.express as px
+
+import aggregates
+import charts
+import formatting
+import perf
+from page_common import memoized, to_frame
+from pro_pages.common import API_SERVER, safe_fetch_data
+
+
+def prepare_trades(trade_data):
+    """Typed trade frame with local times, oldest first"""
+    df = to_frame("trade_analytics", trade_data)
+    if formatting.normalize_time_columns(df, ['Timestamp']):
+        df.sort_values(by='Timestamp', inplace=True)
+    return df
+
+
+def symbol_figure(by_symbol):
+    """PNL bar per trading pair"""
+    with perf.span(perf.CHART, 'PNL by Trading Pair'):
+        fig = px.bar(by_symbol.reset_index(), x='Symbol', y='sum', title='PNL by Trading Pair', labels={'sum': 'PNL'})
+    return fig
+
+
+def cumulative_figure(by_day):
+    """Cumulative PNL at the end of each local day"""
+    with perf.span(perf.CHART, 'Cumulative PNL by Day'):
+        fig = px.line(
+            by_day.reset_index(), x='Date', y='cumulative', title='Cumulative PNL by Day',
+            labels={'cumulative': 'Cumulative PNL (USDT)'},
+        )
+    return fig
+
+
+@perf.timed_section
+def trade_analytics():
+    """Comprehensive Trade Analytics"""
+    st.header("Advanced Trade Analytics")
+    
+    # Fetch and process trade data
+    trade_data = safe_fetch_data("trade_analytics")
+    
+    if not trade_data:
+        st.warning("Trade analytics unavailable")
+        return
+    
+    # Built once per payload; the running totals then fold in only the
+    # trades the last fold had not seen
+    df = memoized("trade_analytics", trade_data, prepare_trades)
+    stats = aggregates.get_aggregates(API_SERVER, "trade_analytics")
+    memoized("trade_analytics_fold", df, stats.fold)
+    overall = stats.overall()
+    
+    # Performance Overview
+    col1, col2, col3 = st.columns(3)
+    
+    with col1:
+        st.metric("Total Trades", overall['count'], format=formatting.COUNT_FORMAT)
+    
+    with col2:
+        st.metric("Win Rate", overall['win_rate'], format=formatting.PERCENT_FORMAT)
+    
+    with col3:
+        st.metric("Total PNL", overall['sum'], format=formatting.PNL_FORMAT)
+    
+    # Advanced Charts
+    st.plotly_chart(memoized("trade_analytics_symbol_fig", df, lambda _: symbol_figure(stats.by_symbol())),
+                    use_container_width=True)
+    st.plotly_chart(memoized("trade_analytics_cumulative_fig", df, lambda _: cumulative_figure(stats.by_day())),
+                    use_container_width=True)
+
+    fig2 = charts.downsampled_line(df, 'Timestamp', 'PNL', 'PNL Over Time', key='PNL Over Time')
+    st.plotly_chart(fig2, use_container_width=True)
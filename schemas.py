@@ -0,0 +1,225 @@
+"""Declarative column schemas for the backend's JSON payloads.
+
+Every table endpoint declares the dtype of the columns the dashboards use,
+so each column is converted exactly once, on ingestion, into a compact
+dtype: category for low-cardinality labels, float64 for prices and PNL
+(float32 would lose cents on BTC-sized prices), int64 epoch milliseconds
+for times. Values that do not fit their declared type become missing and
+are reported as SchemaIssue records instead of being coerced silently.
+Columns a schema does not mention pass through as the backend sent them.
+"""
+from collections import namedtuple
+from itertools import chain
+
+import numpy as np
+import pandas as pd
+
+import perf
+
+CATEGORY = "category"
+FLOAT = "float64"
+INT = "int64"
+EPOCH_MS = "epoch_ms"
+DATE = "date"
+
+_ORDER_COLUMNS = {
+    "Symbol": CATEGORY,
+    "Side": CATEGORY,
+    "Type": CATEGORY,
+    "Status": CATEGORY,
+    "Order ID": INT,
+    "Price": FLOAT,
+    "Quantity": FLOAT,
+    "Executed Qty": FLOAT,
+    "Order Time": EPOCH_MS,
+}
+_CLOSED_POSITION_COLUMNS = {
+    "Symbol": CATEGORY,
+    "Side": CATEGORY,
+    "Size": FLOAT,
+    "Entry Price": FLOAT,
+    "Exit Price": FLOAT,
+    "PNL": FLOAT,
+    "Fee": FLOAT,
+    "Entry Time": EPOCH_MS,
+    "Exit Time": EPOCH_MS,
+}
+
+SCHEMAS = {
+    "positions": {
+        "Symbol": CATEGORY,
+        "Side": CATEGORY,
+        "Size": FLOAT,
+        "Amount": FLOAT,
+        "Entry Price": FLOAT,
+        "Mark Price": FLOAT,
+        "PNL": FLOAT,
+        "Current PNL": FLOAT,
+        "Leverage": FLOAT,
+        "Entry Time": EPOCH_MS,
+    },
+    "open_positions": {
+        "Trader": CATEGORY,
+        "Symbol": CATEGORY,
+        "Size": FLOAT,
+    },
+    "open_orders": _ORDER_COLUMNS,
+    "order_history": _ORDER_COLUMNS,
+    "trade_history": {
+        "Symbol": CATEGORY,
+        "Side": CATEGORY,
+        "Trade ID": INT,
+        "Order ID": INT,
+        "Price": FLOAT,
+        "Quantity": FLOAT,
+        "PNL": FLOAT,
+        "Commission": FLOAT,
+        "Time": EPOCH_MS,
+    },
+    "position_history": _CLOSED_POSITION_COLUMNS,
+    "closed_positions": _CLOSED_POSITION_COLUMNS,
+    "pnl_analytics": {
+        "Date": DATE,
+        "PNL": FLOAT,
+    },
+    "trade_analytics": {
+        "Symbol": CATEGORY,
+        "PNL": FLOAT,
+        "Timestamp": EPOCH_MS,
+    },
+}
+
+SchemaIssue = namedtuple("SchemaIssue", ["endpoint", "column", "expected", "count", "examples"])
+
+MAX_ISSUE_EXAMPLES = 3
+
+
+def _coerce_column(values, kind):
+    """Return (converted, malformed mask) for one column."""
+    if kind == CATEGORY:
+        return values.astype("category"), None
+    if kind == DATE:
+        converted = pd.to_datetime(values, errors="coerce")
+        return converted, converted.isna() & values.notna()
+
+    numeric = pd.to_numeric(values, errors="coerce")
+    malformed = numeric.isna() & values.notna()
+    if kind == FLOAT:
+        return numeric.astype("float64"), malformed
+
+    # INT and EPOCH_MS: whole numbers only; nullable Int64 if any are missing
+    fractional = numeric.notna() & (numeric % 1 != 0)
+    if fractional.any():
+        numeric = numeric.mask(fractional)
+        malformed |= fractional
+    if numeric.isna().any():
+        return numeric.astype("Int64"), malformed
+    return numeric.astype("int64"), malformed
+
+
+def _issue(endpoint, column, kind, values, malformed):
+    if malformed is None or not malformed.any():
+        return None
+    examples = [repr(value) for value in values[malformed].head(MAX_ISSUE_EXAMPLES)]
+    return SchemaIssue(endpoint, column, kind, int(malformed.sum()), examples)
+
+
+def coerce_frame(endpoint, df):
+    """Apply an endpoint's schema to an existing frame, in place.
+
+    Returns (df, issues). Columns already of the right dtype are cheap no-ops.
+    """
+    issues = []
+    with perf.span(perf.BUILD, f"{endpoint} coerce") as span:
+        span.rows = len(df)
+        for column, kind in SCHEMAS.get(endpoint, {}).items():
+            if column not in df.columns:
+                continue
+            values = df[column]
+            converted, malformed = _coerce_column(values, kind)
+            df[column] = converted
+            issue = _issue(endpoint, column, kind, values, malformed)
+            if issue is not None:
+                issues.append(issue)
+    return df, issues
+
+
+def _transpose(rows):
+    """Column name -> list of values, for a list of JSON records."""
+    columns = list(rows[0])
+    if len(set(map(len, rows))) == 1:
+        # Same keys in every record (the normal case)
+        try:
+            return {column: [row[column] for row in rows] for column in columns}
+        except KeyError:
+            pass
+    columns = list(dict.fromkeys(chain.from_iterable(rows)))
+    return {column: [row.get(column) for row in rows] for column in columns}
+
+
+def _fast_numeric(values, kind):
+    """Convert well-formed numeric lists without going through pandas."""
+    try:
+        if kind == FLOAT:
+            return pd.Series(np.array(values, dtype=np.float64))
+        array = np.array(values)
+        if array.dtype.kind == "i":
+            return pd.Series(array.astype(np.int64))
+    except (TypeError, ValueError):
+        pass
+    return None
+
+
+def build_frame(endpoint, rows):
+    """Build a typed DataFrame from a list of JSON records or a pyarrow Table.
+
+    Returns (df, issues). Every declared column is assembled and converted
+    straight into its dtype; undeclared columns keep inferred dtypes.
+    """
+    with perf.span(perf.BUILD, endpoint) as span:
+        df, issues = _build_frame(endpoint, rows)
+        span.rows = len(df)
+        span.bytes = int(df.memory_usage(index=False).sum())
+    return df, issues
+
+
+def _build_frame(endpoint, rows):
+    if hasattr(rows, "to_pandas"):
+        # Arrow payload: numeric columns without nulls become views of the
+        # table's buffers and dictionary columns categoricals, so the schema
+        # pass below is mostly no-ops
+        return coerce_frame(endpoint, rows.to_pandas(split_blocks=True))
+    if not rows:
+        return pd.DataFrame(), []
+    if not isinstance(rows, list):
+        return coerce_frame(endpoint, pd.DataFrame(rows))
+    schema = SCHEMAS.get(endpoint, {})
+    data = {}
+    issues = []
+    for column, values in _transpose(rows).items():
+        kind = schema.get(column)
+        if kind is None:
+            data[column] = pd.Series(values).infer_objects()
+            continue
+        if kind == CATEGORY:
+            data[column] = pd.Series(pd.Categorical(values))
+            continue
+        if kind in (FLOAT, INT, EPOCH_MS):
+            converted = _fast_numeric(values, kind)
+            if converted is not None:
+                data[column] = converted
+                continue
+        series = pd.Series(values, dtype=object)
+        data[column], malformed = _coerce_column(series, kind)
+        issue = _issue(endpoint, column, kind, series, malformed)
+        if issue is not None:
+            issues.append(issue)
+    return pd.DataFrame(data), issues
+
+
+def describe(issue):
+    """One-line human-readable summary of a SchemaIssue."""
+    return (
+        f"{issue.endpoint}: {issue.count} value(s) in '{issue.column}' are not {issue.expected}"
+        f" (e.g. {', '.join(issue.examples)})"
+    )
@@ -0,0 +1,195 @@
+"""Precomputed search index for the searchable history tables.
+
+Each dataset version gets one index holding a lowercase haystack per row
+(all cells joined) plus a lowercase copy of every column. A query is a list
+of whitespace separated terms, all of which must match:
+
+    btc                   any cell contains "btc"
+    symbol:BTCUSDT        the Symbol column contains "btcusdt"
+    "order time":14 nov   quoted field names may contain spaces
+
+Field names are matched case-insensitively, ignoring spaces and underscores
+(``order_time`` finds "Order Time"). A term whose field is not a column is
+searched as plain text, so values like ``10:30`` still work.
+"""
+import hashlib
+import re
+import shlex
+import threading
+import weakref
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+import formatting
+import perf
+
+INDEX_CACHE_SIZE = 16
+# Narrow from the previous result only when it kept few rows; gathering a
+# large subset costs more than rescanning the whole column.
+NARROWING_MAX_FRACTION = 0.25
+_CELL_SEPARATOR = "\x1f"
+
+
+def _field_key(name):
+    return re.sub(r"[\s_]+", "", str(name).lower())
+
+
+def _searchable_text(column):
+    if pd.api.types.is_datetime64_any_dtype(column):
+        # Searchable as displayed, not as ISO strings
+        text = formatting.datetime_text(column)
+    elif pd.api.types.is_numeric_dtype(column) or pd.api.types.is_bool_dtype(column):
+        text = pc.cast(pa.array(column), pa.string())
+    else:
+        text = pa.array(column.astype(str), type=pa.string())
+    return pc.utf8_lower(pc.fill_null(text, ""))
+
+
+def parse_query(query):
+    """Split a query into (field_key or None, term) pairs."""
+    try:
+        tokens = shlex.split(query)
+    except ValueError:
+        # Unbalanced quotes while the user is still typing
+        tokens = query.split()
+    terms = []
+    for token in tokens:
+        field, sep, value = token.partition(":")
+        if sep and field and value:
+            terms.append((_field_key(field), value.lower()))
+        elif token:
+            terms.append((None, token.lower()))
+    return terms
+
+
+class SearchIndex:
+    """Lowercase haystacks for one version of a DataFrame."""
+
+    def __init__(self, df):
+        self.size = len(df)
+        self.columns = {}
+        for name in df.columns:
+            self.columns.setdefault(_field_key(name), _searchable_text(df[name]))
+        texts = list(self.columns.values())
+        if len(texts) > 1:
+            self.haystack = pc.binary_join_element_wise(*texts, _CELL_SEPARATOR)
+        else:
+            self.haystack = texts[0] if texts else pa.array([""] * self.size)
+        self._last_query = None
+        self._last_mask = None
+        self._lock = threading.Lock()
+
+    def search(self, query):
+        """Boolean mask (NumPy array) of the rows matching every query term."""
+        terms = parse_query(query)
+        with self._lock:
+            previous_terms, previous_mask = self._last_query, self._last_mask
+        if not terms:
+            return np.ones(self.size, dtype=bool)
+
+        # While the user keeps typing, each keystroke only narrows the last
+        # result, so search just the rows that already matched.
+        if (
+            previous_terms is not None
+            and _narrows(previous_terms, terms)
+            and previous_mask.sum() <= NARROWING_MAX_FRACTION * self.size
+        ):
+            rows = np.flatnonzero(previous_mask)
+        else:
+            rows = None  # all rows
+
+        for field, value in terms:
+            text = self.columns.get(field) if field is not None else None
+            if text is None:
+                text = self.haystack
+                value = value if field is None else f"{field}:{value}"
+            if rows is None:
+                hits = pc.match_substring(text, value).to_numpy(zero_copy_only=False)
+                rows = np.flatnonzero(hits)
+            elif len(rows):
+                hits = pc.match_substring(text.take(rows), value).to_numpy(zero_copy_only=False)
+                rows = rows[hits]
+
+        mask = np.zeros(self.size, dtype=bool)
+        mask[rows] = True
+        with self._lock:
+            self._last_query, self._last_mask = terms, mask
+        return mask
+
+
+def _narrows(previous_terms, terms):
+    """True if every row matching ``terms`` also matches ``previous_terms``."""
+    if len(terms) < len(previous_terms):
+        return False
+    return all(
+        field == old_field and old_value in value
+        for (old_field, old_value), (field, value) in zip(previous_terms, terms)
+    )
+
+
+def fingerprint(df):
+    """Dataset version: shape, columns and an order-sensitive hash of every row."""
+    try:
+        hashes = pd.util.hash_pandas_object(df, index=False)
+    except TypeError:
+        # Unhashable cells such as nested lists from the JSON payload
+        hashes = pd.util.hash_pandas_object(df.astype(str), index=False)
+    digest = hashlib.blake2b(hashes.to_numpy().tobytes(), digest_size=16).hexdigest()
+    return (df.shape, tuple(map(str, df.columns)), digest)
+
+
+_indexes = OrderedDict()
+# name -> (weak reference to the last frame indexed under it, its key)
+_identities = {}
+_indexes_lock = threading.Lock()
+
+
+def _version(df, name):
+    """Key of df's data: reused while the same frame object comes back.
+
+    Memoized and delta-synced frames are replaced, never mutated, so the
+    object identifies the data; any other frame is hashed in full.
+    """
+    with _indexes_lock:
+        ref, key = _identities.get(name, (None, None))
+    if ref is not None and ref() is df:
+        return key
+    key = fingerprint(df)
+    with _indexes_lock:
+        _identities[name] = (weakref.ref(df), key)
+    return key
+
+
+def get_index(df, name, version=None):
+    """Return the cached index for this dataset version, building it once.
+
+    ``version`` identifies the data when the caller knows it (for example a
+    sync cursor); otherwise it comes from df's identity or content.
+    """
+    key = (name, version if version is not None else _version(df, name))
+    with _indexes_lock:
+        index = _indexes.get(key)
+        if index is not None:
+            _indexes.move_to_end(key)
+            return index
+    with perf.span(perf.TRANSFORM, f"{name} search index") as span:
+        span.rows = len(df)
+        index = SearchIndex(df)
+    with _indexes_lock:
+        _indexes[key] = index
+        while len(_indexes) > INDEX_CACHE_SIZE:
+            _indexes.popitem(last=False)
+    return index
+
+
+def filter_frame(df, query, name, version=None):
+    """Rows of df matching query."""
+    if not query.strip():
+        return df
+    with perf.span(perf.TRANSFORM, f"{name} search") as span:
+        span.rows = len(df)
+        return df[get_index(df, name, version).search(query)]
@@ -0,0 +1,82 @@
+"""Paged table rendering for long histories.
+
+Only the visible page is styled and sent to the browser, so render cost
+stays constant however long the history grows. Page size, sort column,
+sort direction and page number live in st.session_state under the table's
+key and survive reruns. The table is a fragment, so paging or sorting
+re-runs only the table, not the page around it. Each frame is sorted once
+per sort column and direction; pages are sliced from the cached order.
+"""
+import math
+
+import streamlit as st
+
+import formatting
+from page_common import memoized
+
+PAGE_SIZES = [25, 50, 100, 250, 500]
+DEFAULT_PAGE_SIZE = 100
+NO_SORT = "(as loaded)"
+
+
+def _sort_order(df, sort_column, descending):
+    """Row positions of df sorted by one column, like a stable sort_values"""
+    column = df[sort_column].reset_index(drop=True)
+    return column.sort_values(ascending=not descending, kind="stable", na_position="last").index.to_numpy()
+
+
+def _page(df, key, sort_column, descending, offset, page_size):
+    if sort_column == NO_SORT or sort_column not in df.columns:
+        return df.iloc[offset:offset + page_size]
+    # One set of sort orders per frame: dropped with it when new data arrives
+    orders = memoized(f"{key}_sort_orders", df, lambda df: {})
+    order = orders.get((sort_column, descending))
+    if order is None:
+        order = orders[sort_column, descending] = _sort_order(df, sort_column, descending)
+    return df.iloc[order[offset:offset + page_size]]
+
+
+@st.fragment
+def paged_dataframe(df, key, column_config=None, gradient=False, pnl_columns=(), **dataframe_kwargs):
+    """Render one page of df with sort and paging controls.
+
+    With ``gradient`` the coolwarm background gradient, and for
+    ``pnl_columns`` the gain/loss colours, are computed over the visible page
+    only. Extra keyword arguments go to st.dataframe.
+    """
+    state = st.session_state
+    size_key, sort_key, desc_key, page_key = (f"{key}_page_size", f"{key}_sort", f"{key}_desc", f"{key}_page")
+    state.setdefault(size_key, DEFAULT_PAGE_SIZE)
+    state.setdefault(sort_key, NO_SORT)
+    state.setdefault(desc_key, True)
+    state.setdefault(page_key, 1)
+
+    col1, col2, col3, col4 = st.columns([3, 1, 1, 1])
+    with col1:
+        sort_options = [NO_SORT] + [str(name) for name in df.columns]
+        if state[sort_key] not in sort_options:
+            state[sort_key] = NO_SORT
+        st.selectbox("Sort by", sort_options, key=sort_key)
+    with col2:
+        st.checkbox("Descending", key=desc_key)
+    with col3:
+        st.selectbox("Rows per page", PAGE_SIZES, key=size_key)
+
+    page_size = state[size_key]
+    page_count = max(1, math.ceil(len(df) / page_size))
+    # A narrower search or a bigger page size can leave the page out of range
+    state[page_key] = min(max(1, state[page_key]), page_count)
+    with col4:
+        st.number_input("Page", min_value=1, max_value=page_count, step=1, key=page_key)
+
+    offset = (state[page_key] - 1) * page_size
+    page = _page(df, key, state[sort_key], state[desc_key], offset, page_size)
+
+    data = page
+    if gradient or any(name in page.columns for name in pnl_columns):
+        data = page.style.background_gradient(cmap='coolwarm') if gradient else page.style
+        data = formatting.color_pnl(data, pnl_columns)
+    st.dataframe(data, use_container_width=True, column_config=column_config, **dataframe_kwargs)
+    if len(df):
+        st.caption(f"Rows {offset + 1:,}–{offset + len(page):,} of {len(df):,}")
+    return page
@@ -0,0 +1,107 @@
+"""Running trade statistics of aggregates against a recomputation from scratch."""
+import numpy as np
+import pandas as pd
+import pytest
+
+import aggregates
+import formatting
+
+T0 = 1_700_000_000_000
+HOUR_MS = 3_600_000
+SYMBOLS = ["BTCUSDT", "ETHUSDT", "SOLUSDT"]
+
+
+def trades(count, start=0, seed=0):
+    """trade_history-like rows spread over a few days, several per timestamp."""
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "Trade ID": np.arange(start, start + count),
+        "Symbol": pd.Categorical(rng.choice(SYMBOLS, count)),
+        "PNL": rng.normal(0, 10, count).round(2),
+        # Several trades share each hour, so cursors fall on ties
+        "Time": T0 + (np.arange(start, start + count) // 3) * 7 * HOUR_MS,
+    })
+
+
+def expected(frame):
+    """(overall, by_symbol, by_day) computed from every trade at once."""
+    pnl = frame["PNL"]
+    overall = {
+        "count": len(frame), "sum": pnl.sum(), "wins": (pnl > 0).sum(), "min": pnl.min(), "max": pnl.max(),
+    }
+    grouped = pnl.groupby(frame["Symbol"].astype(str))
+    by_symbol = pd.DataFrame({
+        "count": grouped.size(), "sum": grouped.sum(), "wins": (pnl > 0).groupby(frame["Symbol"].astype(str)).sum(),
+        "min": grouped.min(), "max": grouped.max(),
+    }).astype("float64")
+    days = pd.to_datetime(frame["Time"], unit="ms", utc=True).dt.tz_convert(formatting.INDIAN_TZ)
+    daily = pnl.groupby(days.dt.tz_localize(None).dt.normalize().to_numpy()).sum()
+    return overall, by_symbol, daily.cumsum()
+
+
+def assert_matches(stats, frame):
+    overall, by_symbol, cumulative = expected(frame)
+    totals = stats.overall()
+    for name, value in overall.items():
+        assert totals[name] == pytest.approx(value), name
+    assert totals["win_rate"] == pytest.approx(overall["wins"] / overall["count"] * 100)
+    got = stats.by_symbol()[aggregates.STAT_COLUMNS].sort_index()
+    # Symbols come back as object after a JSON reload
+    pd.testing.assert_frame_equal(
+        got, by_symbol.rename_axis("Symbol"), check_exact=False, check_index_type=False,
+    )
+    np.testing.assert_allclose(stats.by_day()["cumulative"].to_numpy(), cumulative.to_numpy())
+    assert list(stats.by_day().index) == list(cumulative.index)
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(aggregates, "AGGREGATE_CACHE_DIR", str(tmp_path))
+    return tmp_path
+
+
+def new_stats():
+    return aggregates.TradeAggregates("test__trade_history", "Time")
+
+
+def test_fold_matches_recomputation_after_appends(cache_dir):
+    stats = new_stats()
+    history = trades(40)
+    assert stats.fold(history, generation=0) == 40
+    # The same history again, then one that grew, including ties at the cursor
+    assert stats.fold(history, generation=0) == 0
+    grown = pd.concat([history, trades(20, start=40, seed=1)], ignore_index=True)
+    assert stats.fold(grown, generation=0) == 20
+    assert_matches(stats, grown)
+
+
+def test_fold_restarts_when_the_generation_changes(cache_dir):
+    stats = new_stats()
+    stats.fold(trades(40), generation=0)
+    # A replaced history with the same number of trades: the count alone
+    # would not notice
+    replaced = trades(40, seed=2)
+    assert stats.fold(replaced, generation=1) == 40
+    assert_matches(stats, replaced)
+
+
+def test_fold_restarts_when_trades_were_removed(cache_dir):
+    stats = new_stats()
+    history = trades(40)
+    stats.fold(history)
+    shrunk = history.iloc[5:].reset_index(drop=True)
+    stats.fold(shrunk)
+    assert_matches(stats, shrunk)
+
+
+def test_reloaded_state_keeps_folding(cache_dir):
+    history = trades(40)
+    new_stats().fold(history, generation=0)
+    reloaded = new_stats()
+    grown = pd.concat([history, trades(20, start=40, seed=1)], ignore_index=True)
+    assert reloaded.fold(grown, generation=0) == 20
+    assert_matches(reloaded, grown)
+    # And from the reloaded state again, without new trades
+    again = new_stats()
+    assert again.fold(grown, generation=0) == 0
+    assert_matches(again, grown)
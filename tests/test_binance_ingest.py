@@ -0,0 +1,250 @@
+"""TokenBucket pacing, rate-limit handling, request signing and history merging of binance_ingest."""
+import hashlib
+import hmac
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+
+import pytest
+import requests
+
+import binance_ingest
+import history_cache
+
+# Binance's documented example: "SIGNED Endpoint Examples for POST /fapi/v1/order"
+DOC_SECRET = "2b5eb11e18796d12d88f13dc27dbbd02c2cc51ff7059765ed9821957d82bb4d9"
+DOC_PARAMS = {"symbol": "BTCUSDT", "side": "BUY", "type": "LIMIT", "quantity": 1, "price": 9000, "timeInForce": "GTC"}
+DOC_TIMESTAMP = 1591702613943
+DOC_QUERY = (
+    "symbol=BTCUSDT&side=BUY&type=LIMIT&quantity=1&price=9000&timeInForce=GTC"
+    "&recvWindow=5000&timestamp=1591702613943"
+)
+DOC_SIGNATURE = "3c661234138461fcc7a7d8746c6558c9842d4e10870d2ecbedf7777cad694af9"
+WINDOW_START = 60.0 * 28_000_000  # a clock-aligned weight window
+ORDER_TIME = 1_700_000_000_000
+
+
+class FakeClock:
+    """Stands in for the time module: sleep() advances both clocks instantly."""
+
+    def __init__(self, wall_time):
+        self.wall_time = wall_time
+        self.mono = 1000.0
+
+    def time(self):
+        return self.wall_time
+
+    def monotonic(self):
+        return self.mono
+
+    def sleep(self, seconds):
+        self.wall_time += seconds
+        self.mono += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock(WINDOW_START)
+    monkeypatch.setattr(binance_ingest, "time", fake)
+    return fake
+
+
+class ScriptedServer:
+    """HTTP server answering each request with the next (status, headers, body) of a script."""
+
+    def __init__(self, script):
+        self.script = list(script)
+        self.requests = []  # (path, query, headers) as received
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                url = urlparse(self.path)
+                server.requests.append((url.path, url.query, dict(self.headers)))
+                status, headers, body = server.script.pop(0)
+                payload = json.dumps(body).encode()
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.httpd.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.httpd.server_port}"
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+@pytest.fixture
+def serve():
+    servers = []
+
+    def start(*script):
+        servers.append(ScriptedServer(script))
+        return servers[-1]
+
+    yield start
+    for server in servers:
+        server.close()
+
+
+def client_for(server, bucket=None):
+    return binance_ingest.BinanceFutures("test-key", "test-secret", base_url=server.url, bucket=bucket)
+
+
+def rate_limited(status, retry_after):
+    return status, {"Retry-After": str(retry_after)}, {"code": -1003, "msg": "Too many requests."}
+
+
+def test_signature_matches_binance_example(clock):
+    clock.wall_time = DOC_TIMESTAMP / 1000
+    client = binance_ingest.BinanceFutures("api-key", DOC_SECRET)
+    assert client._query(DOC_PARAMS) == f"{DOC_QUERY}&signature={DOC_SIGNATURE}"
+
+
+def test_bucket_spends_its_capacity_at_once(clock):
+    bucket = binance_ingest.TokenBucket(capacity=10, per_second=2, window=60)
+    assert [bucket.acquire(weight) for weight in (4, 4, 2)] == [0, 0, 0]
+    assert bucket.tokens == 0
+
+
+def test_bucket_waits_for_refill(clock):
+    bucket = binance_ingest.TokenBucket(capacity=10, per_second=2, window=60)
+    clock.sleep(59)  # one second before the window ends
+    assert bucket.acquire(10) == 0
+    # One second until the window's budget frees up, then one more until
+    # two seconds of refill cover the weight
+    assert bucket.acquire(4) == pytest.approx(2.0)
+    assert bucket.waited == pytest.approx(2.0)
+
+
+def test_bucket_keeps_each_window_under_capacity(clock):
+    bucket = binance_ingest.TokenBucket(capacity=10, per_second=1000, window=60)
+    clock.sleep(30)
+    bucket.acquire(10)
+    assert bucket.acquire(1) == pytest.approx(30.0)
+
+
+def test_bucket_counts_weight_the_server_reports(clock):
+    bucket = binance_ingest.TokenBucket(capacity=10, per_second=1000, window=60)
+    clock.sleep(45)
+    bucket.observe(9)  # other clients on the key spent most of the window
+    assert bucket.acquire(1) == 0
+    assert bucket.acquire(1) == pytest.approx(15.0)
+
+
+def test_hold_blocks_acquire(clock):
+    bucket = binance_ingest.TokenBucket(capacity=10, per_second=1000, window=60)
+    bucket.hold(5)
+    assert bucket.acquire(1) == pytest.approx(5.0)
+
+
+def test_requests_are_signed_with_the_key(clock, serve):
+    server = serve((200, {binance_ingest.WEIGHT_HEADER: "15"}, []))
+    client = client_for(server)
+    assert client.fetch("trade_history", {"symbol": "BTCUSDT", "fromId": 0, "limit": 1000}) == []
+    path, query, headers = server.requests[0]
+    assert path == "/fapi/v1/userTrades"
+    assert headers["X-MBX-APIKEY"] == "test-key"
+    unsigned, _, signature = query.rpartition("&signature=")
+    assert signature == hmac.new(b"test-secret", unsigned.encode(), hashlib.sha256).hexdigest()
+    assert client.used_weight == 15
+
+
+def test_429_waits_retry_after_then_retries(clock, serve):
+    server = serve(rate_limited(429, 7), (200, {}, [{"id": 1}]))
+    bucket = binance_ingest.TokenBucket(capacity=100, per_second=100, window=60)
+    client = client_for(server, bucket)
+    assert client.get("/fapi/v1/userTrades", 5) == [{"id": 1}]
+    assert len(server.requests) == 2
+    assert client.rate_limited == 1
+    assert bucket.waited == pytest.approx(7.0)
+
+
+def test_429_gives_up_after_max_retries(clock, serve):
+    server = serve(*[rate_limited(429, 1)] * (binance_ingest.MAX_RETRIES + 1))
+    client = client_for(server)
+    with pytest.raises(requests.exceptions.HTTPError):
+        client.get("/fapi/v1/userTrades", 5)
+    assert len(server.requests) == binance_ingest.MAX_RETRIES + 1
+
+
+def test_418_raises_and_holds_every_caller(clock, serve):
+    server = serve(rate_limited(418, 120))
+    bucket = binance_ingest.TokenBucket(capacity=100, per_second=100, window=60)
+    client = client_for(server, bucket)
+    with pytest.raises(requests.exceptions.HTTPError):
+        client.get("/fapi/v1/userTrades", 5)
+    # A ban is not retried, and no one else may call until it is over
+    assert len(server.requests) == 1
+    assert bucket.acquire(1) == pytest.approx(120.0)
+
+
+class FakeOrders:
+    """Stands in for BinanceFutures: serves allOrders pages from a dict of raw orders."""
+
+    def __init__(self, orders):
+        self.orders = {order["orderId"]: order for order in orders}
+        self.requests = 0
+
+    def fetch(self, endpoint, params=None):
+        self.requests += 1
+        start = params["orderId"]
+        ids = sorted(i for i, order in self.orders.items() if order["symbol"] == params["symbol"] and i >= start)
+        return [self.orders[i] for i in ids[:params["limit"]]]
+
+
+def raw_order(order_id, status="FILLED", executed="1"):
+    return {
+        "orderId": order_id, "symbol": "BTCUSDT", "side": "BUY", "type": "LIMIT", "status": status,
+        "price": "100", "origQty": "1", "executedQty": executed, "time": ORDER_TIME + order_id,
+    }
+
+
+@pytest.fixture
+def order_store(tmp_path, monkeypatch):
+    monkeypatch.setattr(history_cache, "HISTORY_CACHE_DIR", str(tmp_path))
+    client = FakeOrders([raw_order(1), raw_order(2, status="NEW", executed="0"), raw_order(3)])
+    store = binance_ingest.HistoryStore(client, "order_history", "orders")
+    store.sync(["BTCUSDT"])
+    history_cache.flush()
+    return client, store
+
+
+def test_unchanged_open_orders_keep_the_stored_history(order_store):
+    client, store = order_store
+    frame, generation = store.frame, store.generation
+    parts = history_cache._parts(history_cache._partitions("orders")[0])
+    store.sync(["BTCUSDT"])
+    history_cache.flush()
+    assert client.requests == 2  # the open order was asked for again
+    assert store.frame is frame
+    assert store.generation == generation
+    assert history_cache._parts(history_cache._partitions("orders")[0]) == parts
+
+
+def test_changed_open_order_replaces_its_row(order_store):
+    client, store = order_store
+    generation = store.generation
+    client.orders[2] = raw_order(2, status="FILLED")
+    client.orders[4] = raw_order(4)
+    store.sync(["BTCUSDT"])
+    history_cache.flush()
+    assert store.generation == generation + 1
+    assert store.frame["Order ID"].tolist() == [1, 2, 3, 4]
+    assert store.frame["Status"].astype(str).tolist() == ["FILLED"] * 4
+    stored = history_cache.read_history("orders").sort_values("Order ID")
+    assert stored["Order ID"].tolist() == [1, 2, 3, 4]
+    assert stored["Status"].tolist() == ["FILLED"] * 4
@@ -0,0 +1,145 @@
+"""Circuit breaker and bundle route handling of data_client."""
+import json
+
+import pytest
+import requests
+
+import data_client
+
+BASE_URL = "http://backend.test"
+
+
+class FakeClock:
+    """Stands in for the time module's monotonic()."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+
+class ScriptedSession:
+    """Stands in for the pooled session: get() plays back a script of statuses or exceptions."""
+
+    def __init__(self, *script):
+        self.script = list(script)
+        self.urls = []
+
+    def get(self, url, **kwargs):
+        self.urls.append(url)
+        step = self.script.pop(0)
+        if isinstance(step, BaseException):
+            raise step
+        status, body = step if isinstance(step, tuple) else (step, {})
+        response = requests.Response()
+        response.status_code = status
+        response.url = url
+        response._content = json.dumps(body).encode()
+        response.headers["Content-Type"] = "application/json"
+        return response
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(data_client, "time", fake)
+    return fake
+
+
+@pytest.fixture
+def session(monkeypatch):
+    monkeypatch.setattr(data_client, "_breakers", {})
+    data_client.clear_cache()
+    scripted = ScriptedSession()
+    monkeypatch.setattr(data_client, "get_session", lambda: scripted)
+    yield scripted
+    data_client.clear_cache()
+
+
+def outage():
+    return requests.exceptions.ConnectionError("connection refused")
+
+
+def open_circuit(session):
+    session.script = [outage()] * data_client.BREAKER_FAILURES
+    for _ in range(data_client.BREAKER_FAILURES):
+        with pytest.raises(requests.exceptions.ConnectionError):
+            data_client.get_json(BASE_URL, "positions")
+    return data_client.breaker(BASE_URL)
+
+
+def test_breaker_opens_after_consecutive_outages(clock, session):
+    circuit = open_circuit(session)
+    assert circuit.is_open
+    with pytest.raises(data_client.CircuitOpenError):
+        data_client.get_json(BASE_URL, "positions")
+    assert len(session.urls) == data_client.BREAKER_FAILURES  # failed fast, without a request
+
+
+def test_client_errors_are_not_outages(clock, session):
+    session.script = [404] * (data_client.BREAKER_FAILURES + 1)
+    for _ in range(data_client.BREAKER_FAILURES + 1):
+        with pytest.raises(requests.exceptions.HTTPError):
+            data_client.get_json(BASE_URL, "positions")
+    assert not data_client.breaker(BASE_URL).is_open
+
+
+def test_half_open_lets_one_trial_through(clock, session):
+    circuit = open_circuit(session)
+    clock.now += circuit.backoff
+    circuit.before_call()  # another caller's trial, still under way
+    with pytest.raises(data_client.CircuitOpenError):
+        data_client.get_json(BASE_URL, "positions")
+    assert len(session.urls) == data_client.BREAKER_FAILURES
+
+
+def test_successful_trial_closes_the_circuit(clock, session):
+    circuit = open_circuit(session)
+    clock.now += circuit.backoff
+    session.script = [(200, [{"Symbol": "BTCUSDT"}])]
+    assert data_client.get_json(BASE_URL, "positions") == [{"Symbol": "BTCUSDT"}]
+    assert not circuit.is_open
+    assert circuit.failures == 0
+    assert circuit.backoff == data_client.BREAKER_MIN_BACKOFF
+
+
+def test_failed_trial_reopens_for_twice_as_long(clock, session):
+    circuit = open_circuit(session)
+    clock.now += circuit.backoff
+    session.script = [outage()]
+    with pytest.raises(requests.exceptions.ConnectionError):
+        data_client.get_json(BASE_URL, "positions")
+    assert circuit.is_open
+    assert circuit.backoff == 2 * data_client.BREAKER_MIN_BACKOFF
+    assert circuit.retry_in() == 2 * data_client.BREAKER_MIN_BACKOFF
+
+
+def test_trial_raising_anything_else_ends_the_trial(clock, session):
+    circuit = open_circuit(session)
+    clock.now += circuit.backoff
+    session.script = [ValueError("bug in a hook"), (200, [])]
+    with pytest.raises(ValueError):
+        data_client.get_json(BASE_URL, "positions")
+    assert data_client.get_json(BASE_URL, "positions") == []
+    assert not circuit.is_open
+
+
+def test_broken_bundle_route_is_not_a_breaker_success(clock, session):
+    session.script = [503, 503, 500]
+    for _ in range(2):
+        with pytest.raises(requests.exceptions.HTTPError):
+            data_client.get_json(BASE_URL, "positions")
+    assert data_client.get_bundle(BASE_URL, ["positions", "open_orders"]) is None
+    circuit = data_client.breaker(BASE_URL)
+    assert circuit.failures == 2
+    assert not circuit.is_open
+
+
+def test_broken_bundle_route_is_skipped_until_recheck(clock, session):
+    session.script = [500, (200, {"positions": [], "open_orders": []})]
+    assert data_client.get_bundle(BASE_URL, ["positions", "open_orders"]) is None
+    assert data_client.get_bundle(BASE_URL, ["positions", "open_orders"]) is None
+    assert len(session.urls) == 1
+    clock.now += data_client.BUNDLE_RECHECK_INTERVAL
+    assert data_client.get_bundle(BASE_URL, ["positions", "open_orders"]) == {"positions": [], "open_orders": []}
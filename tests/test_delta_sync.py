@@ -0,0 +1,171 @@
+"""Cursor and boundary dedupe, since fallback and full resyncs of delta_sync stores."""
+import pytest
+
+import delta_sync
+import history_cache
+
+BASE_URL = "http://backend.test"
+T0 = 1_700_000_000_000
+
+
+class FakeClock:
+    """Stands in for the time module."""
+
+    def __init__(self):
+        self.mono = 1000.0
+
+    def monotonic(self):
+        return self.mono
+
+    def time(self):
+        return 1_700_000_000.0
+
+
+class FakeBackend:
+    """Serves trade_history rows, with ``since`` inclusive unless told to ignore it."""
+
+    def __init__(self, rows, honors_since=True):
+        self.rows = list(rows)
+        self.honors_since = honors_since
+        self.params = []  # params of every request
+
+    def get_json(self, base_url, endpoint, params=None, timeout=None):
+        self.params.append(params)
+        since = (params or {}).get(delta_sync.SINCE_PARAM)
+        if since is None or not self.honors_since:
+            return list(self.rows)
+        return [row for row in self.rows if row["Time"] >= since]
+
+
+def trade(trade_id, time, pnl=0.0, symbol="BTCUSDT"):
+    return {
+        "Symbol": symbol, "Side": "BUY", "Trade ID": trade_id, "Price": 100.0, "Quantity": 1.0,
+        "PNL": pnl, "Commission": 0.01, "Time": time,
+    }
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(delta_sync, "time", fake)
+    return fake
+
+
+@pytest.fixture
+def backend(monkeypatch, tmp_path):
+    monkeypatch.setattr(history_cache, "HISTORY_CACHE_DIR", str(tmp_path))
+    # Two trades share the last timestamp, so the cursor has a boundary
+    fake = FakeBackend([trade(1, T0), trade(2, T0 + 1), trade(3, T0 + 1)])
+    monkeypatch.setattr(delta_sync.data_client, "get_json", fake.get_json)
+    return fake
+
+
+def store(columns=None):
+    return delta_sync.DeltaStore(BASE_URL, "trade_history", "Time", columns)
+
+
+def trade_ids(frame):
+    return frame["Trade ID"].tolist()
+
+
+def test_first_sync_is_full_and_sets_the_cursor(clock, backend):
+    trades = store()
+    assert trade_ids(trades.sync()) == [1, 2, 3]
+    assert backend.params == [None]
+    assert trades.cursor == T0 + 1
+
+
+def test_rows_at_the_cursor_are_not_appended_twice(clock, backend):
+    trades = store()
+    trades.sync()
+    generation = trades.generation
+    assert trade_ids(trades.sync()) == [1, 2, 3]
+    assert backend.params[-1] == {delta_sync.SINCE_PARAM: T0 + 1}
+    assert trades.rows_fetched == 2  # the boundary rows came back
+    assert trades.generation == generation
+
+
+def test_new_rows_at_and_past_the_cursor_are_appended_once(clock, backend):
+    trades = store()
+    trades.sync()
+    backend.rows += [trade(4, T0 + 1), trade(5, T0 + 2)]
+    assert trade_ids(trades.sync()) == [1, 2, 3, 4, 5]
+    assert trades.cursor == T0 + 2
+    backend.rows += [trade(6, T0 + 2)]
+    assert trade_ids(trades.sync()) == [1, 2, 3, 4, 5, 6]
+    assert trade_ids(trades.sync()) == [1, 2, 3, 4, 5, 6]
+
+
+def test_boundary_rows_alike_in_the_kept_columns_are_counted(clock, backend):
+    # Time, Symbol and PNL cannot tell trades 2, 3 and 4 apart
+    trades = store(["Symbol", "PNL"])
+    trades.sync()
+    backend.rows += [trade(4, T0 + 1)]
+    frame = trades.sync()
+    assert list(frame.columns) == ["Time", "Symbol", "PNL"]
+    assert len(frame) == 4
+    assert len(trades.sync()) == 4
+
+
+def test_backend_ignoring_since_is_remembered(clock, backend):
+    backend.honors_since = False
+    trades = store()
+    trades.sync()
+    backend.rows += [trade(4, T0 + 1), trade(5, T0 + 2)]
+    assert trade_ids(trades.sync()) == [1, 2, 3, 4, 5]
+    assert backend.params[-1] == {delta_sync.SINCE_PARAM: T0 + 1}
+    assert not trades.honors_since
+    backend.rows += [trade(6, T0 + 3)]
+    assert trade_ids(trades.sync()) == [1, 2, 3, 4, 5, 6]
+    assert backend.params[-1] is None  # no longer asks with since
+
+
+def test_unchanged_full_resync_keeps_the_frame(clock, backend):
+    trades = store()
+    frame = trades.sync()
+    history_cache.flush()
+    parts = history_cache._parts(history_cache._partitions(trades.cache_name)[0])
+    generation = trades.generation
+    clock.mono += delta_sync.FULL_RESYNC_INTERVAL + 1
+    assert trades.sync() is frame
+    assert backend.params[-1] is None
+    assert trades.generation == generation
+    history_cache.flush()
+    assert history_cache._parts(history_cache._partitions(trades.cache_name)[0]) == parts
+
+
+def test_full_resync_replaces_amended_rows(clock, backend):
+    trades = store()
+    trades.sync()
+    generation = trades.generation
+    backend.rows[0] = trade(1, T0, pnl=5.0)
+    assert trades.sync()["PNL"].tolist() == [0.0, 0.0, 0.0]  # within the interval: incremental
+    clock.mono += delta_sync.FULL_RESYNC_INTERVAL + 1
+    frame = trades.sync()
+    assert frame["PNL"].tolist() == [5.0, 0.0, 0.0]
+    assert trades.generation == generation + 1
+    # The boundary is rebuilt from the new frame
+    assert trade_ids(trades.sync()) == [1, 2, 3]
+    history_cache.flush()
+    assert history_cache.read_history(trades.cache_name)["PNL"].tolist() == [5.0, 0.0, 0.0]
+
+
+def test_amended_column_outside_the_kept_ones_reaches_the_disk(clock, backend):
+    trades = store(["Symbol", "PNL"])
+    frame = trades.sync()
+    generation = trades.generation
+    backend.rows[0] = {**backend.rows[0], "Commission": 0.5}
+    clock.mono += delta_sync.FULL_RESYNC_INTERVAL + 1
+    assert trades.sync() is frame
+    assert trades.generation == generation
+    history_cache.flush()
+    assert history_cache.read_history(trades.cache_name)["Commission"].tolist() == [0.5, 0.01, 0.01]
+
+
+def test_fresh_store_resumes_from_disk(clock, backend):
+    store().sync()
+    history_cache.flush()
+    backend.rows += [trade(4, T0 + 1)]
+    resumed = store()
+    assert trade_ids(resumed.sync()) == [1, 2, 3, 4]
+    assert backend.params[-1] == {delta_sync.SINCE_PARAM: T0 + 1}
@@ -0,0 +1,109 @@
+"""LiveFeed against a stand-in SSE server that dies or stalls mid-stream."""
+import json
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import live_feed
+
+
+class StreamServer:
+    """SSE server sending one account_summary snapshot, then holding the stream open."""
+
+    def __init__(self, balance, port=0):
+        self.connections = []
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                server.connections.append(self.connection)
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Transfer-Encoding", "chunked")
+                self.end_headers()
+                event = f'event: account_summary\ndata: {json.dumps({"op": "snapshot", "data": {"Balance": balance}})}\n\n'
+                body = event.encode()
+                self.wfile.write(b"%x\r\n%s\r\n" % (len(body), body))
+                self.wfile.flush()
+                # Stall until the test closes the connection or the client gives up
+                try:
+                    while self.connection.recv(1024):
+                        pass
+                except OSError:
+                    pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", port), Handler)
+        self.httpd.daemon_threads = True
+        self.port = self.httpd.server_port
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    def kill(self):
+        """Stop listening and drop open streams without ending them."""
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        for connection in self.connections:
+            try:
+                connection.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            connection.close()
+
+
+def wait_for(condition, timeout=10):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if condition():
+            return True
+        time.sleep(0.02)
+    return False
+
+
+@pytest.fixture
+def fast_reconnect(monkeypatch):
+    monkeypatch.setattr(live_feed, "RECONNECT_MIN_DELAY", 0.05)
+    monkeypatch.setattr(live_feed, "RECONNECT_MAX_DELAY", 0.2)
+
+
+def balance(feed):
+    snapshot = feed.snapshot("account_summary")
+    return snapshot.data["Balance"] if snapshot else None
+
+
+def test_reconnects_after_server_dies_mid_stream(fast_reconnect):
+    server = StreamServer(balance=1.0)
+    feed = live_feed.LiveFeed(f"http://127.0.0.1:{server.port}/stream", ["account_summary"]).start()
+    try:
+        assert wait_for(lambda: balance(feed) == 1.0)
+        server.kill()
+        assert wait_for(lambda: feed.last_error is not None)
+        replacement = StreamServer(balance=2.0, port=server.port)
+        try:
+            assert wait_for(lambda: balance(feed) == 2.0)
+            assert feed.connected
+            assert feed._thread.is_alive()
+        finally:
+            replacement.kill()
+    finally:
+        feed.stop()
+
+
+def test_reconnects_after_stalled_stream(fast_reconnect, monkeypatch):
+    monkeypatch.setattr(live_feed, "READ_TIMEOUT", 0.5)
+    server = StreamServer(balance=1.0)
+    feed = live_feed.LiveFeed(f"http://127.0.0.1:{server.port}/stream", ["account_summary"]).start()
+    try:
+        assert wait_for(lambda: len(server.connections) >= 2)
+        assert feed.last_error is not None
+        assert feed._thread.is_alive()
+        assert balance(feed) == 1.0
+    finally:
+        feed.stop()
+        server.kill()
@@ -0,0 +1,84 @@
+"""FIFO and average-cost lot matching against a hand-worked ledger."""
+import pandas as pd
+import pytest
+
+import lot_matching
+
+# BTCUSDT: two buys, a partial close, a sell that flips the position
+# through zero to short, a buy that closes the short, and a buy left open.
+# ETHUSDT: one short, opened and closed between them. Commission per unit
+# differs per fill so that fee attribution shows.
+LEDGER = pd.DataFrame([
+    # Trade ID, Symbol, Side, Price, Quantity, Commission, Time
+    (1, "BTCUSDT", "BUY", 100.0, 2.0, 0.4, 1000),
+    (2, "ETHUSDT", "SELL", 50.0, 1.0, 0.0, 1500),
+    (3, "BTCUSDT", "BUY", 130.0, 1.0, 0.3, 2000),
+    (4, "ETHUSDT", "BUY", 40.0, 1.0, 0.05, 2500),
+    (5, "BTCUSDT", "SELL", 120.0, 2.5, 0.5, 3000),
+    (6, "BTCUSDT", "SELL", 110.0, 1.5, 0.3, 4000),
+    (7, "BTCUSDT", "BUY", 90.0, 1.0, 0.1, 5000),
+    (8, "BTCUSDT", "BUY", 100.0, 1.0, 0.1, 6000),
+], columns=["Trade ID", "Symbol", "Side", "Price", "Quantity", "Commission", "Time"])
+
+FIFO_ROWS = [
+    # Symbol, Side, Size, Entry Price, Exit Price, PNL, Fee, Entry Time, Exit Time
+    ("ETHUSDT", "SHORT", -1.0, 50.0, 40.0, 10.0, 0.05, 1500, 2500),
+    # Trade 5 closes all of trade 1, then half a unit of trade 3
+    ("BTCUSDT", "LONG", 2.0, 100.0, 120.0, 40.0, 0.8, 1000, 3000),
+    ("BTCUSDT", "LONG", 0.5, 130.0, 120.0, -5.0, 0.25, 2000, 3000),
+    # Trade 6 closes the rest of trade 3 and opens a unit short
+    ("BTCUSDT", "LONG", 0.5, 130.0, 110.0, -10.0, 0.25, 2000, 4000),
+    ("BTCUSDT", "SHORT", -1.0, 110.0, 90.0, 20.0, 0.3, 4000, 5000),
+]
+
+AVERAGE_ROWS = [
+    ("ETHUSDT", "SHORT", -1.0, 50.0, 40.0, 10.0, 0.05, 1500, 2500),
+    # Three units at an average 110, fee 0.7 / 3 per unit, time 4000 / 3
+    ("BTCUSDT", "LONG", 2.5, 110.0, 120.0, 25.0, 2.5 * (0.7 / 3 + 0.2), 1333, 3000),
+    # A proportional close leaves the average as it was
+    ("BTCUSDT", "LONG", 0.5, 110.0, 110.0, 0.0, 0.5 * (0.7 / 3 + 0.2), 1333, 4000),
+    ("BTCUSDT", "SHORT", -1.0, 110.0, 90.0, 20.0, 0.3, 4000, 5000),
+]
+
+
+def expected(rows):
+    frame = pd.DataFrame(rows, columns=lot_matching.COLUMNS[:-1])
+    frame[lot_matching.HOLDING_TIME] = pd.to_timedelta(frame["Exit Time"] - frame["Entry Time"], unit="ms")
+    return frame
+
+
+def assert_closed(closed, rows):
+    closed = closed.assign(Symbol=closed["Symbol"].astype(str), Side=closed["Side"].astype(str))
+    pd.testing.assert_frame_equal(closed, expected(rows), check_dtype=False, atol=1e-9)
+
+
+def test_fifo_pairs_each_close_with_the_lots_it_closes():
+    assert_closed(lot_matching.match(LEDGER, lot_matching.FIFO), FIFO_ROWS)
+
+
+def test_average_closes_at_the_running_average_cost():
+    assert_closed(lot_matching.match(LEDGER, lot_matching.AVERAGE), AVERAGE_ROWS)
+
+
+@pytest.mark.parametrize("method", lot_matching.METHODS)
+def test_methods_agree_on_realized_pnl_and_fees(method):
+    closed = lot_matching.match(LEDGER, method)
+    assert closed["PNL"].sum() == pytest.approx(55.0)
+    assert closed["Fee"].sum() == pytest.approx(1.65)
+
+
+@pytest.mark.parametrize("method", lot_matching.METHODS)
+def test_fill_order_follows_time_then_trade_id(method):
+    shuffled = LEDGER.sample(frac=1, random_state=0).reset_index(drop=True)
+    pd.testing.assert_frame_equal(lot_matching.match(shuffled, method), lot_matching.match(LEDGER, method))
+
+
+def test_unknown_method_raises():
+    with pytest.raises(ValueError):
+        lot_matching.match(LEDGER, "lifo")
+
+
+def test_missing_columns_give_no_rows():
+    closed = lot_matching.match(LEDGER.drop(columns="Price"))
+    assert closed.empty
+    assert list(closed.columns) == lot_matching.COLUMNS
@@ -0,0 +1,65 @@
+"""Content negotiation and decoding for the backend's table payloads.
+
+The big history tables can travel as an Arrow IPC stream instead of JSON:
+columns arrive as whole typed buffers, so a pandas frame is built from them
+without a Python object per row or per value, and dictionary-encoded labels
+come out as categoricals. msgpack is the second choice, when installed, and
+JSON stays the fallback for backends that speak nothing else; the response's
+Content-Type decides how a body is decoded, whatever was asked for.
+
+Like jsonio this module never imports pandas, and pyarrow only once an
+Arrow body actually arrives, so metric-only pages stay light.
+"""
+import jsonio
+
+try:
+    import msgpack
+except ImportError:  # optional second choice
+    msgpack = None
+
+ARROW_STREAM = "application/vnd.apache.arrow.stream"
+MSGPACK = "application/msgpack"
+JSON = "application/json"
+# Older servers label msgpack with the unregistered x- type
+MSGPACK_TYPES = {MSGPACK, "application/x-msgpack"}
+
+
+def accept_header():
+    """Accept header preferring Arrow, then msgpack when installed, then JSON."""
+    choices = [ARROW_STREAM]
+    if msgpack is not None:
+        choices.append(f"{MSGPACK};q=0.9")
+    choices.append(f"{JSON};q=0.5")
+    return ", ".join(choices)
+
+
+def media_type(content_type):
+    """The bare media type of a Content-Type header value."""
+    return (content_type or "").split(";", 1)[0].strip().lower()
+
+
+def decode(content, content_type=JSON):
+    """Decode a response body by its Content-Type.
+
+    Arrow streams become a pyarrow Table (schemas.build_frame turns it into
+    a frame); msgpack and JSON become the usual records. Raises ValueError
+    on a malformed body.
+    """
+    kind = media_type(content_type)
+    if kind == ARROW_STREAM:
+        import pyarrow as pa
+
+        # The table's buffers point into content rather than copies of it
+        return pa.ipc.open_stream(pa.py_buffer(content)).read_all()
+    if kind in MSGPACK_TYPES:
+        if msgpack is None:
+            raise ValueError("msgpack payload but msgpack is not installed")
+        return msgpack.unpackb(content, raw=False)
+    return jsonio.loads(content)
+
+
+def rows(payload):
+    """Number of records in a decoded payload, None for non-tables."""
+    if isinstance(payload, list):
+        return len(payload)
+    return getattr(payload, "num_rows", None)